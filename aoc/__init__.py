@@ -0,0 +1,7 @@
+"""
+Code shared by the day solvers and the tools that run them.
+
+Day scripts import this package, so run them as modules from the repository
+root, e.g. python -m day14.main 2 < day14/input1.txt. Scripts that read their
+example and puzzle inputs themselves find them in their own directory.
+"""
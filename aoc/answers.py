@@ -0,0 +1,94 @@
+"""
+Persistent store of computed answers.
+
+Answers are keyed by day, part, input hash and solver version and kept in a
+SQLite database under .cache. Once the stored answers exceed max_bytes the
+least recently used ones are evicted. Lookups only note when an answer was
+used; the times are written in batches with the next put, on close, or once
+enough of them have piled up, so a stored hit never waits for a disk write.
+"""
+import os
+from os import path
+import pickle
+import sqlite3
+from time import time
+from typing import Any, Dict
+
+from aoc.solvers import ROOT, Solver
+
+ANSWERS = path.join(ROOT, ".cache", "answers.sqlite")
+MISSING = object()
+TOUCH_BATCH = 256
+
+
+def answer_key(solver: Solver, part: int, digest: str) -> str:
+    return f"day{solver.day:02d}/{part}/{digest}/{solver.version}"
+
+
+class AnswerStore:
+    def __init__(self, filename: str = ANSWERS, max_bytes: int = 64 * 2**20):
+        os.makedirs(path.dirname(path.abspath(filename)), exist_ok=True)
+        self.max_bytes = max_bytes
+        self.touched: Dict[str, float] = {}
+        self.db = sqlite3.connect(filename, timeout=30)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS answers"
+            " (key TEXT PRIMARY KEY, answer BLOB, size INTEGER, last_used REAL)"
+        )
+        self.db.execute(
+            "CREATE INDEX IF NOT EXISTS answers_last_used ON answers (last_used)"
+        )
+
+    def get(self, key: str) -> Any:
+        row = self.db.execute(
+            "SELECT answer FROM answers WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return MISSING
+        self.touched[key] = time()
+        if len(self.touched) >= TOUCH_BATCH:
+            with self.db:
+                self.write_touched()
+        return pickle.loads(row[0])
+
+    def put(self, key: str, answer: Any):
+        data = pickle.dumps(answer, protocol=pickle.HIGHEST_PROTOCOL)
+        self.touched.pop(key, None)
+        with self.db:
+            self.write_touched()
+            self.db.execute(
+                "INSERT OR REPLACE INTO answers VALUES (?, ?, ?, ?)",
+                (key, data, len(data), time()),
+            )
+            self.evict()
+
+    def write_touched(self):
+        if self.touched:
+            self.db.executemany(
+                "UPDATE answers SET last_used = ? WHERE key = ?",
+                [(used, key) for key, used in self.touched.items()],
+            )
+            self.touched.clear()
+
+    def evict(self):
+        total = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM answers").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Keep the most recently used answers that fit and drop the rest
+        self.db.execute(
+            "DELETE FROM answers WHERE key IN ("
+            " SELECT key FROM ("
+            "  SELECT key, SUM(size) OVER"
+            "   (ORDER BY last_used DESC, key ROWS UNBOUNDED PRECEDING) AS kept"
+            "  FROM answers"
+            " ) WHERE kept > ?"
+            ")",
+            (self.max_bytes,),
+        )
+
+    def close(self):
+        with self.db:
+            self.write_touched()
+        self.db.close()
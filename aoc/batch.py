@@ -0,0 +1,162 @@
+"""
+Solve many inputs for one day in a single process.
+
+    python -m aoc.batch DAY PATH [PATH ...] [--part N] [--workers N] [--no-cache]
+        [--no-store] [--profile DIR]
+
+Each PATH is an input file, a directory whose files are all inputs, or a glob
+pattern. The day's module is imported once, and with --workers once per
+worker, so each input costs little more than its parse and solve. One JSON
+object is written per input as soon as it is solved, in the order the inputs
+were given:
+
+    {"input": "...", "answers": {"1": ..., "2": ...}, "parse_ms": ..., "solve_ms": {...}}
+
+An input that fails to parse or solve gets an "error" field instead of
+answers and does not stop the batch. With --profile, every parse and solve is
+profiled into DIR and the reports go to stderr.
+"""
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from glob import glob
+import json
+import os
+from os import path
+import sys
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from aoc.answers import AnswerStore
+from aoc.profiling import Profiler
+from aoc.runner import run_solver
+from aoc.solvers import Solver, load_solver
+
+# The solver and settings of this process, set up once by init_worker
+_solver: Optional[Solver] = None
+_parts: Optional[List[int]] = None
+_use_cache = True
+_store: Optional[AnswerStore] = None
+_profiler: Optional[Profiler] = None
+
+
+def expand_inputs(paths: Iterable[str]) -> List[str]:
+    """Input files named by paths, keeping their order but not duplicates."""
+    filenames: Dict[str, None] = {}
+    for name in paths:
+        if path.isdir(name):
+            matches = sorted(
+                entry.path for entry in os.scandir(name) if entry.is_file()
+            )
+        elif path.exists(name):
+            matches = [name]
+        else:
+            matches = sorted(glob(name, recursive=True))
+            if not matches:
+                raise FileNotFoundError(f"No inputs match {name}")
+        filenames.update(
+            (filename, None) for filename in matches if path.isfile(filename)
+        )
+    return list(filenames)
+
+
+def init_worker(
+    day: int,
+    parts: Optional[List[int]],
+    use_cache: bool,
+    use_store: bool,
+    profile_dir: Optional[str] = None,
+):
+    global _solver, _parts, _use_cache, _store, _profiler
+    _solver = load_solver(day)
+    _parts = parts
+    _use_cache = use_cache
+    _store = AnswerStore() if use_store else None
+    _profiler = Profiler(profile_dir) if profile_dir else None
+
+
+def to_json(answer: Any) -> Any:
+    # Solvers may return numpy scalars, which json cannot encode
+    if hasattr(answer, "item"):
+        return answer.item()
+    if isinstance(answer, (int, float, str, bool)) or answer is None:
+        return answer
+    return str(answer)
+
+
+def solve_input(filename: str) -> Dict[str, Any]:
+    assert _solver is not None, "init_worker has not been called"
+    try:
+        # Anything a solver prints would corrupt the JSON lines on stdout
+        with redirect_stdout(sys.stderr):
+            results = run_solver(
+                _solver, filename, _parts, _use_cache, _store, _profiler
+            )
+    except Exception as e:
+        return {"input": filename, "error": f"{type(e).__name__}: {e}"}
+    for r in results:
+        if r.profile:
+            print(r.profile, file=sys.stderr, flush=True)
+    return {
+        "input": filename,
+        "answers": {str(r.part): to_json(r.answer) for r in results},
+        "parse_ms": round(max((r.parse_s for r in results), default=0) * 1000, 3),
+        "solve_ms": {str(r.part): round(r.solve_s * 1000, 3) for r in results},
+        "stored": all(r.stored for r in results),
+    }
+
+
+def solve_all(
+    day: int,
+    filenames: List[str],
+    parts: Optional[List[int]] = None,
+    workers: int = 1,
+    use_cache: bool = True,
+    use_store: bool = True,
+    profile_dir: Optional[str] = None,
+) -> Iterator[Dict[str, Any]]:
+    settings = (day, parts, use_cache, use_store, profile_dir)
+    if workers <= 1:
+        init_worker(*settings)
+        yield from map(solve_input, filenames)
+        return
+    # Small chunks keep results streaming while amortising the round trips
+    chunksize = max(1, min(16, len(filenames) // (workers * 4)))
+    with ProcessPoolExecutor(
+        workers, initializer=init_worker, initargs=settings
+    ) as executor:
+        yield from executor.map(solve_input, filenames, chunksize=chunksize)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("day", type=int)
+    parser.add_argument("paths", nargs="+", metavar="PATH")
+    parser.add_argument("--part", type=int, action="append", dest="parts")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--no-cache", action="store_true", help="always parse inputs")
+    parser.add_argument("--no-store", action="store_true", help="always solve")
+    parser.add_argument("--profile", metavar="DIR", help="write .prof files to DIR")
+    args = parser.parse_args(argv)
+    try:
+        filenames = expand_inputs(args.paths)
+    except FileNotFoundError as e:
+        parser.error(str(e))
+    failed = 0
+    for line in solve_all(
+        args.day,
+        filenames,
+        args.parts,
+        args.workers,
+        not args.no_cache,
+        not args.no_store,
+        args.profile,
+    ):
+        failed += "error" in line
+        print(json.dumps(line), flush=True)
+    if failed:
+        print(f"{failed} of {len(filenames)} inputs failed", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
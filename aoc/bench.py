@@ -0,0 +1,258 @@
+"""
+Benchmark each day's parts over input.txt and synthetic scaled inputs.
+
+    python -m aoc.bench [DAY ...] [--scales 1 4 16 64] [--repeat 5] [--save]
+
+Every sample runs in a fresh process so module-level caches (e.g. day 12's
+count_arrangements) cannot leak between repeats. Medians and peak memory are
+compared against the stored baseline and regressions beyond --threshold are
+flagged with a non-zero exit code. Days in generators.FIXED_SIZE_DAYS are only
+benchmarked at scale 1. Synthetic inputs are cached under benchmarks/inputs by
+a hash of the generator's source, and baseline entries for them are only
+compared with runs on inputs from the same generator.
+
+The baseline holds machine-specific timings, so it is not committed. Create it
+on the machine that will check for regressions with
+
+    python -m aoc.bench --save
+
+and rerun with --save --part N or a subset of days to refresh those entries.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+from os import path
+from statistics import median
+import sys
+from time import perf_counter
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from aoc import generators
+from aoc.generators import FIXED_SIZE_DAYS, generate
+from aoc.solvers import DAYS, ROOT, aoc_sources, find_input, load_solvers, source_digest
+
+BENCH_DIR = path.join(ROOT, "benchmarks")
+BASELINE = path.join(BENCH_DIR, "baseline.json")
+SCALES = [1, 4, 16, 64]
+# Timing differences below this are treated as noise
+MIN_DELTA_S = 0.001
+
+Baseline = Dict[str, Dict[str, Dict[str, Dict[str, Any]]]]
+
+
+def generator_version() -> str:
+    """Hash of the generators and every aoc module they import."""
+    return source_digest(*aoc_sources(generators.__file__))[:16]
+
+
+def synthetic_input(day: int, scale: int) -> str:
+    filename = path.join(
+        BENCH_DIR, "inputs", f"day{day:02d}-x{scale}-{generator_version()}.txt"
+    )
+    if not path.exists(filename):
+        os.makedirs(path.dirname(filename), exist_ok=True)
+        with open(filename, "w") as file:
+            file.write(generate(day, scale))
+    return filename
+
+
+def sample(day: int, part: int, filename: str, trace_memory: bool):
+    solver = load_solvers([day])[day]
+    if trace_memory:
+        tracemalloc.start()
+    start = perf_counter()
+    parsed = solver.parse(filename)
+    parsed_at = perf_counter()
+    answer = solver.parts[part](parsed)
+    solved_at = perf_counter()
+    peak = tracemalloc.get_traced_memory()[1] if trace_memory else None
+    return parsed_at - start, solved_at - parsed_at, peak, str(answer)
+
+
+def _call(conn, f: Callable, args: Tuple):
+    sys.stdout = open(os.devnull, "w")
+    try:
+        conn.send(("ok", f(*args)))
+    except Exception as e:
+        conn.send(("error", repr(e)))
+
+
+def run_isolated(f: Callable, args: Tuple, timeout: Optional[float]):
+    ctx = multiprocessing.get_context("fork")
+    recv, send = ctx.Pipe(duplex=False)
+    proc = ctx.Process(target=_call, args=(send, f, args))
+    proc.start()
+    try:
+        if not recv.poll(timeout):
+            raise TimeoutError(f"Timed out after {timeout}s")
+        status, result = recv.recv()
+    finally:
+        proc.kill()
+        proc.join()
+    if status != "ok":
+        raise RuntimeError(result)
+    return result
+
+
+def bench_part(
+    day: int,
+    part: int,
+    filename: str,
+    repeat: int,
+    trace_memory: bool,
+    timeout: Optional[float],
+) -> Dict[str, Any]:
+    try:
+        samples = [
+            run_isolated(sample, (day, part, filename, False), timeout)
+            for _ in range(repeat)
+        ]
+        peak = (
+            run_isolated(sample, (day, part, filename, True), timeout)[2]
+            if trace_memory
+            else None
+        )
+    except (RuntimeError, TimeoutError) as e:
+        return {"error": str(e)}
+    return {
+        "parse_s": median(s[0] for s in samples),
+        "solve_s": median(s[1] for s in samples),
+        "peak_bytes": peak,
+        "answer": samples[0][3],
+    }
+
+
+def bench_day(
+    day: int,
+    parts: List[int],
+    scales: List[int],
+    repeat: int,
+    trace_memory: bool,
+    timeout: Optional[float],
+) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    if day in FIXED_SIZE_DAYS:
+        scales = [scale for scale in scales if scale == 1]
+    inputs = [("input", find_input(day))] + [
+        (f"x{scale}", synthetic_input(day, scale)) for scale in scales
+    ]
+    result: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    version = generator_version()
+    for name, filename in inputs:
+        for part in parts:
+            stats = bench_part(day, part, filename, repeat, trace_memory, timeout)
+            if name != "input":
+                stats["generator"] = version
+            result.setdefault(name, {})[str(part)] = stats
+            print(format_row(day, name, part, stats), file=sys.stderr, flush=True)
+    return result
+
+
+def format_row(day: int, name: str, part: int, stats: Dict[str, Any]) -> str:
+    row = f"day{day:02d} {name:>6} part {part}"
+    if "error" in stats:
+        return f"{row}  {stats['error']}"
+    peak = stats["peak_bytes"]
+    return (
+        f"{row}  parse {stats['parse_s'] * 1000:>10.2f} ms"
+        f"  solve {stats['solve_s'] * 1000:>10.2f} ms"
+        + (f"  peak {peak / 2**20:>8.2f} MiB" if peak is not None else "")
+    )
+
+
+def compare(current: Baseline, baseline: Baseline, threshold: float) -> List[str]:
+    regressions = []
+    for day, inputs in current.items():
+        for name, parts in inputs.items():
+            for part, stats in parts.items():
+                base = baseline.get(day, {}).get(name, {}).get(part)
+                if not base or "error" in base:
+                    continue
+                label = f"{day} {name} part {part}"
+                if base.get("generator") != stats.get("generator"):
+                    print(
+                        f"{label}: baseline is from another generator version,"
+                        " so it is not compared; refresh it with --save",
+                        file=sys.stderr,
+                    )
+                    continue
+                if "error" in stats:
+                    regressions.append(f"{label}: {stats['error']}")
+                    continue
+                if stats["answer"] != base["answer"]:
+                    regressions.append(
+                        f"{label}: answer changed {base['answer']} -> {stats['answer']}"
+                    )
+                for key in ["parse_s", "solve_s", "peak_bytes"]:
+                    if stats[key] is None or not base.get(key):
+                        continue
+                    ratio = stats[key] / base[key]
+                    if key.endswith("_s") and stats[key] - base[key] < MIN_DELTA_S:
+                        continue
+                    if ratio > 1 + threshold:
+                        regressions.append(
+                            f"{label}: {key} {base[key]:.6g} -> {stats[key]:.6g} ({ratio:.2f}x)"
+                        )
+    return regressions
+
+
+def load_baseline(filename: str) -> Baseline:
+    if not path.exists(filename):
+        return {}
+    with open(filename) as file:
+        return json.load(file)
+
+
+def save_baseline(filename: str, baseline: Baseline):
+    os.makedirs(path.dirname(path.abspath(filename)), exist_ok=True)
+    with open(filename, "w") as file:
+        json.dump(baseline, file, indent=2, sort_keys=True)
+        file.write("\n")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("days", nargs="*", type=int, default=DAYS)
+    parser.add_argument("--part", type=int, action="append", dest="parts")
+    parser.add_argument("--scales", type=int, nargs="*", default=SCALES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=600)
+    parser.add_argument("--threshold", type=float, default=0.2)
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--save", action="store_true", help="update the baseline")
+    parser.add_argument("--no-memory", action="store_true")
+    args = parser.parse_args(argv)
+
+    solvers = load_solvers(args.days)
+    current: Baseline = {
+        f"day{day:02d}": bench_day(
+            day,
+            [part for part in sorted(solver.parts) if not args.parts or part in args.parts],
+            args.scales,
+            args.repeat,
+            not args.no_memory,
+            args.timeout,
+        )
+        for day, solver in solvers.items()
+    }
+    baseline = load_baseline(args.baseline)
+    if not baseline and not args.save:
+        print(
+            f"No baseline in {args.baseline}, so nothing is compared;"
+            " create it with --save",
+            file=sys.stderr,
+        )
+    regressions = compare(current, baseline, args.threshold)
+    for regression in regressions:
+        print("REGRESSION", regression)
+    if args.save:
+        for day, inputs in current.items():
+            for name, parts in inputs.items():
+                baseline.setdefault(day, {}).setdefault(name, {}).update(parts)
+        save_baseline(args.baseline, baseline)
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
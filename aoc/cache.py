@@ -0,0 +1,54 @@
+"""
+Content-addressed cache of parsed inputs.
+
+Parsed structures are pickled under .cache/parsed, keyed by the SHA-256 of the
+input bytes and the solver version, so editing the input, the day's code or
+any aoc module it imports invalidates the entry.
+"""
+import hashlib
+import os
+from os import path
+import pickle
+import tempfile
+from typing import Any
+
+from aoc.solvers import ROOT, Solver
+
+CACHE_DIR = path.join(ROOT, ".cache", "parsed")
+HASH_BLOCK_BYTES = 1 << 20
+
+
+def file_digest(filename: str) -> str:
+    digest = hashlib.sha256()
+    with open(filename, "rb") as file:
+        while block := file.read(HASH_BLOCK_BYTES):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cache_path(solver: Solver, digest: str, cache_dir: str = CACHE_DIR) -> str:
+    return path.join(cache_dir, f"day{solver.day:02d}-{solver.version[:16]}-{digest}.pickle")
+
+
+def write_atomic(filename: str, data: bytes):
+    os.makedirs(path.dirname(filename), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.dirname(filename))
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+        os.replace(tmp, filename)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def cached_parse(solver: Solver, filename: str, cache_dir: str = CACHE_DIR) -> Any:
+    cached = cache_path(solver, file_digest(filename), cache_dir)
+    try:
+        with open(cached, "rb") as file:
+            return pickle.load(file)
+    except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+        pass
+    parsed = solver.parse(filename)
+    write_atomic(cached, pickle.dumps(parsed, protocol=pickle.HIGHEST_PROTOCOL))
+    return parsed
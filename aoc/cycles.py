@@ -0,0 +1,88 @@
+"""
+Cycle detection for deterministic step functions.
+
+The sequence x0, f(x0), f(f(x0)), ... is walked forward once and the key of
+every state, a 64-bit fingerprint of its bytes for bulky states, is mapped to
+the step it was first seen at. The first key seen twice gives the length mu
+of the tail before the cycle and its period, with one call of f per step, and
+the states kept on the way give the state at any step n without replaying.
+"""
+from dataclasses import dataclass
+from hashlib import blake2b
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+def fingerprint(data: bytes) -> int:
+    """64-bit hash of data that, unlike hash(), is the same in every process."""
+    return int.from_bytes(blake2b(data, digest_size=8).digest(), "little")
+
+
+@dataclass
+class Cycle:
+    mu: int
+    period: int
+
+    def index(self, n: int) -> int:
+        """Earliest step with the same state as step n."""
+        if n < self.mu + self.period:
+            return n
+        return self.mu + (n - self.mu) % self.period
+
+    def repeats_every(self, hits: Iterable[int], every: int) -> bool:
+        """
+        Whether an event that depends on the state happens at exactly the
+        positive multiples of every, given the steps it happened at among
+        1..mu + period. Later steps repeat those, which is what shortcuts
+        taking the least common multiple of first occurrences rely on.
+        """
+        if every <= 0 or self.period % every:
+            return False
+        expected = range(every, self.mu + self.period + 1, every)
+        return sorted(set(hits)) == list(expected)
+
+
+class CycleDetector:
+    """Finds the cycle in a sequence of state keys given one step at a time."""
+
+    first_seen: Dict[Hashable, int]
+    cycle: Optional[Cycle]
+
+    def __init__(self):
+        self.first_seen = {}
+        self.cycle = None
+
+    def add(self, key: Hashable) -> Optional[Cycle]:
+        """Record the key of the next state, and return the cycle once it closes."""
+        if self.cycle is None:
+            step = len(self.first_seen)
+            mu = self.first_seen.setdefault(key, step)
+            if mu != step:
+                self.cycle = Cycle(mu, step - mu)
+        return self.cycle
+
+
+def find_cycle(
+    f: Callable[[T], T], x0: T, key: Optional[Callable[[T], Hashable]] = None
+) -> Tuple[Cycle, List[T]]:
+    """
+    The cycle of x0, f(x0), ... and the states at steps 0..mu + period - 1.
+    Without a key states are their own keys. States are compared in full
+    where their keys first repeat, so a fingerprint collision raises instead
+    of giving a wrong cycle.
+    """
+    first_seen: Dict[Hashable, int] = {}
+    states: List[T] = []
+    x = x0
+    # The same bookkeeping as CycleDetector, inlined as this is the hot loop
+    while True:
+        step = len(states)
+        mu = first_seen.setdefault(x if key is None else key(x), step)
+        if mu != step:
+            break
+        states.append(x)
+        x = f(x)
+    if x != states[mu]:
+        raise ValueError(f"States at steps {mu} and {step} collide")
+    return Cycle(mu, step - mu), states
@@ -0,0 +1,219 @@
+"""
+Keep every solver imported in a long-running process and serve solve requests
+over a UNIX socket.
+
+    python -m aoc.daemon serve [--socket PATH] [--workers N] [--no-cache] [--no-store]
+        [--profile DIR]
+    python -m aoc.daemon solve DAY PART [INPUT] [--socket PATH]
+
+Requests and responses are JSON objects, one per line. A request names a day,
+a part and an input, which is either an input name such as "example" or a
+path; an optional "id" is echoed back:
+
+    {"id": 1, "day": 2, "part": 1, "input": "input"}
+    {"id": 1, "day": 2, "part": 1, "input": "...", "answer": 2162, "parse_ms": ...}
+
+A request for a day or part without a solver, or one that fails, gets an
+"error" field instead of an answer.
+
+A connection may send any number of requests without waiting, and responses
+are written as the jobs finish. Jobs run on a pool of workers that import all
+days up front, so the event loop only moves JSON around; parsed inputs come
+from the parse cache and answers from the answer store as in the runner. With
+--profile, workers profile every parse and solve into DIR and print the
+reports to the daemon's stderr.
+"""
+import argparse
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+import json
+import os
+from os import path
+import signal
+import socket
+import sys
+from typing import Any, Dict, Optional
+
+from aoc.answers import AnswerStore
+from aoc.batch import to_json
+from aoc.profiling import Profiler
+from aoc.runner import run_solver
+from aoc.solvers import ROOT, Solver, find_input, load_solvers
+
+SOCKET = path.join(ROOT, ".cache", "daemon.sock")
+
+# Set up once per worker by init_worker
+_solvers: Dict[int, Solver] = {}
+_use_cache = True
+_store: Optional[AnswerStore] = None
+_profiler: Optional[Profiler] = None
+
+
+def init_worker(use_cache: bool, use_store: bool, profile_dir: Optional[str] = None):
+    global _solvers, _use_cache, _store, _profiler
+    _solvers = load_solvers()
+    _use_cache = use_cache
+    _store = AnswerStore() if use_store else None
+    _profiler = Profiler(profile_dir) if profile_dir else None
+
+
+def solve(day: int, part: int, input_name: str) -> Dict[str, Any]:
+    request = {"day": day, "part": part, "input": input_name}
+    if day not in _solvers:
+        return {**request, "error": f"No solver for day {day}"}
+    filename = find_input(day, input_name)
+    available = _solvers[day].parts_for(filename)
+    if part not in available:
+        parts = ", ".join(map(str, available))
+        return {
+            **request,
+            "input": filename,
+            "error": f"Day {day} has no part {part} for this input, only {parts}",
+        }
+    with redirect_stdout(sys.stderr):
+        (result,) = run_solver(
+            _solvers[day], filename, [part], _use_cache, _store, _profiler
+        )
+    if result.profile:
+        print(result.profile, file=sys.stderr, flush=True)
+    return {
+        "day": day,
+        "part": part,
+        "input": filename,
+        "answer": to_json(result.answer),
+        "parse_ms": round(result.parse_s * 1000, 3),
+        "solve_ms": round(result.solve_s * 1000, 3),
+        "stored": result.stored,
+    }
+
+
+class Daemon:
+    def __init__(self, executor: ProcessPoolExecutor):
+        self.executor = executor
+
+    async def respond(self, line: bytes) -> Dict[str, Any]:
+        request: Dict[str, Any] = {}
+        try:
+            request = json.loads(line)
+            args = (
+                int(request["day"]),
+                int(request["part"]),
+                request.get("input", "input"),
+            )
+            loop = asyncio.get_running_loop()
+            response = await loop.run_in_executor(self.executor, solve, *args)
+        except Exception as e:
+            response = {"error": f"{type(e).__name__}: {e}"}
+        if isinstance(request, dict) and "id" in request:
+            response = {"id": request["id"], **response}
+        return response
+
+    async def reply(self, writer: asyncio.StreamWriter, line: bytes):
+        response = await self.respond(line)
+        writer.write(json.dumps(response).encode() + b"\n")
+        await writer.drain()
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        pending = set()
+        try:
+            while line := await reader.readline():
+                if line.strip():
+                    task = asyncio.create_task(self.reply(writer, line))
+                    pending.add(task)
+                    task.add_done_callback(pending.discard)
+            await asyncio.gather(*pending, return_exceptions=True)
+        finally:
+            writer.close()
+
+
+async def serve(
+    socket_path: str,
+    workers: int,
+    use_cache: bool,
+    use_store: bool,
+    profile_dir: Optional[str] = None,
+):
+    loop = asyncio.get_running_loop()
+    os.makedirs(path.dirname(path.abspath(socket_path)), exist_ok=True)
+    if path.exists(socket_path):
+        os.unlink(socket_path)
+    with ProcessPoolExecutor(
+        workers, initializer=init_worker, initargs=(use_cache, use_store, profile_dir)
+    ) as executor:
+        # Start the workers now rather than on the first request
+        await asyncio.gather(
+            *(loop.run_in_executor(executor, os.getpid) for _ in range(workers))
+        )
+        daemon = Daemon(executor)
+        server = await asyncio.start_unix_server(daemon.handle, socket_path)
+        stop = asyncio.Event()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+        print(f"Serving on {socket_path}", file=sys.stderr)
+        try:
+            async with server:
+                await stop.wait()
+        finally:
+            os.unlink(socket_path)
+
+
+def request(
+    day: int, part: int, input_name: str = "input", socket_path: str = SOCKET
+) -> Dict[str, Any]:
+    """Send one request to a running daemon and wait for its response."""
+    if path.exists(input_name):
+        input_name = path.abspath(input_name)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(socket_path)
+        message = {"day": day, "part": part, "input": input_name}
+        client.sendall(json.dumps(message).encode() + b"\n")
+        client.shutdown(socket.SHUT_WR)
+        with client.makefile("rb") as response:
+            return json.loads(response.readline())
+
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--socket", default=SOCKET, help="UNIX socket path")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve_parser = commands.add_parser(
+        "serve", parents=[common], help="run the daemon"
+    )
+    serve_parser.add_argument("--workers", type=int, default=os.cpu_count())
+    serve_parser.add_argument(
+        "--no-cache", action="store_true", help="always parse inputs"
+    )
+    serve_parser.add_argument("--no-store", action="store_true", help="always solve")
+    serve_parser.add_argument(
+        "--profile", metavar="DIR", help="write .prof files to DIR"
+    )
+    solve_parser = commands.add_parser(
+        "solve", parents=[common], help="send one request"
+    )
+    solve_parser.add_argument("day", type=int)
+    solve_parser.add_argument("part", type=int)
+    solve_parser.add_argument("input", nargs="?", default="input")
+    args = parser.parse_args(argv)
+    if args.command == "serve":
+        asyncio.run(
+            serve(
+                args.socket,
+                args.workers,
+                not args.no_cache,
+                not args.no_store,
+                args.profile,
+            )
+        )
+        return
+    response = request(args.day, args.part, args.input, args.socket)
+    if "error" in response:
+        sys.exit(response["error"])
+    print(response["answer"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+"""
+Differential fuzzing of optimised engines against the reference solvers.
+
+    python -m aoc.fuzz [TARGET ...] [--cases N] [--size N] [--seed S]
+        [--candidate NAME]
+
+Each target pairs a reference function or class in a day's module with a
+candidate engine that must be a drop-in replacement for it. Random valid
+inputs of growing size are run through both; the first input on which they
+disagree, or on which only one of them raises, is shrunk to a minimal failing
+input and reported. Otherwise the total time of the reference over that of
+the candidate is reported as the speedup. --candidate names a different
+candidate, either an attribute of the day's module or MODULE:ATTR.
+
+    tilt_cycle    day 14's NumPy spin cycle against the one on rows of text
+    check_config  day 20's pulse counts with FastStore against those with Store
+    wait          day 20's pulses and module states after each button press
+                  from FastStore.wait against those from Store.wait
+
+FastStore.wait turns the pulses and states back into names on every press,
+which costs about what FastStore saves, so the wait target checks FastStore's
+bookkeeping rather than its speed; check_config measures that.
+
+References live in the day's reference module and are the code the engine
+replaced, unchanged. Days 12 and 22 still solve with their original code, so
+they have no pairs until they get faster engines.
+"""
+import argparse
+from dataclasses import dataclass
+import importlib
+from random import Random
+import sys
+from time import perf_counter
+from types import ModuleType
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from aoc.grid import Grid
+
+Outcome = Tuple[str, Any]
+# Each engine runs this many times per input and the fastest run is timed,
+# since a single scheduler hiccup can dwarf a run on a small input
+REPEATS = 3
+
+
+@dataclass
+class Target:
+    day: int
+    reference: str
+    candidate: str
+    # Random valid input of about the given size
+    generate: Callable[[Random, int], Any]
+    # Inputs one step smaller than the given one
+    shrink: Callable[[Any], Iterator[Any]]
+    # Result of running an engine from the day's module on an input
+    run: Callable[[ModuleType, Any, Any], Any] = lambda m, engine, x: engine(x)
+
+
+def generate_dish(rng: Random, size: int) -> Grid:
+    height, width = rng.randint(1, size), rng.randint(1, size)
+    return Grid.from_lines(
+        "".join(rng.choices("O#.", weights=[20, 10, 70], k=width))
+        for _ in range(height)
+    )
+
+
+def shrink_dish(dish: Grid):
+    lines = dish.lines()
+    for y in range(dish.height if dish.height > 1 else 0):
+        yield Grid.from_lines(lines[:y] + lines[y + 1 :])
+    for x in range(dish.width if dish.width > 1 else 0):
+        yield Grid.from_lines(line[:x] + line[x + 1 :] for line in lines)
+    for y, line in enumerate(lines):
+        for x, c in enumerate(line):
+            if c != ".":
+                yield Grid.from_lines(
+                    lines[:y] + [line[:x] + "." + line[x + 1 :]] + lines[y + 1 :]
+                )
+
+
+Modules = Tuple[List[Tuple[str, List[str]]], int]
+
+
+def generate_modules(rng: Random, size: int) -> Modules:
+    """
+    A module configuration and a number of button presses. Outputs only lead
+    to later modules, since a cycle of conjunctions would pulse forever.
+    """
+    names = [f"m{i}" for i in range(rng.randint(1, size))]
+    config: List[Tuple[str, List[str]]] = [
+        (f"{rng.choice('%&')}{name}", []) for name in names
+    ]
+    heads = names[:1]
+    # Every module gets an input, so that conjunctions know their sources
+    for i, name in enumerate(names[1:], 1):
+        src = rng.randrange(-1, i)
+        (heads if src < 0 else config[src][1]).append(name)
+    for i, (_, dests) in enumerate(config):
+        later = [name for name in names[i + 1 :] + ["rx"] if name not in dests]
+        dests.extend(rng.sample(later, min(len(later), rng.randint(0, 2))))
+    config.insert(rng.randint(0, len(config)), ("broadcaster", heads))
+    return config, rng.randint(1, size)
+
+
+def shrink_modules(modules: Modules):
+    config, presses = modules
+    if presses > 1:
+        yield config, presses // 2
+        yield config, presses - 1
+    for i, (src, dests) in enumerate(config):
+        if src != "broadcaster":
+            name = src[1:]
+            others = config[:i] + config[i + 1 :]
+            yield [(s, [d for d in ds if d != name]) for s, ds in others], presses
+        for j in range(len(dests)):
+            fewer = (src, dests[:j] + dests[j + 1 :])
+            yield config[:i] + [fewer] + config[i + 1 :], presses
+
+
+def press_buttons(m: ModuleType, store_class, modules: Modules) -> List[Tuple]:
+    config, presses = modules
+    store = store_class(config)
+    button = m.Button(name="button", dispatch=store.dispatch, outputs=["broadcaster"])
+    result = []
+    for _ in range(presses):
+        button.send()
+        pulses, states = store.wait()
+        # Conjunction states are live dicts, so they are copied per press
+        result.append(
+            (
+                list(pulses),
+                {
+                    name: dict(state) if isinstance(state, dict) else state
+                    for name, state in states.items()
+                },
+            )
+        )
+    return result
+
+
+TARGETS: Dict[str, Target] = {
+    "tilt_cycle": Target(
+        14, "day14.reference:tilt_cycle_grid", "tilt_cycle", generate_dish, shrink_dish
+    ),
+    "check_config": Target(
+        20,
+        "day20.reference:check_config",
+        "check_config",
+        generate_modules,
+        shrink_modules,
+        lambda m, engine, modules: engine(*modules),
+    ),
+    "wait": Target(
+        20,
+        "day20.reference:Store",
+        "FastStore",
+        generate_modules,
+        shrink_modules,
+        press_buttons,
+    ),
+}
+
+
+def load_engine(m: ModuleType, name: str) -> Any:
+    if ":" in name:
+        module_name, name = name.split(":", 1)
+        m = importlib.import_module(module_name)
+    return getattr(m, name)
+
+
+def outcome(target: Target, m: ModuleType, engine, x) -> Outcome:
+    try:
+        return "ok", target.run(m, engine, x)
+    except Exception as e:
+        return "error", type(e).__name__
+
+
+def timed_outcome(target: Target, m: ModuleType, engine, x) -> Tuple[Outcome, float]:
+    times = []
+    for _ in range(REPEATS):
+        start = perf_counter()
+        result = outcome(target, m, engine, x)
+        times.append(perf_counter() - start)
+    return result, min(times)
+
+
+def disagree(target: Target, m: ModuleType, reference, candidate, x) -> bool:
+    return outcome(target, m, reference, x) != outcome(target, m, candidate, x)
+
+
+def shrink_failure(target: Target, m: ModuleType, reference, candidate, x) -> Any:
+    """Greedily replace x by smaller inputs that still fail until none do."""
+    while True:
+        for smaller in target.shrink(x):
+            if disagree(target, m, reference, candidate, smaller):
+                x = smaller
+                break
+        else:
+            return x
+
+
+def fuzz(
+    target: Target,
+    cases: int,
+    max_size: int,
+    seed: str = "",
+    candidate_name: Optional[str] = None,
+) -> float:
+    """
+    Speedup of the candidate over the reference. Raises AssertionError with
+    the shrunk input on a mismatch.
+    """
+    m = importlib.import_module(f"day{target.day:02d}.main")
+    reference = load_engine(m, target.reference)
+    candidate = load_engine(m, candidate_name or target.candidate)
+    rng = Random(f"{seed}{target.reference}")
+    reference_s = candidate_s = 0.0
+    for case in range(cases):
+        x = target.generate(rng, 1 + case * max_size // cases)
+        # Alternate which engine runs first so that neither is favoured by
+        # whatever the other left warm
+        if case % 2:
+            actual, cand_s = timed_outcome(target, m, candidate, x)
+            expected, ref_s = timed_outcome(target, m, reference, x)
+        else:
+            expected, ref_s = timed_outcome(target, m, reference, x)
+            actual, cand_s = timed_outcome(target, m, candidate, x)
+        if expected != actual:
+            x = shrink_failure(target, m, reference, candidate, x)
+            expected = outcome(target, m, reference, x)
+            actual = outcome(target, m, candidate, x)
+            raise AssertionError(
+                f"Mismatch on {x!r}:\n"
+                f"  reference: {expected!r}\n  candidate: {actual!r}"
+            )
+        reference_s += ref_s
+        candidate_s += cand_s
+    return reference_s / candidate_s
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("targets", nargs="*", metavar="TARGET", help=", ".join(TARGETS))
+    parser.add_argument("--cases", type=int, default=200)
+    parser.add_argument("--size", type=int, default=40, help="largest input size")
+    parser.add_argument("--seed", default="")
+    parser.add_argument("--candidate", help="candidate engine to use instead")
+    args = parser.parse_args(argv)
+    unknown = set(args.targets) - set(TARGETS)
+    if unknown:
+        parser.error(f"Unknown targets: {', '.join(sorted(unknown))}")
+    failed = False
+    for name in args.targets or TARGETS:
+        target = TARGETS[name]
+        try:
+            speedup = fuzz(target, args.cases, args.size, args.seed, args.candidate)
+        except (AssertionError, AttributeError) as e:
+            print(f"{name}: {e}")
+            failed = True
+            continue
+        print(f"{name}: {args.cases} cases agree, speedup {speedup:.2f}x")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
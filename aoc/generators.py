@@ -0,0 +1,597 @@
+"""
+Synthetic puzzle inputs for benchmarking.
+
+Each generator takes a seeded random.Random and a scale factor and returns the
+input text. Scale 1 is roughly the size of a real puzzle input; grid puzzles
+scale by area and list puzzles by number of lines.
+"""
+import math
+from random import Random
+import string
+from typing import Callable, Dict, List, Set, Tuple
+
+Point2d = Tuple[int, int]
+
+
+# Days whose inputs have a fixed size, so only their scale 1 input is generated
+FIXED_SIZE_DAYS = {21}
+
+
+def scaled_side(side: int, scale: int) -> int:
+    return int(side * math.sqrt(scale))
+
+
+def random_names(rng: Random, count: int, alphabet: str, min_width: int) -> List[str]:
+    width = min_width
+    while len(alphabet) ** width < count * 2:
+        width += 1
+    names: Set[str] = set()
+    while len(names) < count:
+        names.add("".join(rng.choice(alphabet) for _ in range(width)))
+    return rng.sample(sorted(names), count)
+
+
+def spanning_tree_outline(rng: Random, size: int, thickness: int = 2) -> List[Point2d]:
+    """
+    Walk around a random spanning tree of a size x size lattice drawn at double
+    resolution, with every cell widened to thickness x thickness. The tree has
+    no holes and no diagonal-only contacts, so its outline is a simple closed
+    loop of unit steps.
+    """
+    cells = {(0, 0)}
+    visited = {(0, 0)}
+    stack = [(0, 0)]
+    while stack:
+        x, y = stack[-1]
+        unvisited = [
+            (x + dx, y + dy)
+            for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]
+            if 0 <= x + dx < size and 0 <= y + dy < size
+            and (x + dx, y + dy) not in visited
+        ]
+        if not unvisited:
+            stack.pop()
+            continue
+        nx, ny = rng.choice(unvisited)
+        visited.add((nx, ny))
+        cells.add((2 * nx, 2 * ny))
+        cells.add((x + nx, y + ny))
+        stack.append((nx, ny))
+    cells = {
+        (x * thickness + dx, y * thickness + dy)
+        for x, y in cells
+        for dx in range(thickness)
+        for dy in range(thickness)
+    }
+    # Directed boundary edges keep the filled cell on their right
+    next_vertex: Dict[Point2d, Point2d] = {}
+    for x, y in cells:
+        if (x, y - 1) not in cells:
+            next_vertex[(x, y)] = (x + 1, y)
+        if (x + 1, y) not in cells:
+            next_vertex[(x + 1, y)] = (x + 1, y + 1)
+        if (x, y + 1) not in cells:
+            next_vertex[(x + 1, y + 1)] = (x, y + 1)
+        if (x - 1, y) not in cells:
+            next_vertex[(x, y + 1)] = (x, y)
+    loop = [(0, 0)]
+    while next_vertex[loop[-1]] != loop[0]:
+        loop.append(next_vertex[loop[-1]])
+    return loop
+
+
+def day02(rng: Random, scale: int) -> str:
+    lines = []
+    for game in range(1, 100 * scale + 1):
+        reveals = []
+        for _ in range(rng.randint(1, 6)):
+            colors = rng.sample(["red", "green", "blue"], rng.randint(1, 3))
+            reveals.append(", ".join(f"{rng.randint(1, 20)} {c}" for c in colors))
+        lines.append(f"Game {game}: " + "; ".join(reveals))
+    return "\n".join(lines) + "\n"
+
+
+def day03(rng: Random, scale: int) -> str:
+    side = scaled_side(140, scale)
+    rows = []
+    for _ in range(side):
+        row = ""
+        while len(row) < side:
+            roll = rng.random()
+            if roll < 0.12:
+                row += str(rng.randint(1, 999)) + "."
+            elif roll < 0.16:
+                row += rng.choice("*#+$/@=%&-")
+            else:
+                row += "."
+        rows.append(row[:side])
+    return "\n".join(rows) + "\n"
+
+
+def day04(rng: Random, scale: int) -> str:
+    num_cards = 200 * scale
+    lines = []
+    for card in range(1, num_cards + 1):
+        matches = min(
+            rng.choices(range(11), weights=[40, 20, 12, 8, 6, 4, 3, 3, 2, 1, 1])[0],
+            num_cards - card,
+        )
+        numbers = rng.sample(range(1, 100), 35 - matches)
+        win_numbers, my_numbers = numbers[:10], numbers[10:] + numbers[:matches]
+        rng.shuffle(my_numbers)
+        lines.append(
+            f"Card {card:>4}: "
+            + " ".join(f"{n:>2}" for n in win_numbers)
+            + " | "
+            + " ".join(f"{n:>2}" for n in my_numbers)
+        )
+    return "\n".join(lines) + "\n"
+
+
+def day05(rng: Random, scale: int) -> str:
+    space = 2**32
+    seeds = []
+    for _ in range(10 * scale):
+        start = rng.randrange(space // 2)
+        seeds += [start, rng.randint(1, space // 8)]
+    names = [
+        "seed", "soil", "fertilizer", "water", "light", "temperature", "humidity",
+        "location",
+    ]
+    sections = ["seeds: " + " ".join(map(str, seeds))]
+    for src_name, dest_name in zip(names, names[1:]):
+        num_rules = rng.randint(20, 40) * scale
+        cuts = sorted(rng.sample(range(1, space), 2 * num_rules))
+        rules = [
+            (rng.randrange(space - (end - start)), start, end - start)
+            for start, end in zip(cuts[::2], cuts[1::2])
+        ]
+        rng.shuffle(rules)
+        sections.append(
+            f"{src_name}-to-{dest_name} map:\n"
+            + "\n".join(" ".join(map(str, rule)) for rule in rules)
+        )
+    return "\n\n".join(sections) + "\n"
+
+
+def day06(rng: Random, scale: int) -> str:
+    times, distances = [], []
+    for _ in range(4 * scale):
+        t = rng.randint(40, 99)
+        times.append(t)
+        distances.append(rng.randint(t * t // 8, t * t // 4 - t))
+    return (
+        "Time:     " + " ".join(f"{t:>4}" for t in times) + "\n"
+        "Distance: " + " ".join(f"{d:>4}" for d in distances) + "\n"
+    )
+
+
+def day07(rng: Random, scale: int) -> str:
+    cards = "23456789TJQKA"
+    return "".join(
+        "".join(rng.choice(cards) for _ in range(5)) + f" {rng.randint(1, 1000)}\n"
+        for _ in range(1000 * scale)
+    )
+
+
+def day08(rng: Random, scale: int) -> str:
+    """
+    One ring per ghost whose length is a distinct prime multiple of the
+    direction count, so each ghost first reaches its Z node after exactly one
+    period and the LCM shortcut in navigate_all holds.
+    """
+    num_directions = 13 * scale
+    directions = "".join(rng.choice("LR") for _ in range(num_directions))
+    periods = [3, 5, 7, 11, 13, 17]
+    num_nodes = sum(periods) * num_directions
+    alphabet = "BCDEFGHIJKLMNOPQRSTUVWXY"
+    names = iter(random_names(rng, num_nodes, alphabet, 3))
+    codes = ["AA"] + random_names(rng, len(periods) - 1, alphabet, 2)
+    lines = []
+    for code, period in zip(codes, periods):
+        ring = [next(names) for _ in range(period * num_directions - 1)]
+        ring.append("ZZZ" if code == "AA" else f"{code}Z")
+        start = "AAA" if code == "AA" else f"{code}A"
+        for step, (src, dest) in enumerate(zip([start] + ring, ring + [ring[0]])):
+            decoy = rng.choice(ring)
+            lr = (dest, decoy) if directions[step % num_directions] == "L" else (decoy, dest)
+            lines.append(f"{src} = ({lr[0]}, {lr[1]})")
+    rng.shuffle(lines)
+    return directions + "\n\n" + "\n".join(lines) + "\n"
+
+
+def day09(rng: Random, scale: int) -> str:
+    lines = []
+    for _ in range(200 * scale):
+        coeffs = [rng.randint(-9, 9) for _ in range(rng.randint(2, 12))]
+        lines.append(
+            " ".join(
+                str(sum(c * math.comb(x, k) for k, c in enumerate(coeffs)))
+                for x in range(21)
+            )
+        )
+    return "\n".join(lines) + "\n"
+
+
+def day10(rng: Random, scale: int) -> str:
+    loop = spanning_tree_outline(rng, scaled_side(35, scale))
+    side = max(max(x, y) for x, y in loop) + 1
+    neighbors_to_pipe = {
+        frozenset({(0, -1), (0, 1)}): "|",
+        frozenset({(-1, 0), (1, 0)}): "-",
+        frozenset({(1, 0), (0, -1)}): "L",
+        frozenset({(-1, 0), (0, -1)}): "J",
+        frozenset({(-1, 0), (0, 1)}): "7",
+        frozenset({(1, 0), (0, 1)}): "F",
+    }
+    grid = [[rng.choice("|-LJ7F..") for _ in range(side)] for _ in range(side)]
+    for prev_pt, pt, next_pt in zip(loop[-1:] + loop[:-1], loop, loop[1:] + loop[:1]):
+        x, y = pt
+        grid[y][x] = neighbors_to_pipe[
+            frozenset({(prev_pt[0] - x, prev_pt[1] - y), (next_pt[0] - x, next_pt[1] - y)})
+        ]
+    # S must not have loop neighbours pointing back at it other than its own
+    # two, or start_of() could pick the wrong pipe for it
+    loop_set = set(loop)
+    pipe_to_neighbors = {pipe: nbrs for nbrs, pipe in neighbors_to_pipe.items()}
+    while True:
+        i = rng.randrange(len(loop))
+        sx, sy = loop[i]
+        connected = [loop[i - 1], loop[(i + 1) % len(loop)]]
+        if not any(
+            (sx - x, sy - y) in pipe_to_neighbors[grid[y][x]]
+            for x, y in [(sx, sy - 1), (sx, sy + 1), (sx - 1, sy), (sx + 1, sy)]
+            if (x, y) in loop_set and (x, y) not in connected
+        ):
+            break
+    grid[sy][sx] = "S"
+    for x, y in [(sx, sy - 1), (sx, sy + 1), (sx - 1, sy), (sx + 1, sy)]:
+        if 0 <= x < side and 0 <= y < side and (x, y) not in loop_set:
+            grid[y][x] = "."
+    return "\n".join("".join(row) for row in grid) + "\n"
+
+
+def day11(rng: Random, scale: int) -> str:
+    side = scaled_side(140, scale)
+    empty_rows = set(rng.sample(range(side), side // 20))
+    empty_cols = set(rng.sample(range(side), side // 20))
+    return "".join(
+        "".join(
+            "#" if y not in empty_rows and x not in empty_cols and rng.random() < 0.025
+            else "."
+            for x in range(side)
+        )
+        + "\n"
+        for y in range(side)
+    )
+
+
+def day12(rng: Random, scale: int) -> str:
+    lines = []
+    for _ in range(1000 * scale):
+        blocks = [rng.randint(1, 5) for _ in range(rng.randint(1, 5))]
+        gaps = [1] * (len(blocks) - 1)
+        for _ in range(rng.randint(0, 6) if gaps else 0):
+            gaps[rng.randrange(len(gaps))] += 1
+        lead, trail = rng.randint(0, 3), rng.randint(0, 3)
+        row = "." * lead
+        for i, block in enumerate(blocks):
+            row += "#" * block + ("." * gaps[i] if i < len(gaps) else "")
+        row = "".join(
+            "?" if rng.random() < 0.5 else c for c in row + "." * trail
+        )
+        lines.append(f"{row} {','.join(map(str, blocks))}")
+    return "\n".join(lines) + "\n"
+
+
+def day13(rng: Random, scale: int) -> str:
+    """
+    Each pattern mirrors its rows about one line and has a second, vertical
+    reflection that is off by exactly one cell outside the mirrored rows.
+    """
+    patterns = []
+    for _ in range(100 * scale):
+        height, width = rng.randint(7, 17), rng.randint(5, 17)
+        line = rng.choice([i for i in range(1, height) if 2 * i != height])
+        span = min(line, height - line)
+        rows = [[rng.choice("#.") for _ in range(width)] for _ in range(height)]
+        for i in range(span):
+            rows[line + i] = rows[line - 1 - i].copy()
+        for row in rows:
+            row[1] = row[0]
+        outside = [
+            y for y in range(height) if not line - span <= y < line + span
+        ]
+        y = rng.choice(outside)
+        rows[y][1] = "." if rows[y][0] == "#" else "#"
+        if rng.random() < 0.5:
+            rows = [list(col) for col in zip(*rows)]
+        patterns.append("\n".join("".join(row) for row in rows))
+    return "\n\n".join(patterns) + "\n"
+
+
+def day14(rng: Random, scale: int) -> str:
+    side = scaled_side(100, scale)
+    return "".join(
+        "".join(rng.choices("O#.", weights=[20, 10, 70], k=side)) + "\n"
+        for _ in range(side)
+    )
+
+
+def day15(rng: Random, scale: int) -> str:
+    labels = random_names(rng, 500, string.ascii_lowercase, 2)
+    steps = [
+        rng.choice(labels) + (f"={rng.randint(1, 9)}" if rng.random() < 0.6 else "-")
+        for _ in range(4000 * scale)
+    ]
+    return ",".join(steps) + "\n"
+
+
+def day16(rng: Random, scale: int) -> str:
+    side = scaled_side(110, scale)
+    return "".join(
+        "".join(rng.choices("./\\|-", weights=[90, 3, 3, 2, 2], k=side)) + "\n"
+        for _ in range(side)
+    )
+
+
+def day17(rng: Random, scale: int) -> str:
+    side = scaled_side(141, scale)
+    return "".join(
+        "".join(rng.choice("123456789") for _ in range(side)) + "\n"
+        for _ in range(side)
+    )
+
+
+def day18(rng: Random, scale: int) -> str:
+    """
+    Histogram-shaped polygons: columns of random width and height traced
+    clockwise, which are simple and alternate horizontal and vertical edges.
+    Part 1 and part 2 plans are traced independently with the same edge count.
+    """
+
+    def histogram(max_width: int, max_height: int, num_columns: int):
+        heights = [rng.randint(1, max_height)]
+        while len(heights) < num_columns:
+            height = rng.randint(1, max_height)
+            if height != heights[-1]:
+                heights.append(height)
+        plan = [("U", heights[0])]
+        for i, height in enumerate(heights):
+            if i:
+                diff = height - heights[i - 1]
+                plan.append(("U" if diff > 0 else "D", abs(diff)))
+            plan.append(("R", rng.randint(1, max_width)))
+        plan.append(("D", heights[-1]))
+        plan.append(("L", sum(t for d, t in plan if d == "R")))
+        return plan
+
+    num_columns = 175 * scale
+    dir_to_digit = {"R": 0, "D": 1, "L": 2, "U": 3}
+    lines = []
+    for (d1, t1), (d2, t2) in zip(
+        histogram(12, 200, num_columns),
+        histogram(0xFFFFF // num_columns, 0xFFFFF // 2, num_columns),
+    ):
+        lines.append(f"{d1} {t1} (#{t2:05x}{dir_to_digit[d2]})")
+    return "\n".join(lines) + "\n"
+
+
+def day19(rng: Random, scale: int) -> str:
+    num_workflows = 550 * scale
+    fresh_names = iter(
+        name
+        for name in random_names(rng, num_workflows + 1, string.ascii_lowercase, 2)
+        if name != "in"
+    )
+    queue, num_named = ["in"], 1
+
+    def target_of():
+        nonlocal num_named
+        if num_named < num_workflows and rng.random() < 0.55:
+            num_named += 1
+            queue.append(next(fresh_names))
+            return queue[-1]
+        return rng.choice("AR")
+
+    # Workflows form a tree rooted at "in" so every job ends in A or R
+    workflows = []
+    for name in queue:
+        rules = [
+            f"{rng.choice('xmas')}{rng.choice('<>')}{rng.randint(1, 4000)}:{target_of()}"
+            for _ in range(rng.randint(1, 4))
+        ]
+        workflows.append(f"{name}{{{','.join(rules + [target_of()])}}}")
+    parts = [
+        "{" + ",".join(f"{k}={rng.randint(1, 4000)}" for k in "xmas") + "}"
+        for _ in range(200 * scale)
+    ]
+    return "\n".join(workflows) + "\n\n" + "\n".join(parts) + "\n"
+
+
+def day20(rng: Random, scale: int) -> str:
+    """
+    Binary counters like the puzzle input: each is a chain of twelve flip-flops
+    feeding a conjunction that resets the chain at an odd target count.
+    """
+    num_counters, num_bits = 4 * scale, 12
+    names = iter(
+        name
+        for name in random_names(
+            rng, num_counters * (num_bits + 2) + 2, string.ascii_lowercase, 2
+        )
+        if name != "rx"
+    )
+    final = next(names)
+    lines, chain_heads = [], []
+    for _ in range(num_counters):
+        target = rng.randrange(2 ** (num_bits - 1) + 1, 2**num_bits, 2)
+        bits = [next(names) for _ in range(num_bits)]
+        counter, inverter = next(names), next(names)
+        chain_heads.append(bits[0])
+        for i, bit in enumerate(bits):
+            outputs = [bits[i + 1]] if i + 1 < num_bits else []
+            if target >> i & 1:
+                outputs.append(counter)
+            lines.append(f"%{bit} -> {', '.join(outputs)}")
+        resets = [bit for i, bit in enumerate(bits) if not target >> i & 1 or i == 0]
+        lines.append(f"&{counter} -> {', '.join(resets + [inverter])}")
+        lines.append(f"&{inverter} -> {final}")
+    lines.append(f"&{final} -> rx")
+    rng.shuffle(lines)
+    lines.insert(rng.randrange(len(lines)), f"broadcaster -> {', '.join(chain_heads)}")
+    return "\n".join(lines) + "\n"
+
+
+def day21(rng: Random, scale: int) -> str:
+    """
+    lagrange_interpolate() relies on the 131 x 131 tile with S in the centre,
+    open edges, an open middle row and column and a clear diamond band, since
+    26501365 = 65 + 202300 * 131. The only other odd side that lines up with
+    26501365 is 393, so the tile size is fixed, the day is in FIXED_SIZE_DAYS
+    and only the rock layout varies between seeds.
+    """
+    side, mid = 131, 65
+    rows = []
+    for y in range(side):
+        row = ""
+        for x in range(side):
+            radius = abs(x - mid) + abs(y - mid)
+            if (x, y) == (mid, mid):
+                row += "S"
+            elif (
+                x in (0, mid, side - 1)
+                or y in (0, mid, side - 1)
+                or abs(radius - mid) <= 1
+            ):
+                row += "."
+            else:
+                row += "#" if rng.random() < 0.12 else "."
+        rows.append(row)
+    return "\n".join(rows) + "\n"
+
+
+def day22(rng: Random, scale: int) -> str:
+    num_bricks = 1200 * scale
+    max_z = num_bricks // 4 + 2
+    occupied: Set[Tuple[int, int, int]] = set()
+    lines = []
+    while len(lines) < num_bricks:
+        x, y, z = rng.randrange(10), rng.randrange(10), rng.randint(1, max_z)
+        axis, length = rng.randrange(3), rng.randint(0, 4)
+        end = [x, y, z]
+        end[axis] += length
+        if end[0] > 9 or end[1] > 9:
+            continue
+        cubes = [
+            (cx, cy, cz)
+            for cx in range(x, end[0] + 1)
+            for cy in range(y, end[1] + 1)
+            for cz in range(z, end[2] + 1)
+        ]
+        if occupied.intersection(cubes):
+            continue
+        occupied.update(cubes)
+        lines.append(f"{x},{y},{z}~{end[0]},{end[1]},{end[2]}")
+    return "\n".join(lines) + "\n"
+
+
+def day23(rng: Random, scale: int) -> str:
+    """
+    A 6 x 6 lattice of junctions joined by corridors, with slopes leaving and
+    entering every junction pointing right or down like the puzzle input.
+    Corridors detour by a random depth into the square above or to the left so
+    paths differ in length. Scaling stretches the corridors and keeps the
+    junction graph fixed, since the longest path search grows exponentially
+    with the number of junctions.
+    """
+    num_junctions = 6
+    spacing = max(12, scaled_side(28, scale))
+    half = spacing // 2
+    side = 1 + spacing * (num_junctions - 1) + 2
+    grid = [["#"] * side for _ in range(side)]
+    grid[0][1] = "."
+    grid[side - 1][side - 2] = "."
+
+    def set_tile(along: int, across: int, horizontal: bool, tile: str):
+        if horizontal:
+            grid[across][along] = tile
+        else:
+            grid[along][across] = tile
+
+    junctions = [1 + spacing * i for i in range(num_junctions)]
+    for jy in junctions:
+        for jx in junctions:
+            grid[jy][jx] = "."
+            for horizontal, start, across in [(True, jx, jy), (False, jy, jx)]:
+                if start == junctions[-1]:
+                    continue
+                for along in range(start + 1, start + spacing):
+                    set_tile(along, across, horizontal, ".")
+                slope = ">" if horizontal else "v"
+                set_tile(start + 1, across, horizontal, slope)
+                set_tile(start + spacing - 1, across, horizontal, slope)
+                depth = rng.randint(0, half - 2)
+                if across == junctions[0] or depth == 0:
+                    continue
+                a, b = start + 3, start + rng.randint(5, half - 1)
+                for d in range(depth + 1):
+                    set_tile(a, across - d, horizontal, ".")
+                    set_tile(b, across - d, horizontal, ".")
+                for along in range(a, b + 1):
+                    set_tile(along, across - depth, horizontal, ".")
+                for along in range(a + 1, b):
+                    set_tile(along, across, horizontal, "#")
+    return "\n".join("".join(row) for row in grid) + "\n"
+
+
+def day24(rng: Random, scale: int) -> str:
+    """
+    Hailstones placed so that a rock with integer position and velocity hits
+    each of them at a distinct integer time, as find_one_shot() expects.
+    """
+    r0 = [rng.randint(2 * 10**14, 4 * 10**14) for _ in range(3)]
+    v0 = [rng.randint(-300, 300) for _ in range(3)]
+    times = rng.sample(range(10**10, 10**11), 300 * scale)
+    lines = []
+    for t in times:
+        v = [rng.choice([-1, 1]) * rng.randint(1, 500) for _ in range(3)]
+        p = [r0[i] + (v0[i] - v[i]) * t for i in range(3)]
+        lines.append(
+            ", ".join(map(str, p)) + " @ " + ", ".join(f"{vi:>3}" for vi in v)
+        )
+    return "\n".join(lines) + "\n"
+
+
+def day25(rng: Random, scale: int) -> str:
+    """
+    Two ring lattices joined by exactly three edges. Ring edges share common
+    neighbours, so only the cut and a few shortcuts are disconnection candidates.
+    Lines list each cluster in ring order and only name nodes that were already
+    seen, which the single pass in connected_components() depends on.
+    """
+    cluster_size = 750 * scale
+    names = random_names(rng, 2 * cluster_size, string.ascii_lowercase, 3)
+    clusters = [names[:cluster_size], names[cluster_size:]]
+    adj: Dict[str, List[str]] = {name: [] for name in names}
+    for cluster in clusters:
+        for i, name in enumerate(cluster):
+            adj[name] += [cluster[(i + k) % cluster_size] for k in range(1, 4)]
+        for i in rng.sample(range(cluster_size // 2, cluster_size), 3):
+            adj[cluster[i]].append(cluster[rng.randrange(3, i - 3)])
+    for src, dest in zip(rng.sample(clusters[1], 3), rng.sample(clusters[0], 3)):
+        adj[src].append(dest)
+    return "".join(f"{src}: {' '.join(dests)}\n" for src, dests in adj.items())
+
+
+day_to_generator: Dict[int, Callable[[Random, int], str]] = {
+    int(name[3:]): generator
+    for name, generator in list(globals().items())
+    if name.startswith("day") and name[3:].isdigit()
+}
+
+
+def generate(day: int, scale: int, seed: str = "") -> str:
+    if day in FIXED_SIZE_DAYS and scale != 1:
+        raise ValueError(f"Day {day:02d} inputs cannot be scaled")
+    return day_to_generator[day](Random(f"{seed}day{day:02d}x{scale}"), scale)
@@ -0,0 +1,195 @@
+"""
+Directed graphs over dense integer node ids in compressed sparse row form.
+
+Node names are interned to ids 0..n-1 once, in order of first appearance, and
+the out-edges of node v are targets[offsets[v]:offsets[v + 1]] in the order
+they were given. Edges are identified by their index into targets, so a
+boolean array over edges masks them out of a traversal without copying the
+graph. Undirected graphs store every edge in both directions.
+"""
+from functools import cached_property
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class Graph:
+    offsets: np.ndarray
+    targets: np.ndarray
+    weights: Optional[np.ndarray]
+    names: List[str]
+
+    def __init__(
+        self,
+        offsets: np.ndarray,
+        targets: np.ndarray,
+        weights: Optional[np.ndarray] = None,
+        names: Optional[List[str]] = None,
+    ):
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.targets = np.asarray(targets, dtype=np.int64)
+        if weights is not None:
+            weights = np.asarray(weights, dtype=np.int64)
+        self.weights = weights
+        self.names = [] if names is None else names
+
+    @classmethod
+    def from_edges(
+        cls,
+        num_nodes: int,
+        sources: Sequence[int],
+        targets: Sequence[int],
+        weights: Optional[Sequence[int]] = None,
+        names: Optional[List[str]] = None,
+    ) -> "Graph":
+        sources = np.asarray(sources, dtype=np.int64)
+        # A stable sort keeps each node's edges in the order they were given
+        order = np.argsort(sources, kind="stable")
+        offsets = np.zeros(num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=num_nodes), out=offsets[1:])
+        return cls(
+            offsets,
+            np.asarray(targets, dtype=np.int64)[order],
+            None if weights is None else np.asarray(weights, dtype=np.int64)[order],
+            names,
+        )
+
+    @classmethod
+    def from_adjacency(
+        cls, adjacency: Iterable[Tuple[str, Iterable[str]]], undirected: bool = False
+    ) -> "Graph":
+        ids: Dict[str, int] = {}
+        sources: List[int] = []
+        targets: List[int] = []
+        for name, dests in adjacency:
+            src = ids.setdefault(name, len(ids))
+            for dest in dests:
+                dest_id = ids.setdefault(dest, len(ids))
+                sources.append(src)
+                targets.append(dest_id)
+        if undirected:
+            sources, targets = sources + targets, targets + sources
+        return cls.from_edges(len(ids), sources, targets, names=list(ids))
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.targets)
+
+    @cached_property
+    def ids(self) -> Dict[str, int]:
+        return {name: i for i, name in enumerate(self.names)}
+
+    @cached_property
+    def sources(self) -> np.ndarray:
+        """Source node of every edge."""
+        return np.repeat(np.arange(self.num_nodes), np.diff(self.offsets))
+
+    @cached_property
+    def adjacency(self) -> List[List[int]]:
+        """Successor lists, for traversals that step one node at a time."""
+        targets = self.targets.tolist()
+        offsets = self.offsets.tolist()
+        return [targets[offsets[v] : offsets[v + 1]] for v in range(self.num_nodes)]
+
+    def degrees(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+    def successors(self, v: int) -> np.ndarray:
+        return self.targets[self.offsets[v] : self.offsets[v + 1]]
+
+    def edges(self, u: int, v: int) -> np.ndarray:
+        """Indices of the edges from u to v."""
+        start = self.offsets[u]
+        return start + np.flatnonzero(self.successors(u) == v)
+
+    def reverse(self) -> "Graph":
+        return Graph.from_edges(
+            self.num_nodes, self.targets, self.sources, self.weights, self.names
+        )
+
+    def _out_edges(self, frontier: np.ndarray) -> np.ndarray:
+        starts = self.offsets[frontier]
+        counts = self.offsets[frontier + 1] - starts
+        ends = np.cumsum(counts)
+        first = np.repeat(starts - ends + counts, counts)
+        return np.arange(ends[-1] if len(ends) else 0) + first
+
+    def bfs(self, source: int, edge_mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """Number of edges on a shortest path to every node, or -1 if unreachable."""
+        distances = np.full(self.num_nodes, -1, dtype=np.int64)
+        distances[source] = 0
+        frontier = np.array([source])
+        level = 0
+        while len(frontier):
+            level += 1
+            edges = self._out_edges(frontier)
+            if edge_mask is not None:
+                edges = edges[edge_mask[edges]]
+            frontier = np.unique(self.targets[edges])
+            frontier = frontier[distances[frontier] < 0]
+            distances[frontier] = level
+        return distances
+
+    def dfs(self, source: int, edge_mask: Optional[np.ndarray] = None) -> List[int]:
+        """Nodes reachable from source in depth-first preorder."""
+        adjacency = self.adjacency
+        offsets = self.offsets.tolist()
+        allowed = None if edge_mask is None else edge_mask.tolist()
+        seen = bytearray(self.num_nodes)
+        order = []
+        stack = [source]
+        while stack:
+            v = stack.pop()
+            if seen[v]:
+                continue
+            seen[v] = 1
+            order.append(v)
+            successors = adjacency[v]
+            for i in range(len(successors) - 1, -1, -1):
+                if allowed is None or allowed[offsets[v] + i]:
+                    stack.append(successors[i])
+        return order
+
+    def opposite_edges(self) -> np.ndarray:
+        """Index of the edge back from the target of every edge to its source."""
+        forward = self.sources * self.num_nodes + self.targets
+        backward = self.targets * self.num_nodes + self.sources
+        order = np.argsort(forward, kind="stable")
+        at = np.minimum(
+            np.searchsorted(forward, backward, sorter=order), self.num_edges - 1
+        )
+        opposite = order[at] if self.num_edges else order
+        if (forward[opposite] != backward).any():
+            raise ValueError("Graph has edges without an opposite")
+        return opposite
+
+    def components(self, edge_mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Component label of every node, numbered in order of their lowest node.
+        Edges are followed in their own direction only, so for undirected
+        graphs these are the connected components. Each node is labelled once,
+        by a search from the lowest unlabelled node that stops at labelled ones.
+        """
+        adjacency = self.adjacency
+        offsets = self.offsets.tolist()
+        allowed = None if edge_mask is None else edge_mask.tolist()
+        labels = [-1] * self.num_nodes
+        label = 0
+        for root in range(self.num_nodes):
+            if labels[root] >= 0:
+                continue
+            labels[root] = label
+            queue = [root]
+            # Iterating a list also visits what is appended to it meanwhile
+            for v in queue:
+                start = offsets[v]
+                for i, w in enumerate(adjacency[v]):
+                    if labels[w] < 0 and (allowed is None or allowed[start + i]):
+                        labels[w] = label
+                        queue.append(w)
+            label += 1
+        return np.array(labels, dtype=np.int64)
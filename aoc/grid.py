@@ -0,0 +1,130 @@
+"""
+Character grids backed by a contiguous uint8 array.
+
+Points are (x, y) tuples like in the solvers, cells are addressed either by
+point or by flat index y * width + x, and neighbour tables use flat indices
+with -1 for positions outside the grid.
+"""
+from functools import cached_property
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+Point2d = Tuple[int, int]
+
+# Right, down, left, up
+DIRECTIONS: List[Point2d] = [(1, 0), (0, 1), (-1, 0), (0, -1)]
+
+
+class Grid:
+    cells: np.ndarray
+
+    def __init__(self, cells: np.ndarray):
+        self.cells = np.ascontiguousarray(cells, dtype=np.uint8)
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[str]) -> "Grid":
+        rows = list(filter(len, (line.strip() for line in lines)))
+        if len(set(map(len, rows))) > 1:
+            raise ValueError("Grid rows have different lengths")
+        data = np.frombuffer("".join(rows).encode("ascii"), dtype=np.uint8)
+        return cls(data.reshape(len(rows), -1).copy())
+
+    @property
+    def height(self) -> int:
+        return self.cells.shape[0]
+
+    @property
+    def width(self) -> int:
+        return self.cells.shape[1]
+
+    @property
+    def size(self) -> int:
+        return self.cells.size
+
+    @property
+    def rows(self) -> np.ndarray:
+        return self.cells
+
+    @property
+    def cols(self) -> np.ndarray:
+        return self.cells.T
+
+    def row(self, y: int) -> np.ndarray:
+        return self.cells[y]
+
+    def col(self, x: int) -> np.ndarray:
+        return self.cells[:, x]
+
+    def contains(self, pt: Point2d) -> bool:
+        return 0 <= pt[0] < self.width and 0 <= pt[1] < self.height
+
+    def __getitem__(self, pt: Point2d) -> str:
+        if not self.contains(pt):
+            raise IndexError(f"{pt} is outside the grid")
+        return chr(self.cells[pt[1], pt[0]])
+
+    def get(self, pt: Point2d, default: Optional[str] = None) -> Optional[str]:
+        return self[pt] if self.contains(pt) else default
+
+    def flat(self, pt: Point2d) -> int:
+        return pt[1] * self.width + pt[0]
+
+    def point(self, i: int) -> Point2d:
+        return (i % self.width, i // self.width)
+
+    def mask(self, chars: str) -> np.ndarray:
+        return np.isin(self.cells, np.frombuffer(chars.encode("ascii"), dtype=np.uint8))
+
+    def find(self, char: str) -> np.ndarray:
+        return np.flatnonzero(self.cells.ravel() == ord(char))
+
+    def find_one(self, char: str) -> Point2d:
+        found = self.find(char)
+        if len(found) != 1:
+            raise ValueError(f"Expected one {char} but found {len(found)}")
+        return self.point(int(found[0]))
+
+    @cached_property
+    def neighbors(self) -> np.ndarray:
+        """Flat index of the neighbour in each of DIRECTIONS, or -1."""
+        idx = np.arange(self.size).reshape(self.cells.shape)
+        nbrs = np.full(self.cells.shape + (len(DIRECTIONS),), -1, dtype=np.int64)
+        nbrs[:, :-1, 0] = idx[:, 1:]
+        nbrs[:-1, :, 1] = idx[1:, :]
+        nbrs[:, 1:, 2] = idx[:, :-1]
+        nbrs[1:, :, 3] = idx[:-1, :]
+        return nbrs.reshape(self.size, len(DIRECTIONS))
+
+    def lines(self) -> List[str]:
+        return [row.tobytes().decode("ascii") for row in self.cells]
+
+    def copy(self) -> "Grid":
+        return Grid(self.cells.copy())
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Grid) and np.array_equal(self.cells, other.cells)
+
+    def __hash__(self) -> int:
+        return hash((self.cells.shape, self.cells.tobytes()))
+
+    def __repr__(self) -> str:
+        return "\n".join(self.lines())
+
+    def __getstate__(self):
+        return {"cells": self.cells}
+
+
+def dilate(mask: np.ndarray, diagonal: bool = False) -> np.ndarray:
+    """Cells of mask plus their 4 (or 8 with diagonal) neighbours within bounds."""
+    result = mask.copy()
+    result[1:, :] |= mask[:-1, :]
+    result[:-1, :] |= mask[1:, :]
+    result[:, 1:] |= mask[:, :-1]
+    result[:, :-1] |= mask[:, 1:]
+    if diagonal:
+        result[1:, 1:] |= mask[:-1, :-1]
+        result[1:, :-1] |= mask[:-1, 1:]
+        result[:-1, 1:] |= mask[1:, :-1]
+        result[:-1, :-1] |= mask[1:, 1:]
+    return result
@@ -0,0 +1,107 @@
+"""
+Open puzzle inputs that may be compressed or piped in, without reading them
+whole.
+
+A source is a filename, "-" for standard input or an open binary file. Gzip
+and zstd sources are recognised by their magic bytes rather than their names,
+so compressed input can be piped in too, and are decompressed incrementally.
+zstd needs the optional zstandard package. Lines are decoded lazily and chunks
+are split at newlines, so parsers only ever hold one line or chunk of the raw
+text at a time.
+"""
+from contextlib import contextmanager
+import gzip
+import io
+import sys
+from typing import BinaryIO, Iterator, Union
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+Source = Union[str, BinaryIO]
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+CHUNK_BYTES = 1 << 24
+
+
+def _buffered(file: BinaryIO) -> io.BufferedIOBase:
+    return file if hasattr(file, "peek") else io.BufferedReader(file)
+
+
+def compression_of(file: io.BufferedIOBase) -> str:
+    """'gzip', 'zstd' or '' for the stream, which is left unconsumed."""
+    magic = file.peek(len(ZSTD_MAGIC))[: len(ZSTD_MAGIC)]
+    if magic.startswith(GZIP_MAGIC):
+        return "gzip"
+    if magic.startswith(ZSTD_MAGIC):
+        return "zstd"
+    return ""
+
+
+def is_compressed(filename: str) -> bool:
+    with open(filename, "rb") as file:
+        return compression_of(file) != ""
+
+
+@contextmanager
+def open_binary(source: Source) -> Iterator[BinaryIO]:
+    """The decompressed bytes of source as a binary stream."""
+    if isinstance(source, str) and source != "-":
+        file, owned = open(source, "rb"), True
+    else:
+        raw = sys.stdin.buffer if source == "-" else source
+        file, owned = _buffered(raw), False
+    try:
+        compression = compression_of(file)
+        if compression == "gzip":
+            with gzip.GzipFile(fileobj=file) as stream:
+                yield stream
+        elif compression == "zstd":
+            if zstandard is None:
+                raise RuntimeError("Reading zstd input needs the zstandard package")
+            with zstandard.ZstdDecompressor().stream_reader(file) as reader:
+                yield io.BufferedReader(reader)
+        else:
+            yield file
+    finally:
+        if owned:
+            file.close()
+        elif file is not raw and not file.closed:
+            # Unwrap rather than let the wrapper close the caller's stream
+            file.detach()
+
+
+def read_lines(source: Source) -> Iterator[str]:
+    """Lines of source decoded one at a time, including their newlines."""
+    with open_binary(source) as stream:
+        text = io.TextIOWrapper(stream, encoding="utf-8")
+        try:
+            # Not yield from, which would close text and the stream under it
+            # when the generator is closed early
+            for line in text:
+                yield line
+        finally:
+            # Leave closing the stream, which may be stdin, to open_binary
+            if not text.closed:
+                text.detach()
+
+
+def read_chunks(source: Source, size: int = CHUNK_BYTES) -> Iterator[bytes]:
+    """
+    About size bytes of source at a time, each ending with a newline except
+    possibly the last, so that no line is split between chunks.
+    """
+    with open_binary(source) as stream:
+        rest = b""
+        while block := stream.read(size):
+            newline = block.rfind(b"\n")
+            if newline < 0:
+                rest += block
+                continue
+            yield rest + block[: newline + 1]
+            rest = block[newline + 1 :]
+        if rest:
+            yield rest
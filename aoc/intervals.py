@@ -0,0 +1,285 @@
+"""
+Sets of closed integer intervals stored as one sorted array of boundaries.
+
+An IntervalSet keeps the half-open bounds [start, end + 1) of its intervals
+in a flat array('q'), so the intervals are always sorted and coalesced, a
+value is a member when an odd number of bounds are at or below it, and a
+split is two slices. Bulk operations merge bounds in O(n log n). An
+IntervalMap translates intervals piecewise, a chain of them composes into one
+map in a few NumPy passes, and Preimages indexes a map for inverse queries.
+Boxes are hyper-rectangles given as an IntervalSet per named dimension.
+"""
+from array import array
+from bisect import bisect_left, bisect_right
+import math
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+
+import numpy as np
+
+Interval = Tuple[int, int]
+
+
+class IntervalSet:
+    bounds: array
+
+    def __init__(self, bounds: Iterable[int] = ()):
+        """bounds must be strictly increasing and of even length."""
+        self.bounds = array("q", bounds)
+
+    @classmethod
+    def interval(cls, start: int, end: int) -> "IntervalSet":
+        return cls((start, end + 1) if start <= end else ())
+
+    @classmethod
+    def from_intervals(cls, intervals: Iterable[Interval]) -> "IntervalSet":
+        bounds: List[int] = []
+        for start, end in sorted(i for i in intervals if i[0] <= i[1]):
+            if bounds and start <= bounds[-1]:
+                bounds[-1] = max(bounds[-1], end + 1)
+            else:
+                bounds += [start, end + 1]
+        return cls(bounds)
+
+    def __len__(self) -> int:
+        return len(self.bounds) // 2
+
+    def __iter__(self) -> Iterator[Interval]:
+        return zip(self.bounds[::2], (end - 1 for end in self.bounds[1::2]))
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, IntervalSet) and self.bounds == other.bounds
+
+    def __repr__(self) -> str:
+        return f"IntervalSet({list(self)})"
+
+    def __contains__(self, value: int) -> bool:
+        return bisect_right(self.bounds, value) % 2 == 1
+
+    def min(self) -> int:
+        return self.bounds[0]
+
+    def max(self) -> int:
+        return self.bounds[-1] - 1
+
+    def volume(self) -> int:
+        """Number of integers in the set."""
+        return sum(self.bounds[1::2]) - sum(self.bounds[::2])
+
+    def total(self) -> int:
+        """Sum of the integers in the set."""
+        bounds = self.bounds
+        return sum(
+            (bounds[i] + bounds[i + 1] - 1) * (bounds[i + 1] - bounds[i]) // 2
+            for i in range(0, len(bounds), 2)
+        )
+
+    def split(self, threshold: int) -> Tuple["IntervalSet", "IntervalSet"]:
+        """Parts of the set below threshold and at or above it."""
+        i = bisect_left(self.bounds, threshold)
+        if i == 0:
+            return IntervalSet(), self
+        if i == len(self.bounds):
+            return self, IntervalSet()
+        cut = array("q", [threshold])
+        j = bisect_right(self.bounds, threshold)
+        return (
+            IntervalSet(self.bounds[:i] + cut if i % 2 else self.bounds[:i]),
+            IntervalSet(cut + self.bounds[j:] if j % 2 else self.bounds[j:]),
+        )
+
+    def translate(self, offset: int) -> "IntervalSet":
+        return IntervalSet(bound + offset for bound in self.bounds)
+
+    def _combine(
+        self, other: "IntervalSet", op: Callable[[bool, bool], bool]
+    ) -> "IntervalSet":
+        bounds: List[int] = []
+        inside = False
+        for bound in sorted(set(self.bounds) | set(other.bounds)):
+            if op(bound in self, bound in other) != inside:
+                bounds.append(bound)
+                inside = not inside
+        return IntervalSet(bounds)
+
+    def __or__(self, other: "IntervalSet") -> "IntervalSet":
+        return self._combine(other, lambda a, b: a or b)
+
+    def __and__(self, other: "IntervalSet") -> "IntervalSet":
+        return self._combine(other, lambda a, b: a and b)
+
+    def __sub__(self, other: "IntervalSet") -> "IntervalSet":
+        return self._combine(other, lambda a, b: a and not b)
+
+
+class IntervalMap:
+    """
+    Translations of disjoint source intervals, leaving everything outside them
+    unchanged.
+    """
+
+    starts: array
+    ends: array
+    offsets: array
+
+    def __init__(self, rules: Iterable[Tuple[int, int, int]]):
+        """rules are (start, end, offset), sorted by start and disjoint."""
+        rules = list(rules)
+        self.starts = array("q", (start for start, _, _ in rules))
+        self.ends = array("q", (end for _, end, _ in rules))
+        self.offsets = array("q", (offset for _, _, offset in rules))
+
+    @classmethod
+    def from_arrays(
+        cls, starts: np.ndarray, ends: np.ndarray, offsets: np.ndarray
+    ) -> "IntervalMap":
+        """Rules as arrays of their starts, ends and offsets."""
+        result = cls([])
+        for bounds, values in zip(
+            (result.starts, result.ends, result.offsets), (starts, ends, offsets)
+        ):
+            bounds.frombytes(np.ascontiguousarray(values, dtype=np.int64).tobytes())
+        return result
+
+    @classmethod
+    def from_rules(cls, rules: Iterable[Tuple[int, int, int]]) -> "IntervalMap":
+        """The first rule covering a value wins."""
+        rules = [rule for rule in rules if rule[0] <= rule[1]]
+        ordered = sorted(rules)
+        if all(a[1] < b[0] for a, b in zip(ordered, ordered[1:])):
+            return cls(ordered)
+        pieces: List[Tuple[int, int, int]] = []
+        covered = IntervalSet()
+        for start, end, offset in rules:
+            rule = IntervalSet.interval(start, end)
+            pieces.extend((s, e, offset) for s, e in rule - covered)
+            covered = covered | rule
+        return cls(sorted(pieces))
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def apply(self, intervals: IntervalSet) -> IntervalSet:
+        pieces: List[Interval] = []
+        for start, end in intervals:
+            # First rule ending at or after start
+            i = bisect_left(self.ends, start)
+            while start <= end:
+                if i < len(self.starts) and self.starts[i] <= start:
+                    piece_end, offset = min(end, self.ends[i]), self.offsets[i]
+                    i += 1
+                else:
+                    next_start = self.starts[i] if i < len(self.starts) else end + 1
+                    piece_end, offset = min(end, next_start - 1), 0
+                pieces.append((start + offset, piece_end + offset))
+                start = piece_end + 1
+        return IntervalSet.from_intervals(pieces)
+
+    def offsets_at(self, values: np.ndarray) -> np.ndarray:
+        """Offset the map adds to each of values."""
+        values = np.asarray(values, dtype=np.int64)
+        if not len(self):
+            return np.zeros(values.shape, dtype=np.int64)
+        starts = np.frombuffer(self.starts, dtype=np.int64)
+        ends = np.frombuffer(self.ends, dtype=np.int64)
+        offsets = np.frombuffer(self.offsets, dtype=np.int64)
+        # Last rule starting at or before each value
+        i = np.searchsorted(starts, values, side="right") - 1
+        inside = (i >= 0) & (values <= ends[np.maximum(i, 0)])
+        return np.where(inside, offsets[np.maximum(i, 0)], 0)
+
+    def breakpoints(self) -> np.ndarray:
+        """Values where the offset changes, in order."""
+        bounds = np.concatenate(
+            [
+                np.frombuffer(self.starts, dtype=np.int64),
+                np.frombuffer(self.ends, dtype=np.int64) + 1,
+            ]
+        )
+        return np.unique(bounds)
+
+    def then(self, other: "IntervalMap") -> "IntervalMap":
+        """The map translating by self and then by other."""
+        points = self.breakpoints()
+        other_points = other.breakpoints()
+        # The offset of self is constant from each of points to the next, and
+        # before the first of them, where it is 0
+        offsets = np.append(0, self.offsets_at(points))
+        lows = np.searchsorted(other_points, np.append(0, points) + offsets)
+        lows[0] = 0
+        highs = np.searchsorted(other_points, np.append(points, 0) + offsets)
+        highs[-1] = len(other_points)
+        # Values that self maps onto a breakpoint of other
+        counts = np.maximum(highs - lows, 0)
+        segment = np.repeat(np.arange(len(counts)), counts)
+        first = np.repeat(lows - np.cumsum(counts) + counts, counts)
+        landing = other_points[np.arange(counts.sum()) + first] - offsets[segment]
+        points = np.union1d(points, landing)
+        offset = self.offsets_at(points)
+        offset += other.offsets_at(points + offset)
+        # Drop the points where the offset stays the same
+        changes = np.flatnonzero(np.diff(offset, prepend=0))
+        points, offset = points[changes], offset[changes]
+        ends = np.append(points[1:], 0) - 1
+        keep = offset != 0
+        return IntervalMap.from_arrays(points[keep], ends[keep], offset[keep])
+
+
+class Preimages:
+    """
+    The inverse of an IntervalMap, which need not be one to one. Where the
+    stretches between its breakpoints land, the line is cut at every start
+    and end, and each cut lists the stretches covering it until the next.
+    """
+
+    cuts: List[int]
+    # Stretches covering cut j are stretches[covers[j]:covers[j + 1]]
+    covers: List[int]
+    stretches: List[int]
+    offsets: List[int]
+    # Values below low or from high on are left unchanged
+    low: int
+    high: int
+
+    def __init__(self, forward: IntervalMap):
+        points = forward.breakpoints()
+        offsets = forward.offsets_at(points[:-1])
+        starts = points[:-1] + offsets
+        ends = points[1:] - 1 + offsets
+        cuts = np.unique(np.concatenate([starts, ends + 1]))
+        first = np.searchsorted(cuts, starts)
+        counts = np.searchsorted(cuts, ends + 1) - first
+        stretch = np.repeat(np.arange(len(starts)), counts)
+        # Consecutive cuts from the first one each stretch covers
+        skip = np.repeat(first - np.cumsum(counts) + counts, counts)
+        cut = np.arange(len(stretch)) + skip
+        order = np.argsort(cut, kind="stable")
+        self.cuts = cuts.tolist()
+        self.covers = np.searchsorted(cut[order], np.arange(len(cuts))).tolist()
+        self.stretches = stretch[order].tolist()
+        self.offsets = offsets.tolist()
+        self.low, self.high = (0, 0)
+        if len(points):
+            self.low, self.high = int(points[0]), int(points[-1])
+
+    def apply(self, values: IntervalSet) -> IntervalSet:
+        """Everything the map sends into values."""
+        cuts, covers = self.cuts, self.covers
+        pieces: List[Interval] = []
+        for start, end in values:
+            pieces += [(start, min(end, self.low - 1)), (max(start, self.high), end)]
+            j = max(bisect_right(cuts, start) - 1, 0)
+            while j < len(cuts) - 1 and cuts[j] <= end:
+                low, high = max(start, cuts[j]), min(end, cuts[j + 1] - 1)
+                if low <= high:
+                    for k in range(covers[j], covers[j + 1]):
+                        offset = self.offsets[self.stretches[k]]
+                        pieces.append((low - offset, high - offset))
+                j += 1
+        return IntervalSet.from_intervals(pieces)
+
+
+Box = Dict[str, IntervalSet]
+
+
+def volume(box: Box) -> int:
+    return math.prod(intervals.volume() for intervals in box.values())
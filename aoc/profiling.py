@@ -0,0 +1,142 @@
+"""
+Profile parse and solve calls with cProfile and tracemalloc.
+
+A Profiler times a call like runner.timed, dumps a .prof file for it that
+pstats or snakeviz can load, and reports peak memory and the functions with
+the most cumulative time. The progress lines that slow solvers print are only
+shown while a call is being profiled and are otherwise skipped. Every entry
+point takes
+--profile DIR: the runner, scheduler, batch and daemon profile each parse and
+solve, and the day scripts call profile_main to profile the whole run.
+"""
+import atexit
+from contextlib import contextmanager
+import cProfile
+import os
+from os import path
+import pstats
+import sys
+from time import perf_counter
+import tracemalloc
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+# Whether solvers should report progress; set while a call is profiled
+verbose = False
+_progress_shown = False
+
+
+def progress(message: str):
+    """Overwrite the current progress line on stderr."""
+    global _progress_shown
+    _progress_shown = True
+    print(f"\r{message}", end="", file=sys.stderr, flush=True)
+
+
+def progress_done():
+    global _progress_shown
+    if _progress_shown:
+        print(file=sys.stderr)
+        _progress_shown = False
+
+
+@contextmanager
+def verbosely() -> Iterator[None]:
+    """Have solvers report progress until the block ends."""
+    global verbose
+    previous, verbose = verbose, True
+    try:
+        yield
+    finally:
+        verbose = previous
+
+
+def top_functions(profile: cProfile.Profile, limit: int) -> List[Tuple[str, float]]:
+    stats = pstats.Stats(profile).stats  # type: ignore[attr-defined]
+    rows = [
+        (f"{path.relpath(filename)}:{line}({name})", cumulative)
+        for (filename, line, name), (_, _, _, cumulative, _) in stats.items()
+        if not filename.startswith("<") and filename != __file__
+    ]
+    return sorted(rows, key=lambda row: -row[1])[:limit]
+
+
+class Profiler:
+    def __init__(self, out_dir: str, top: int = 5):
+        self.out_dir = out_dir
+        self.top = top
+        os.makedirs(out_dir, exist_ok=True)
+
+    def __call__(self, name: str, f: Callable, *args) -> Tuple[Any, float, str]:
+        """f(*args), its wall time and a report on the call."""
+        profile, was_tracing, start = self.start()
+        try:
+            with verbosely():
+                result = profile.runcall(f, *args)
+        finally:
+            elapsed, report = self.stop(name, profile, was_tracing, start)
+        return result, elapsed, report
+
+    def start(self) -> Tuple[cProfile.Profile, bool, float]:
+        was_tracing = tracemalloc.is_tracing()
+        if not was_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        return cProfile.Profile(), was_tracing, perf_counter()
+
+    def stop(
+        self, name: str, profile: cProfile.Profile, was_tracing: bool, start: float
+    ) -> Tuple[float, str]:
+        """Wall time since start and a report on the profile, dumped to name.prof."""
+        elapsed = perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        if not was_tracing:
+            tracemalloc.stop()
+        progress_done()
+        filename = path.join(self.out_dir, f"{name}.prof")
+        profile.dump_stats(filename)
+        lines = [
+            f"{name}: {elapsed * 1000:.2f} ms, peak {peak / 2**20:.2f} MiB, {filename}"
+        ]
+        lines += [
+            f"  {cumulative * 1000:>10.2f} ms  {function}"
+            for function, cumulative in top_functions(profile, self.top)
+        ]
+        return elapsed, "\n".join(lines)
+
+
+def take_profile_dir(argv: List[str]) -> Optional[str]:
+    """Remove --profile DIR or --profile=DIR from argv and return DIR."""
+    for i, arg in enumerate(argv):
+        if arg == "--profile" and i + 1 < len(argv):
+            out_dir = argv[i + 1]
+            del argv[i : i + 2]
+            return out_dir
+        if arg.startswith("--profile="):
+            del argv[i]
+            return arg.partition("=")[2]
+    return None
+
+
+def profile_main(name: str, argv: List[str] = sys.argv) -> Optional[Profiler]:
+    """
+    Profile the rest of the process into DIR/name.prof when argv has
+    --profile DIR, which is taken out so the script's own arguments are
+    unchanged, and print the report to stderr at exit.
+    """
+    out_dir = take_profile_dir(argv)
+    if out_dir is None:
+        return None
+    profiler = Profiler(out_dir)
+    profile, was_tracing, start = profiler.start()
+    # The profiled call is the rest of the process
+    verbose_run = verbosely()
+    verbose_run.__enter__()
+
+    def report():
+        profile.disable()
+        verbose_run.__exit__(None, None, None)
+        print(profiler.stop(name, profile, was_tracing, start)[1], file=sys.stderr)
+
+    atexit.register(report)
+    profile.enable()
+    return profiler
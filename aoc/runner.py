@@ -0,0 +1,171 @@
+"""
+Run every day's solver in a single process.
+
+    python -m aoc.runner [DAY ...] [--part N] [--input NAME] [--no-cache] [--no-store]
+        [--profile DIR]
+
+Each day's module is imported once and its input parsed once, so the reported
+parse and solve times exclude interpreter startup and import cost. Parsed
+inputs are loaded from the parse cache unless --no-cache is given, and answers
+already in the answer store are returned without solving unless --no-store is
+given. With --profile, every parse and solve is profiled into DIR and
+solvers print their progress.
+"""
+import argparse
+from dataclasses import dataclass
+from functools import partial
+from os import path
+import sys
+from time import perf_counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from aoc.answers import MISSING, AnswerStore, answer_key
+from aoc.cache import cached_parse, file_digest
+from aoc.profiling import Profiler
+from aoc.solvers import DAYS, Solver, find_input, load_solvers
+
+
+@dataclass
+class Result:
+    day: int
+    part: int
+    input: str
+    answer: Any
+    parse_s: float
+    solve_s: float
+    stored: bool = False
+    profile: str = ""
+    # Why the part has no answer, if it failed
+    error: str = ""
+
+
+def timed(f, *args):
+    start = perf_counter()
+    result = f(*args)
+    return result, perf_counter() - start
+
+
+def measured(
+    profiler: Optional[Profiler], name: str, f, *args
+) -> Tuple[Any, float, str]:
+    if profiler is None:
+        return (*timed(f, *args), "")
+    return profiler(name, f, *args)
+
+
+def profile_name(day: int, filename: str, step: str) -> str:
+    return f"day{day:02d}-{path.splitext(path.basename(filename))[0]}-{step}"
+
+
+def parse_with(solver: Solver, use_cache: bool):
+    return partial(cached_parse, solver) if use_cache else solver.parse
+
+
+def run_solver(
+    solver: Solver,
+    filename: str,
+    parts: Optional[Iterable[int]] = None,
+    use_cache: bool = True,
+    store: Optional[AnswerStore] = None,
+    profiler: Optional[Profiler] = None,
+) -> List[Result]:
+    available = solver.parts_for(filename)
+    parts = [
+        part for part in (available if parts is None else parts) if part in available
+    ]
+    digest = file_digest(filename) if store else ""
+    results: Dict[int, Result] = {}
+    for part in parts if store else []:
+        answer, lookup_s = timed(store.get, answer_key(solver, part, digest))
+        if answer is not MISSING:
+            results[part] = Result(solver.day, part, filename, answer, 0, lookup_s, True)
+    if len(results) < len(parts):
+        parsed, parse_s, parse_profile = measured(
+            profiler,
+            profile_name(solver.day, filename, "parse"),
+            parse_with(solver, use_cache),
+            filename,
+        )
+        for part in parts:
+            if part in results:
+                continue
+            answer, solve_s, solve_profile = measured(
+                profiler,
+                profile_name(solver.day, filename, f"part{part}"),
+                solver.parts[part],
+                parsed,
+            )
+            results[part] = Result(
+                solver.day,
+                part,
+                filename,
+                answer,
+                parse_s,
+                solve_s,
+                profile="\n".join(filter(None, [parse_profile, solve_profile])),
+            )
+            parse_profile = ""
+            if store:
+                store.put(answer_key(solver, part, digest), answer)
+    return [results[part] for part in parts]
+
+
+def run_all(
+    solvers: Dict[int, Solver],
+    input_name: str = "input",
+    parts: Optional[Iterable[int]] = None,
+    use_cache: bool = True,
+    store: Optional[AnswerStore] = None,
+    profiler: Optional[Profiler] = None,
+) -> List[Result]:
+    return [
+        result
+        for day, solver in solvers.items()
+        for result in run_solver(
+            solver, find_input(day, input_name), parts, use_cache, store, profiler
+        )
+    ]
+
+
+def format_results(results: List[Result]) -> str:
+    names = [path.basename(r.input) for r in results]
+    width = max([len("input"), *map(len, names)])
+    lines = [
+        f"{'day':>3} {'part':>4} {'input':<{width}} {'parse ms':>10} {'solve ms':>10}  answer"
+    ]
+    for r, name in zip(results, names):
+        lines.append(
+            f"{r.day:>3} {r.part:>4} {name:<{width}} {r.parse_s * 1000:>10.2f}"
+            f" {r.solve_s * 1000:>10.2f}  {f'error: {r.error}' if r.error else r.answer}"
+            + (" (stored)" if r.stored else "")
+        )
+    return "\n".join(lines)
+
+
+def format_profiles(results: List[Result]) -> str:
+    return "\n".join(r.profile for r in results if r.profile)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("days", nargs="*", type=int, default=DAYS)
+    parser.add_argument("--part", type=int, action="append", dest="parts")
+    parser.add_argument("--input", default="input", help="input name, e.g. example")
+    parser.add_argument("--no-cache", action="store_true", help="always parse inputs")
+    parser.add_argument("--no-store", action="store_true", help="always solve")
+    parser.add_argument("--profile", metavar="DIR", help="write .prof files to DIR")
+    args = parser.parse_args(argv)
+    solvers, import_s = timed(load_solvers, args.days)
+    print(f"Imported {len(solvers)} solvers in {import_s * 1000:.2f} ms", file=sys.stderr)
+    store = None if args.no_store else AnswerStore()
+    profiler = Profiler(args.profile) if args.profile else None
+    results = run_all(solvers, args.input, args.parts, not args.no_cache, store, profiler)
+    if store:
+        store.close()
+    print(format_results(results))
+    if profiler:
+        print(format_profiles(results), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
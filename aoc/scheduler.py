@@ -0,0 +1,196 @@
+"""
+Run every (day, input) job concurrently on a process pool.
+
+    python -m aoc.scheduler [DAY ...] [--part N] [--input NAME ...] [--workers N]
+        [--no-cache] [--no-store] [--profile DIR]
+
+A job parses one input of a day once and solves all of its selected parts.
+Jobs are submitted longest first according to the parse and part runtimes
+recorded by previous runs, so the slowest solvers start immediately and the
+total wall time approaches that of the slowest single job. Results are
+reported in (day, part, input) order regardless of completion order. Parts
+whose answers are already in the answer store are not solved at all. A job
+that fails reports the error for each of its parts without stopping the
+others. With --profile, each worker profiles its jobs into DIR.
+"""
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import json
+import math
+import os
+from os import path
+import sys
+from time import perf_counter
+from typing import Dict, List, Optional, Tuple
+
+from aoc.answers import MISSING, AnswerStore, answer_key
+from aoc.cache import file_digest
+from aoc.profiling import Profiler
+from aoc.runner import Result, format_profiles, format_results, run_solver, timed
+from aoc.solvers import DAYS, ROOT, find_input, load_solver
+
+RUNTIMES = path.join(ROOT, "benchmarks", "runtimes.json")
+
+# A day, an input and the parts to solve for it
+Job = Tuple[int, str, Tuple[int, ...]]
+
+
+def runtime_key(day: int, filename: str, step: str) -> str:
+    return f"day{day:02d}/{path.basename(filename)}/{step}"
+
+
+def run_job(
+    job: Job, use_cache: bool = True, profile_dir: Optional[str] = None
+) -> List[Result]:
+    day, filename, parts = job
+    profiler = Profiler(profile_dir) if profile_dir else None
+    return run_solver(load_solver(day), filename, parts, use_cache, None, profiler)
+
+
+def load_runtimes(filename: str = RUNTIMES) -> Dict[str, float]:
+    if not path.exists(filename):
+        return {}
+    with open(filename) as file:
+        return json.load(file)
+
+
+def save_runtimes(runtimes: Dict[str, float], filename: str = RUNTIMES):
+    os.makedirs(path.dirname(filename), exist_ok=True)
+    with open(filename, "w") as file:
+        json.dump(runtimes, file, indent=2, sort_keys=True)
+        file.write("\n")
+
+
+def estimated_runtime(job: Job, runtimes: Dict[str, float]) -> float:
+    day, filename, parts = job
+    steps = ["parse", *map(str, parts)]
+    # Jobs without history might be slow, so they are started first
+    return sum(runtimes.get(runtime_key(day, filename, step), math.inf) for step in steps)
+
+
+def longest_first(jobs: List[Job], runtimes: Dict[str, float]) -> List[Job]:
+    return sorted(jobs, key=lambda job: -estimated_runtime(job, runtimes))
+
+
+def failed(job: Job, error: Exception) -> List[Result]:
+    day, filename, parts = job
+    message = f"{type(error).__name__}: {error}"
+    return [Result(day, part, filename, None, 0, 0, error=message) for part in parts]
+
+
+def schedule(
+    jobs: List[Job],
+    runtimes: Dict[str, float],
+    workers: Optional[int] = None,
+    use_cache: bool = True,
+    store: Optional[AnswerStore] = None,
+    profile_dir: Optional[str] = None,
+) -> List[Result]:
+    results: List[Result] = []
+    keys: Dict[Tuple[int, int, str], str] = {}
+    pending: List[Job] = []
+    for day, filename, parts in jobs:
+        unsolved = []
+        for part in parts:
+            if store:
+                key = keys[day, part, filename] = stored_key(day, part, filename)
+                answer, lookup_s = timed(store.get, key)
+                if answer is not MISSING:
+                    results.append(Result(day, part, filename, answer, 0, lookup_s, True))
+                    continue
+            unsolved.append(part)
+        if unsolved:
+            pending.append((day, filename, tuple(unsolved)))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            (job, executor.submit(run_job, job, use_cache, profile_dir))
+            for job in longest_first(pending, runtimes)
+        ]
+        for job, future in futures:
+            # One failing solver must not lose the results of the others
+            try:
+                job_results = future.result()
+            except Exception as e:
+                job_results = failed(job, e)
+            results.extend(job_results)
+            for r in job_results:
+                if store and not r.error:
+                    store.put(keys[r.day, r.part, r.input], r.answer)
+    return sorted(results, key=lambda r: (r.day, r.part, r.input))
+
+
+def record_runtimes(results: List[Result], runtimes: Dict[str, float]):
+    for r in results:
+        if r.stored or r.error:
+            continue
+        runtimes[runtime_key(r.day, r.input, str(r.part))] = r.solve_s
+        runtimes[runtime_key(r.day, r.input, "parse")] = r.parse_s
+
+
+def stored_key(day: int, part: int, filename: str) -> str:
+    return answer_key(load_solver(day), part, file_digest(filename))
+
+
+def list_jobs(
+    days: List[int], input_names: List[str], parts: Optional[List[int]] = None
+) -> List[Job]:
+    jobs = []
+    for day in days:
+        solver = load_solver(day)
+        for input_name in input_names:
+            filename = find_input(day, input_name)
+            selected = tuple(
+                part
+                for part in solver.parts_for(filename)
+                if parts is None or part in parts
+            )
+            if selected:
+                jobs.append((day, filename, selected))
+    return jobs
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("days", nargs="*", type=int, default=DAYS)
+    parser.add_argument("--part", type=int, action="append", dest="parts")
+    parser.add_argument("--input", action="append", dest="inputs")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--no-cache", action="store_true", help="always parse inputs")
+    parser.add_argument("--no-store", action="store_true", help="always solve")
+    parser.add_argument("--profile", metavar="DIR", help="write .prof files to DIR")
+    args = parser.parse_args(argv)
+
+    jobs = list_jobs(args.days, args.inputs or ["input"], args.parts)
+    if not jobs:
+        print("No jobs to run", file=sys.stderr)
+        return
+    runtimes = load_runtimes()
+    start = perf_counter()
+    store = None if args.no_store else AnswerStore()
+    results = schedule(
+        jobs, runtimes, args.workers, not args.no_cache, store, args.profile
+    )
+    wall_s = perf_counter() - start
+    if store:
+        store.close()
+    print(format_results(results))
+    if args.profile:
+        print(format_profiles(results), file=sys.stderr)
+    solved = [r for r in results if not r.stored and not r.error]
+    # Parts solved in one job share its parse, which is counted once
+    job_s: Dict[Tuple[int, str], float] = {}
+    for r in solved:
+        job_s[r.day, r.input] = job_s.get((r.day, r.input), r.parse_s) + r.solve_s
+    print(
+        f"{len(jobs)} jobs on {args.workers} workers in {wall_s * 1000:.2f} ms"
+        f" (longest job {max(job_s.values(), default=0) * 1000:.2f} ms,"
+        f" sum {sum(job_s.values()) * 1000:.2f} ms)",
+        file=sys.stderr,
+    )
+    record_runtimes(results, runtimes)
+    save_runtimes(runtimes)
+    if any(r.error for r in results):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
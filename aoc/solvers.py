@@ -0,0 +1,163 @@
+"""
+Load each day's solver and the inputs it runs on.
+
+A day's module provides parse_input and a part1 and part2 function taking what
+it returns. READERS says how parse_input takes its input when it does not open
+a filename itself. The solver version is a hash of the day's source and every
+aoc module either imports, so caches keyed by it go stale with the code.
+"""
+import ast
+import hashlib
+import importlib
+from dataclasses import dataclass, field
+from glob import glob
+from os import path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from aoc.inputs import read_lines
+from aoc.tokens import Data, open_input
+
+ROOT = path.dirname(path.dirname(path.abspath(__file__)))
+DAYS = list(range(2, 26))
+
+Parse = Callable[[str], Any]
+Part = Callable[[Any], Any]
+
+
+@dataclass
+class Solver:
+    day: int
+    parse: Parse
+    parts: Dict[int, Part] = field(default_factory=dict)
+    version: str = ""
+    # Parts that only the real puzzle input can answer, skipped for examples
+    real_only: Set[int] = field(default_factory=set)
+
+    def parts_for(self, filename: str) -> List[int]:
+        is_example = path.basename(filename).startswith("example")
+        return [
+            part
+            for part in sorted(self.parts)
+            if not (is_example and part in self.real_only)
+        ]
+
+
+def from_lines(parse_input: Callable[[Iterable[str]], Any]) -> Parse:
+    def parse(filename: str):
+        return parse_input(read_lines(filename))
+
+    return parse
+
+
+def from_bytes(parse_input: Callable[[Data], Any]) -> Parse:
+    def parse(filename: str):
+        with open_input(filename) as data:
+            return parse_input(data)
+
+    return parse
+
+
+def day_dir(day: int) -> str:
+    return path.join(ROOT, f"day{day:02d}")
+
+
+def find_input(day: int, name: str = "input") -> str:
+    for candidate in (f"{name}.txt", f"{name}1.txt"):
+        for suffix in ("", ".gz", ".zst"):
+            filename = path.join(day_dir(day), candidate + suffix)
+            if path.exists(filename):
+                return filename
+    if path.exists(name):
+        return path.abspath(name)
+    raise FileNotFoundError(f"No {name} input found for day {day:02d}")
+
+
+def list_inputs(day: int, pattern: str = "*.txt") -> List[str]:
+    return sorted(
+        filename
+        for filename in glob(path.join(day_dir(day), pattern))
+        if path.basename(filename).startswith(("example", "input"))
+        and "analysis" not in filename
+    )
+
+
+# How each day's parse_input takes its input, where that is not a filename
+READERS: Dict[int, Callable[[Callable[[Any], Any]], Parse]] = {
+    5: from_bytes,
+    11: from_bytes,
+    13: from_lines,
+    14: from_lines,
+    15: from_lines,
+    16: from_lines,
+    18: from_lines,
+    19: from_lines,
+    21: from_lines,
+    22: from_bytes,
+    23: from_lines,
+    24: from_bytes,
+}
+# Day 20's part 2 needs an rx module, which the examples lack
+REAL_ONLY: Dict[int, Set[int]] = {20: {2}}
+
+
+def solver_of(day: int, m) -> Solver:
+    """The Solver for a day's module, from its parse_input, part1 and part2."""
+    reader = READERS.get(day)
+    return Solver(
+        day,
+        reader(m.parse_input) if reader else m.parse_input,
+        {
+            part: getattr(m, f"part{part}")
+            for part in (1, 2)
+            if hasattr(m, f"part{part}")
+        },
+        real_only=REAL_ONLY.get(day, set()),
+    )
+
+
+def source_digest(*filenames: str) -> str:
+    digest = hashlib.sha256()
+    for filename in filenames:
+        with open(filename, "rb") as file:
+            digest.update(file.read())
+    return digest.hexdigest()
+
+
+def aoc_sources(filename: str, seen: Optional[Set[str]] = None) -> List[str]:
+    """filename and every aoc module it imports, directly or through others."""
+    seen = set() if seen is None else seen
+    if filename in seen:
+        return []
+    seen.add(filename)
+    with open(filename, "rb") as file:
+        tree = ast.parse(file.read(), filename)
+    names = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            # from aoc import profiling names a module, from aoc.grid import Grid not
+            names += [node.module] + [f"{node.module}.{a.name}" for a in node.names]
+    sources = [filename]
+    for name in sorted(set(names)):
+        parts = name.split(".")
+        if parts[0] != "aoc" or len(parts) != 2:
+            continue
+        imported = path.join(ROOT, "aoc", f"{parts[1]}.py")
+        if path.exists(imported):
+            sources += aoc_sources(imported, seen)
+    return sources
+
+
+def load_solver(day: int) -> Solver:
+    module = importlib.import_module(f"day{day:02d}.main")
+    solver = solver_of(day, module)
+    # This module, the day and every aoc module either relies on
+    seen: Set[str] = set()
+    sources = aoc_sources(__file__, seen) + aoc_sources(module.__file__, seen)
+    solver.version = source_digest(*sources)
+    return solver
+
+
+def load_solvers(days: Optional[Iterable[int]] = None) -> Dict[int, Solver]:
+    return {day: load_solver(day) for day in (DAYS if days is None else days)}
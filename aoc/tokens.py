@@ -0,0 +1,167 @@
+"""
+Pull every integer out of an input in a few vectorised passes over its bytes.
+
+Files are read once, memory mapped when large, and scanned in newline-aligned
+chunks so temporary arrays stay bounded. Compressed and piped inputs are
+scanned chunk by chunk as they are decompressed. The result keeps the byte
+position of each integer and the index of the first integer on each line,
+which is enough structure for the line-oriented puzzle formats.
+"""
+from contextlib import contextmanager
+from dataclasses import dataclass
+import mmap
+import os
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from aoc.inputs import is_compressed, read_chunks
+
+Buffer = Union[bytes, bytearray, mmap.mmap]
+# A whole input, or its newline-aligned chunks in order
+Data = Union[Buffer, Iterable[Buffer]]
+
+# Files at least this large are memory mapped instead of read
+MMAP_MIN_BYTES = 1 << 20
+CHUNK_BYTES = 1 << 24
+
+
+@dataclass
+class Tokens:
+    # Every integer in input order
+    values: np.ndarray
+    # Byte offset of each integer, including its sign
+    positions: np.ndarray
+    # values[line_offsets[i]:line_offsets[i + 1]] are the integers on line i
+    line_offsets: np.ndarray
+
+    @property
+    def num_lines(self) -> int:
+        return len(self.line_offsets) - 1
+
+    def line(self, i: int) -> np.ndarray:
+        return self.values[self.line_offsets[i] : self.line_offsets[i + 1]]
+
+    def lines(self) -> List[np.ndarray]:
+        return np.split(self.values, self.line_offsets[1:-1])
+
+    def counts(self) -> np.ndarray:
+        return np.diff(self.line_offsets)
+
+    def table(self) -> np.ndarray:
+        """Integers as one row per non-empty line, which must be of equal length."""
+        counts = self.counts()
+        counts = counts[counts > 0]
+        if len(set(counts.tolist())) > 1:
+            raise ValueError("Lines have different numbers of integers")
+        return self.values.reshape(len(counts), -1)
+
+
+def _scan(buf: np.ndarray, signed: bool):
+    digits = buf - np.uint8(ord("0"))
+    is_digit = (digits < 10).view(np.int8)
+    edges = np.diff(is_digit, prepend=np.int8(0), append=np.int8(0))
+    starts = np.flatnonzero(edges == 1)
+    lengths = np.flatnonzero(edges == -1) - starts
+    values = np.zeros(len(starts), dtype=np.int64)
+    # Horner's rule over the k-th digit of every integer at once
+    last = len(buf) - 1
+    for k in range(int(lengths.max(initial=0))):
+        digit = digits[np.minimum(starts + k, last)]
+        values = np.where(lengths > k, values * 10 + digit, values)
+    if signed:
+        negative = buf[np.maximum(starts - 1, 0)] == ord("-")
+        negative &= starts > 0
+        values[negative] *= -1
+        starts = starts - negative
+    return values, starts, np.flatnonzero(buf == ord("\n")) + 1
+
+
+def buffer_chunks(data: Buffer) -> Iterator[np.ndarray]:
+    """Newline-aligned views of data of about CHUNK_BYTES each."""
+    start = 0
+    while start < len(data):
+        end = min(start + CHUNK_BYTES, len(data))
+        if end < len(data):
+            newline = data.rfind(b"\n", start, end)
+            if newline < 0:
+                newline = data.find(b"\n", end)
+            end = len(data) if newline < 0 else newline + 1
+        yield np.frombuffer(data, dtype=np.uint8, count=end - start, offset=start)
+        start = end
+
+
+def chunks_of(data: Data) -> Iterator[np.ndarray]:
+    if isinstance(data, (bytes, bytearray, mmap.mmap)):
+        return buffer_chunks(data)
+    return (np.frombuffer(chunk, dtype=np.uint8) for chunk in data)
+
+
+def tokenize(
+    data: Data,
+    signed: bool = False,
+    visit: Optional[Callable[[np.ndarray, int], None]] = None,
+) -> Tokens:
+    """
+    Integers in data, where a '-' directly before the digits negates them if
+    signed is set. visit is called with every chunk and its offset, for
+    parsers that need more of the text than its integers.
+    """
+    chunks = []
+    start = 0
+    for buf in chunks_of(data):
+        if visit:
+            visit(buf, start)
+        values, positions, line_starts = _scan(buf, signed)
+        chunks.append((values, positions + start, line_starts + start))
+        start += len(buf)
+        del buf
+    values = np.concatenate([c[0] for c in chunks] or [np.zeros(0, np.int64)])
+    positions = np.concatenate([c[1] for c in chunks] or [np.zeros(0, np.int64)])
+    line_starts = np.concatenate([[0]] + [c[2] for c in chunks]).astype(np.int64)
+    # A final newline ends the last line rather than starting an empty one
+    line_starts = line_starts[(line_starts < start) | (line_starts == 0)]
+    return Tokens(
+        values,
+        positions,
+        np.append(np.searchsorted(positions, line_starts), len(values)),
+    )
+
+
+def char_positions(data: Data, char: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Column and line of every occurrence of char."""
+    xs, ys = [], []
+    num_lines = 0
+    for buf in chunks_of(data):
+        found = np.flatnonzero(buf == ord(char))
+        line_starts = np.append(0, np.flatnonzero(buf == ord("\n")) + 1)
+        y = np.searchsorted(line_starts, found, side="right") - 1
+        xs.append(found - line_starts[y])
+        ys.append(y + num_lines)
+        num_lines += len(line_starts) - 1
+    if not xs:
+        return np.zeros(0, np.int64), np.zeros(0, np.int64)
+    return np.concatenate(xs), np.concatenate(ys)
+
+
+@contextmanager
+def open_input(filename: str) -> Iterator[Data]:
+    """
+    The contents of filename, memory mapped if it is large, or its chunks if
+    it is compressed or "-" for standard input.
+    """
+    if filename == "-" or is_compressed(filename):
+        yield read_chunks(filename)
+        return
+    with open(filename, "rb") as file:
+        size = os.fstat(file.fileno()).st_size
+        if size < MMAP_MIN_BYTES:
+            yield file.read()
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            yield data
+
+
+def read_ints(filename: str, signed: bool = False) -> Tokens:
+    with open_input(filename) as data:
+        return tokenize(data, signed)
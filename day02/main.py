@@ -1,56 +1,155 @@
 import math
-from os import path
+import re
+import sys
+from typing import Dict, Iterable, Tuple
+
+import numpy as np
+
+from aoc import profiling
+from aoc.inputs import read_lines
+from aoc.solvers import find_input
+from aoc.tokens import open_input, tokenize
 
 red, green, blue = "red", "green", "blue"
+COLORS = [red, green, blue]
+# Column of each color by the first letter of its name
+COLUMN_OF_INITIAL = np.full(256, -1, dtype=np.int64)
+COLUMN_OF_INITIAL[[ord(color[0]) for color in COLORS]] = range(len(COLORS))
+# A count and the first letter of its color
+CUBES = re.compile(r"(\d+) ([rgb])")
+# Cubes of each color in the bag for part 1
+BAG = {red: 12, green: 13, blue: 14}
+# Largest table of id sums, and the cells compared per block without one
+BLOCK_CELLS = 1 << 22
+
+
+def parse_input(filename: str) -> np.ndarray:
+    """
+    Most cubes of each color revealed in each game, as one row per game and
+    one column per color in COLORS, with -1 for colors a game never reveals.
+    """
+    columns = []
+
+    def find_colors(chunk: np.ndarray, offset: int):
+        # Every count is followed by a space and its color, unlike game ids
+        is_digit = (chunk[:-2] - np.uint8(ord("0"))) < 10
+        after_count = np.flatnonzero(is_digit & (chunk[1:-1] == ord(" "))) + 2
+        columns.append(COLUMN_OF_INITIAL[chunk[after_count]])
+
+    with open_input(filename) as data:
+        tokens = tokenize(data, visit=find_colors)
+    line_counts = tokens.counts()
+    # The first integer on every non-empty line is the game id
+    is_count = np.ones(len(tokens.values), dtype=bool)
+    is_count[tokens.line_offsets[:-1][line_counts > 0]] = False
+    column = np.concatenate(columns or [np.zeros(0, np.int64)])
+    if len(column) != is_count.sum() or (column < 0).any():
+        raise ValueError(f"Unknown cube colors in {filename}")
+    num_games = int((line_counts > 0).sum())
+    game = np.repeat(np.arange(num_games), line_counts[line_counts > 0] - 1)
+    games = np.full((num_games, len(COLORS)), -1, dtype=np.int64)
+    np.maximum.at(games, (game, column), tokens.values[is_count])
+    return games
+
+
+def bags_of(totals: Iterable[Dict[str, int]]) -> np.ndarray:
+    return np.array(
+        [[total[color] for color in COLORS] for total in totals], dtype=np.int64
+    ).reshape(-1, len(COLORS))
+
 
+def fitting_games(games: np.ndarray, bags: np.ndarray) -> np.ndarray:
+    """Whether each game (column) is possible with each bag (row)."""
+    return (games[None, :, :] <= bags[:, None, :]).all(axis=2)
 
-def parse_input(filename: str):
-    result = []
-    with open(path.abspath(filename)) as file:
-        for line in map(str.strip, file.readlines()):
-            result.append(
-                [
-                    {
-                        cubes.split(" ")[1]: int(cubes.split(" ")[0])
-                        for cubes in revealed.split(", ")
-                    }
-                    for revealed in line.split(": ")[1].split("; ")
-                ]
-            )
-    return result
-
-
-def possible_games(games, total):
-    return [
-        i + 1
-        if all(count <= total[color] for aset in sets for color, count in aset.items())
-        else 0
-        for i, sets in enumerate(games)
+
+def possible_id_sums(games: np.ndarray, bags: np.ndarray) -> np.ndarray:
+    """
+    Sum of the ids of the games possible with each bag. Ids are added up in
+    a table over the distinct counts of each color, which accumulated along
+    every axis holds the sum over all games with at most those counts, so
+    every bag is a single lookup.
+    """
+    ids = np.arange(1, len(games) + 1)
+    levels = [np.unique(games[:, color]) for color in range(len(COLORS))]
+    shape = tuple(map(len, levels))
+    if math.prod(shape) > BLOCK_CELLS:
+        # Too many distinct counts for a table, so compare in blocks of bags
+        block = max(1, BLOCK_CELLS // max(1, games.size))
+        sums = [
+            ids @ fitting_games(games, bags[start : start + block]).T
+            for start in range(0, len(bags), block)
+        ]
+        return np.concatenate(sums) if sums else np.zeros(0, np.int64)
+    table = np.zeros(shape, dtype=np.int64)
+    cells = [
+        np.searchsorted(levels[color], games[:, color]) for color in range(len(COLORS))
     ]
+    np.add.at(table, tuple(cells), ids)
+    for axis in range(table.ndim):
+        np.cumsum(table, axis=axis, out=table)
+    # Index of the largest count of each color that fits in each bag
+    at = np.stack(
+        [
+            np.searchsorted(levels[color], bags[:, color], side="right") - 1
+            for color in range(len(COLORS))
+        ]
+    )
+    sums = table[tuple(np.maximum(at, 0))] if table.size else np.zeros(len(bags))
+    return np.where((at >= 0).all(axis=0), sums, 0).astype(np.int64)
+
+
+def possible_games(games: np.ndarray, total: Dict[str, int]):
+    fits = fitting_games(games, bags_of([total]))[0]
+    return np.where(fits, np.arange(1, len(games) + 1), 0).tolist()
+
+
+def power_of(games: np.ndarray):
+    # Colors a game never reveals do not count towards its power
+    return np.prod(np.where(games < 0, 1, games), axis=1).tolist()
+
+
+def stream_sums(lines: Iterable[str], total: Dict[str, int]) -> Tuple[int, int]:
+    """
+    Sums of the possible game ids and of the powers of all games in a log
+    read one line at a time, keeping nothing but the current game's most
+    cubes of each color.
+    """
+    limits = {color[0]: count for color, count in total.items()}
+    possible_sum = power_sum = game_id = 0
+    for line in lines:
+        _, separator, reveals = line.partition(": ")
+        if not separator:
+            continue
+        game_id += 1
+        most = dict.fromkeys(limits, -1)
+        for count, initial in CUBES.findall(reveals):
+            most[initial] = max(most[initial], int(count))
+        if all(most[initial] <= limit for initial, limit in limits.items()):
+            possible_sum += game_id
+        power_sum += math.prod(count for count in most.values() if count >= 0)
+    return possible_sum, power_sum
+
+
+def part1(games: np.ndarray) -> int:
+    return sum(possible_games(games, BAG))
 
 
-def power_of(games):
-    result = []
-    for game in games:
-        color_to_maxcount = {}
-        for aset in game:
-            for color, count in aset.items():
-                color_to_maxcount[color] = int(
-                    max(count, color_to_maxcount.get(color, 0))
-                )
-        result.append(math.prod(color_to_maxcount.values()))
-    return result
+def part2(games: np.ndarray) -> int:
+    return sum(power_of(games))
 
 
 if __name__ == "__main__":
-    total = {
-        red: 12,
-        green: 13,
-        blue: 14,
-    }
-    example_input = parse_input("example.txt")
-    print("Example Part 1:", sum(possible_games(example_input, total)))
-    print("Example Part 2:", sum(power_of(example_input)))
-    puzzle_input = parse_input("input.txt")
-    print("Part 1:", sum(possible_games(puzzle_input, total)))
-    print("Part 2:", sum(power_of(puzzle_input)))
+    profiling.profile_main("day02")
+    if len(sys.argv) > 1 and sys.argv[1] == "-":
+        # Streaming mode for logs of any length on standard input
+        possible_sum, power_sum = stream_sums(read_lines("-"), BAG)
+        print("Part 1:", possible_sum)
+        print("Part 2:", power_sum)
+        sys.exit()
+    example_input = parse_input(find_input(2, "example"))
+    print("Example Part 1:", part1(example_input))
+    print("Example Part 2:", part2(example_input))
+    puzzle_input = parse_input(find_input(2))
+    print("Part 1:", part1(puzzle_input))
+    print("Part 2:", part2(puzzle_input))
@@ -1,46 +1,61 @@
+from collections import deque
+from itertools import accumulate
 import math
-from os import path
 import re
+import sys
+from typing import Dict, Iterable, Iterator, List, Tuple
 
+import numpy as np
 
-def parse_input(filename: str):
-    return list(map(str.strip, open(path.abspath(filename)).readlines()))
+from aoc import profiling
+from aoc.grid import Grid, Point2d, dilate
+from aoc.inputs import read_lines
+from aoc.solvers import find_input
+from aoc.tokens import tokenize
 
 
-def neighbor_symbols(schematic, r, span):
-    start, end = span
-    check_intervals = [
-        [r, max(start - 1, 0), start - 1],
-        [r, end, min(end, len(schematic[r]) - 1)],
-        [r - 1, max(start - 1, 0), min(end, len(schematic[r]) - 1)],
-        [r + 1, max(start - 1, 0), min(end, len(schematic[r]) - 1)],
-    ]
-    symbols = []
-    for r, start, end in check_intervals:
-        if end < start or r < 0 or len(schematic) <= r:
-            continue
-        for i in range(start, end + 1):
-            if re.match(r"(?![.0-9]).", schematic[r][i]):
-                symbols.append(((r, i), schematic[r][i]))
-    return symbols
-
-
-def find_part_numbers(schematic):
-    result = []
-    for r, row in enumerate(schematic):
-        for match in re.finditer(r"[0-9]+", row):
-            if neighbor_symbols(schematic, r, match.span()):
-                result.append(int(match.group()))
-    return result
-
-
-def find_gear_ratios(schematic):
-    gear_to_part = {}
-    for r, row in enumerate(schematic):
-        for match in re.finditer(r"[0-9]+", row):
-            for pos, sym in neighbor_symbols(schematic, r, match.span()):
-                if sym == "*":
-                    gear_to_part.setdefault(pos, []).append(int(match.group()))
+def parse_input(filename: str) -> Grid:
+    return Grid.from_lines(read_lines(filename))
+
+
+def scan_schematic(schematic: Grid) -> Tuple[List[int], Dict[Point2d, List[int]]]:
+    """
+    Part numbers in reading order and the numbers next to every gear, as
+    (row, column), in one pass over the schematic with a border of dots.
+    """
+    cells = np.pad(schematic.cells, 1, constant_values=ord("."))
+    width = cells.shape[1]
+    flat = cells.ravel()
+    is_digit = (flat - np.uint8(ord("0"))) < 10
+    is_symbol = ~is_digit & (flat != ord("."))
+    tokens = tokenize(flat.tobytes())
+    starts = tokens.positions
+    ends = np.flatnonzero(np.diff(is_digit.view(np.int8), append=np.int8(0)) < 0) + 1
+    # Index of the number every digit belongs to, -1 elsewhere
+    label = np.full(len(flat), -1, dtype=np.int64)
+    label[is_digit] = np.repeat(np.arange(len(starts)), ends - starts)
+    near_symbol = dilate(is_symbol.reshape(cells.shape), diagonal=True).ravel()
+    num_near = np.append(0, np.cumsum(near_symbol))
+    part_numbers = tokens.values[num_near[ends] > num_near[starts]].tolist()
+    gears = np.flatnonzero(flat == ord("*"))
+    around = [dy * width + dx for dy in (-1, 0, 1) for dx in (-1, 0, 1) if dy or dx]
+    numbers = np.sort(label[gears[:, None] + np.array(around)], axis=1)
+    # A number can touch a gear with several of its digits
+    numbers[:, 1:][numbers[:, 1:] == numbers[:, :-1]] = -1
+    gear_to_parts = {}
+    for gear, row in zip(gears.tolist(), numbers.tolist()):
+        parts = [tokens.values[i] for i in row if i >= 0]
+        if parts:
+            gear_to_parts[gear // width - 1, gear % width - 1] = list(map(int, parts))
+    return part_numbers, gear_to_parts
+
+
+def find_part_numbers(schematic: Grid):
+    return scan_schematic(schematic)[0]
+
+
+def find_gear_ratios(schematic: Grid):
+    _, gear_to_part = scan_schematic(schematic)
     return {
         gear: math.prod(parts)
         for gear, parts in gear_to_part.items()
@@ -48,10 +63,102 @@ def find_gear_ratios(schematic):
     }
 
 
+NUMBER = re.compile(r"[0-9]+")
+NOT_SYMBOLS = frozenset(".0123456789")
+# A row's text, its numbers as (start, end, value), the index of the number
+# at each column or -1, and the number of symbols before each column
+Row = Tuple[str, List[Tuple[int, int, int]], List[int], List[int]]
+
+
+def scan_row(line: str) -> Row:
+    numbers = [(m.start(), m.end(), int(m.group())) for m in NUMBER.finditer(line)]
+    label = [-1] * len(line)
+    for i, (start, end, _) in enumerate(numbers):
+        label[start:end] = [i] * (end - start)
+    num_symbols = list(accumulate((c not in NOT_SYMBOLS for c in line), initial=0))
+    return line, numbers, label, num_symbols
+
+
+def stream_schematic(
+    lines: Iterable[str],
+) -> Iterator[Tuple[int, List[int], Dict[Point2d, List[int]]]]:
+    """
+    The part numbers and the numbers next to every gear of each row, given
+    as soon as the row below it has been read. Only three rows are kept.
+    """
+    window: deque = deque(maxlen=3)
+    rows = filter(len, map(str.strip, lines))
+    first = next(rows, None)
+    if first is None:
+        return
+    blank = scan_row("." * len(first))
+    window.extend([blank, scan_row(first)])
+    r = 0
+    for line in rows:
+        window.append(scan_row(line))
+        yield r, *scan_middle(window, r)
+        r += 1
+    window.append(blank)
+    yield r, *scan_middle(window, r)
+
+
+def scan_middle(
+    window: Iterable[Row], r: int
+) -> Tuple[List[int], Dict[Point2d, List[int]]]:
+    above, middle, below = window
+    line, numbers, _, _ = middle
+    width = len(line)
+    part_numbers = [
+        value
+        for start, end, value in numbers
+        if any(
+            row[3][min(end + 1, width)] > row[3][max(start - 1, 0)]
+            for row in (above, middle, below)
+        )
+    ]
+    gear_to_parts = {}
+    c = line.find("*")
+    while c >= 0:
+        parts = []
+        for _, row_numbers, label, _ in (above, middle, below):
+            seen = -1
+            for i in label[max(c - 1, 0) : c + 2]:
+                if i > seen:
+                    parts.append(row_numbers[i][2])
+                    seen = i
+        if parts:
+            gear_to_parts[r, c] = parts
+        c = line.find("*", c + 1)
+    return part_numbers, gear_to_parts
+
+
+def stream_sums(lines: Iterable[str]) -> Tuple[int, int]:
+    part_sum = ratio_sum = 0
+    for _, part_numbers, gear_to_parts in stream_schematic(lines):
+        part_sum += sum(part_numbers)
+        ratio_sum += sum(math.prod(p) for p in gear_to_parts.values() if len(p) == 2)
+    return part_sum, ratio_sum
+
+
+def part1(schematic: Grid) -> int:
+    return sum(find_part_numbers(schematic))
+
+
+def part2(schematic: Grid) -> int:
+    return sum(find_gear_ratios(schematic).values())
+
+
 if __name__ == "__main__":
-    example_input = parse_input("example.txt")
-    print("Example Part 1:", sum(find_part_numbers(example_input)))
-    print("Example Part 2:", sum(find_gear_ratios(example_input).values()))
-    puzzle_input = parse_input("input.txt")
-    print("Part 1:", sum(find_part_numbers(puzzle_input)))
-    print("Part 2:", sum(find_gear_ratios(puzzle_input).values()))
+    profiling.profile_main("day03")
+    if len(sys.argv) > 1 and sys.argv[1] == "-":
+        # Streaming mode for schematics of any length on standard input
+        part_sum, ratio_sum = stream_sums(read_lines("-"))
+        print("Part 1:", part_sum)
+        print("Part 2:", ratio_sum)
+        sys.exit()
+    example_input = parse_input(find_input(3, "example"))
+    print("Example Part 1:", part1(example_input))
+    print("Example Part 2:", part2(example_input))
+    puzzle_input = parse_input(find_input(3))
+    print("Part 1:", part1(puzzle_input))
+    print("Part 2:", part2(puzzle_input))
@@ -1,21 +1,82 @@
-from os import path
+from functools import cached_property
+import re
+import sys
+from typing import Iterable, Iterator, List, Tuple
 
+import numpy as np
 
-def parse_input(filename: str):
-    return [
-        tuple(
-            set(map(int, filter(len, numbers.split())))
-            for numbers in line.split(": ")[1].split(" | ")
-        )
-        for line in map(str.strip, open(path.abspath(filename)).readlines())
-    ]
+from aoc import profiling
+from aoc.inputs import read_lines
+from aoc.solvers import find_input
+from aoc.tokens import open_input, tokenize
 
 
-def calc_points(cards):
-    return [
-        int(2 ** (len(win_numbers & my_numbers) - 1))
-        for win_numbers, my_numbers in cards
-    ]
+def popcount(words: np.ndarray) -> np.ndarray:
+    """Set bits in each row of 64-bit words."""
+    # np.bitwise_count needs NumPy 2
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words).sum(axis=1, dtype=np.int64)
+    bits = np.unpackbits(words.view(np.uint8).reshape(len(words), -1), axis=1)
+    return bits.sum(axis=1, dtype=np.int64)
+
+
+class Cards:
+    """
+    Winning numbers and my numbers of every card as bitmasks, one row of
+    64-bit words per card with bit v % 64 of word v // 64 set for number v.
+    """
+
+    winning: np.ndarray
+    mine: np.ndarray
+
+    def __init__(self, winning: np.ndarray, mine: np.ndarray):
+        self.winning = winning
+        self.mine = mine
+
+    @classmethod
+    def from_numbers(cls, winning: np.ndarray, mine: np.ndarray) -> "Cards":
+        """Cards from one row of numbers per card, as two 2D arrays."""
+        num_words = int(max(winning.max(initial=0), mine.max(initial=0))) // 64 + 1
+        masks = []
+        for numbers in (winning, mine):
+            mask = np.zeros((len(numbers), num_words), dtype=np.uint64)
+            card = np.repeat(np.arange(len(numbers)), numbers.shape[1])
+            bits = np.left_shift(np.uint64(1), (numbers.ravel() % 64).astype(np.uint64))
+            np.bitwise_or.at(mask, (card, numbers.ravel() // 64), bits)
+            masks.append(mask)
+        return cls(*masks)
+
+    def __len__(self) -> int:
+        return len(self.winning)
+
+    @cached_property
+    def matches(self) -> np.ndarray:
+        """Number of my numbers that are winning numbers, for every card."""
+        return popcount(self.winning & self.mine)
+
+    def __getstate__(self):
+        return {"winning": self.winning, "mine": self.mine}
+
+
+def parse_input(filename: str) -> Cards:
+    separators = []
+
+    def find_separator(chunk, offset: int):
+        if not separators and (match := re.search(rb"\|", chunk)):
+            separators.append(offset + match.start())
+
+    with open_input(filename) as data:
+        tokens = tokenize(data, visit=find_separator)
+    separator = separators[0] if separators else len(tokens.values)
+    # Each line is the card number, the winning numbers and then my numbers
+    num_before = int(np.searchsorted(tokens.positions, separator))
+    table = tokens.table()
+    return Cards.from_numbers(table[:, 1:num_before], table[:, num_before:])
+
+
+def calc_points(cards: Cards):
+    matches = cards.matches
+    return np.where(matches > 0, 1 << np.maximum(matches - 1, 0), 0).tolist()
 
 
 # 1*C1
@@ -31,24 +92,83 @@ def calc_points(cards):
 # Your fourteen instances of card 5 (one original and thirteen copies) have no matching numbers and win no more cards.
 # Your one instance of card 6 (one original) has no matching numbers and wins no more cards.
 # 1*C1, 2*C2, 4*C3, 8*C4, 14*C5, 1*C6
-def card_wins(cards):
+def card_wins(cards: Cards):
     card_copies = [1] * len(cards)
-    for i in range(len(cards)):
-        win_numbers, my_numbers = cards[i]
-        matching_numbers = win_numbers & my_numbers
-        for j in range(1, len(matching_numbers) + 1):
+    for i, matches in enumerate(cards.matches.tolist()):
+        for j in range(1, matches + 1):
             card_copies[i + j] += card_copies[i]
     return card_copies
 
 
+def card_matches(lines: Iterable[str]) -> Iterator[Tuple[int, int]]:
+    """How many numbers there are and how many match on each card line."""
+    for line in lines:
+        _, separator, numbers = line.partition(":")
+        if not separator:
+            continue
+        winning_part, mine_part = numbers.split("|")
+        winning, mine = number_mask(winning_part), number_mask(mine_part)
+        yield len(mine_part.split()), (winning & mine).bit_count()
+
+
+def number_mask(numbers: str) -> int:
+    mask = 0
+    for number in numbers.split():
+        mask |= 1 << int(number)
+    return mask
+
+
+def stream_totals(lines: Iterable[str]) -> Iterator[Tuple[int, int]]:
+    """
+    Running totals of points and of cards after each card, keeping the
+    copies won for the cards ahead in a ring buffer with a slot for each
+    number on the first card, which bounds how far ahead a card reaches.
+    The buffer grows if a later card reaches further.
+    """
+    pending: List[int] = []
+    points = num_cards = 0
+    for i, (num_numbers, matches) in enumerate(card_matches(lines)):
+        if matches >= len(pending):
+            size = max(num_numbers, matches) + 1
+            grown = [0] * size
+            for j in range(i, i + len(pending)):
+                grown[j % size] = pending[j % len(pending)]
+            pending = grown
+        copies = 1 + pending[i % len(pending)]
+        pending[i % len(pending)] = 0
+        for j in range(i + 1, i + matches + 1):
+            pending[j % len(pending)] += copies
+        points += 1 << matches >> 1
+        num_cards += copies
+        yield points, num_cards
+
+
+def part1(cards: Cards) -> int:
+    return sum(calc_points(cards))
+
+
+def part2(cards: Cards) -> int:
+    return sum(card_wins(cards))
+
+
 def main():
-    example_input = parse_input("example.txt")
-    print("Example part 1:", sum(calc_points(example_input)))
-    print("Example part 2:", sum(card_wins(example_input)))
-    puzzle_input = parse_input("input.txt")
-    print("Part 1:", sum(calc_points(puzzle_input)))
-    print("Part 2:", sum(card_wins(puzzle_input)))
+    if len(sys.argv) > 1 and sys.argv[1] == "-":
+        # Streaming mode for any number of cards on standard input
+        points = num_cards = 0
+        for points, num_cards in stream_totals(read_lines("-")):
+            pass
+        print("Part 1:", points)
+        print("Part 2:", num_cards)
+        return
+
+    example_input = parse_input(find_input(4, "example"))
+    print("Example part 1:", part1(example_input))
+    print("Example part 2:", part2(example_input))
+    puzzle_input = parse_input(find_input(4))
+    print("Part 1:", part1(puzzle_input))
+    print("Part 2:", part2(puzzle_input))
 
 
 if __name__ == "__main__":
+    profiling.profile_main("day04")
     main()
@@ -1,42 +1,42 @@
+from functools import cached_property
+import re
 import sys
+from typing import Dict, List, Tuple
 
-from collections import deque
-from functools import partial
-from operator import itemgetter
-from typing import Dict, Iterable, Optional, List, Tuple
+import numpy as np
 
+from aoc import profiling
+from aoc.intervals import IntervalMap, IntervalSet, Preimages
+from aoc.inputs import read_chunks
+from aoc.tokens import Data, tokenize
 
-def parse_input(
-    lines: Iterable[str],
-) -> Tuple[List[int], Dict[str, str], Dict[str, List[Tuple[int, int, int]]]]:
-    iterable = map(str.strip, lines)
-    seeds = list(map(int, next(iterable).split(": ")[1].split(" ")))
-    maps, name_maps = [], []
-    for line in filter(len, iterable):
-        if line.endswith("map:"):
-            name_maps.append(tuple(line.split(" ")[0].split("-to-")))
-            maps.append([])
-        else:
-            maps[-1].append(tuple(map(int, line.split(" "))))
-    return (
-        seeds,
-        {src: dest for src, dest in name_maps},
-        {src_name: data for data, (src_name, _) in zip(maps, name_maps)},
-    )
+BLOCK_SEEDS = 1 << 20
 
 
-def intersect_intervals(
-    a: Tuple[int, int], b: Tuple[int, int]
-) -> Optional[Tuple[int, int]]:
-    return None if a[1] < b[0] or b[1] < a[0] else tuple(sorted(a + b)[1:3])
+def parse_input(
+    data: Data,
+) -> Tuple[np.ndarray, Dict[str, str], Dict[str, List[Tuple[int, int, int]]]]:
+    # (end, src, dest) of every "src-to-dest map:" header
+    headers: List[Tuple[int, str, str]] = []
 
+    def find_headers(chunk, offset: int):
+        headers.extend(
+            (offset + match.end(), match[1].decode(), match[2].decode())
+            for match in re.finditer(rb"(\w+)-to-(\w+) map:", chunk)
+        )
 
-def subtract_intervals(a: Tuple[int, int], b: Tuple[int, int]) -> List[Tuple[int, int]]:
-    return [
-        interval
-        for interval in [(a[0], b[0] - 1), (b[1] + 1, a[1])]
-        if interval[0] <= interval[1]
-    ]
+    tokens = tokenize(data, visit=find_headers)
+    # Integers between consecutive headers are the (dest, src, length) ranges
+    bounds = np.searchsorted(tokens.positions, [end for end, _, _ in headers]).tolist()
+    bounds.append(len(tokens.values))
+    return (
+        tokens.values[: bounds[0]],
+        {src: dest for _, src, dest in headers},
+        {
+            src: list(map(tuple, tokens.values[start:end].reshape(-1, 3).tolist()))
+            for (_, src, _), start, end in zip(headers, bounds, bounds[1:])
+        },
+    )
 
 
 def range_to_interval(input_range: Tuple[int, int]) -> Tuple[int, int]:
@@ -44,39 +44,78 @@ def range_to_interval(input_range: Tuple[int, int]) -> Tuple[int, int]:
     return (start, start + length - 1)
 
 
+def to_map(ranges: List[Tuple[int, int, int]]) -> IntervalMap:
+    return IntervalMap.from_rules(
+        (*range_to_interval((src, length)), dest - src) for dest, src, length in ranges
+    )
+
+
+def seed_to_location(
+    src_to_dest_name: Dict[str, str],
+    src_to_ranges: Dict[str, List[Tuple[int, int, int]]],
+) -> IntervalMap:
+    """Every map from seed to location folded into one."""
+    src_name, composed = "seed", IntervalMap([])
+    while src_name != "location":
+        composed = composed.then(to_map(src_to_ranges[src_name]))
+        src_name = src_to_dest_name[src_name]
+    return composed
+
+
+class Almanac:
+    """
+    An almanac's maps composed from seed to location, answering range queries
+    in either direction in O(log n) plus the pieces each interval overlaps.
+    """
+
+    forward: IntervalMap
+
+    def __init__(
+        self,
+        src_to_dest_name: Dict[str, str],
+        src_to_ranges: Dict[str, List[Tuple[int, int, int]]],
+    ):
+        self.forward = seed_to_location(src_to_dest_name, src_to_ranges)
+
+    @cached_property
+    def inverse(self) -> Preimages:
+        """Index from location to seed, only built for the first inverse query."""
+        return Preimages(self.forward)
+
+    def locations(self, seeds: IntervalSet) -> IntervalSet:
+        return self.forward.apply(seeds)
+
+    def seeds(self, locations: IntervalSet) -> IntervalSet:
+        """Seeds that land in locations."""
+        return self.inverse.apply(locations)
+
+    def min_location(self, start: int, end: int) -> int:
+        """Smallest location of the seeds from start to end."""
+        return self.locations(IntervalSet.interval(start, end)).min()
+
+
 def to_location(
     src_to_dest_name: Dict[str, str],
     src_to_ranges: Dict[str, List[Tuple[int, int, int]]],
-    seed_range: Tuple[int, int],
-) -> Tuple[int, int]:
-    jobs: List[Tuple[str, Tuple[int, int]]] = [("seed", range_to_interval(seed_range))]
-    minmax = tuple()
-    while jobs:
-        src_name, job_interval = jobs.pop()
-        if src_name == "location":
-            minmax = (min(job_interval + minmax), max(job_interval + minmax))
-            continue
-        dest_name = src_to_dest_name[src_name]
-        unmapped_intervals = deque([job_interval])
-        for dest, src, length in src_to_ranges[src_name]:
-            target_interval = range_to_interval((src, length))
-            for _ in range(len(unmapped_intervals)):
-                unmapped_interval = unmapped_intervals.popleft()
-                intersection = intersect_intervals(unmapped_interval, target_interval)
-                if intersection:
-                    jobs.append(
-                        (
-                            dest_name,
-                            tuple(map(lambda x: dest - src + x, intersection)),
-                        )
-                    )
-                    for diff in subtract_intervals(unmapped_interval, intersection):
-                        unmapped_intervals.append(diff)
-                else:
-                    unmapped_intervals.append(unmapped_interval)
-        for unmapped_interval in unmapped_intervals:
-            jobs.append((dest_name, unmapped_interval))
-    return minmax
+    seeds: IntervalSet,
+) -> IntervalSet:
+    return Almanac(src_to_dest_name, src_to_ranges).locations(seeds)
+
+
+def locations_of(
+    src_to_dest_name: Dict[str, str],
+    src_to_ranges: Dict[str, List[Tuple[int, int, int]]],
+    seeds: np.ndarray,
+) -> np.ndarray:
+    """Location of every seed, looked up in bulk in the composed map."""
+    composed = seed_to_location(src_to_dest_name, src_to_ranges)
+    seeds = np.asarray(seeds, dtype=np.int64)
+    locations = np.empty_like(seeds)
+    # Blocks keep the temporaries of the lookup small for huge seed lists
+    for start in range(0, len(seeds), BLOCK_SEEDS):
+        block = seeds[start : start + BLOCK_SEEDS]
+        locations[start : start + BLOCK_SEEDS] = block + composed.offsets_at(block)
+    return locations
 
 
 def min_location(
@@ -84,29 +123,25 @@ def min_location(
     src_to_ranges: Dict[str, List[Tuple[int, int, int]]],
     seed_ranges: List[Tuple[int, int]],
 ):
-    return min(
-        map(
-            itemgetter(0),
-            map(
-                partial(to_location, src_to_dest_name, src_to_ranges),
-                seed_ranges,
-            ),
-        )
+    seeds = IntervalSet.from_intervals(map(range_to_interval, seed_ranges))
+    return to_location(src_to_dest_name, src_to_ranges, seeds).min()
+
+
+def part1(almanac) -> int:
+    seeds, src_to_dest_name, src_to_ranges = almanac
+    return int(locations_of(src_to_dest_name, src_to_ranges, seeds).min())
+
+
+def part2(almanac) -> int:
+    seeds, src_to_dest_name, src_to_ranges = almanac
+    return min_location(
+        src_to_dest_name, src_to_ranges, list(zip(seeds[::2], seeds[1::2]))
     )
 
 
 if __name__ == "__main__":
+    profiling.profile_main("day05")
     if len(sys.argv) > 1 and sys.argv[1] == "2":
-        seeds, src_to_dest_name, src_to_ranges = parse_input(sys.stdin)
-        print(
-            "Part 2:",
-            min_location(
-                src_to_dest_name, src_to_ranges, list(zip(seeds[::2], seeds[1::2]))
-            ),
-        )
+        print("Part 2:", part2(parse_input(read_chunks("-"))))
     else:
-        seeds, src_to_dest_name, src_to_ranges = parse_input(sys.stdin)
-        print(
-            "Part 1:",
-            min_location(src_to_dest_name, src_to_ranges, [(s, 1) for s in seeds]),
-        )
+        print("Part 1:", part1(parse_input(read_chunks("-"))))
@@ -1,14 +1,19 @@
 import math
-import operator
-from os import path
+from typing import Tuple
+
+import numpy as np
+
+from aoc import profiling
+from aoc.solvers import find_input
+from aoc.tokens import read_ints
+
+# Bound on t^2 + 4 |d_rec| below which the vectorised solver stays in int64
+MAX_DISCRIMINANT = 1 << 62
 
 
 def parse_input(filename: str):
-    times, distances = [
-        map(int, line.split()[1:])
-        for line in map(str.strip, open(path.abspath(filename)).readlines())
-    ]
-    return list(zip(times, distances))
+    times, distances = read_ints(filename).lines()[:2]
+    return list(zip(times.tolist(), distances.tolist()))
 
 
 # a, v is acceleration and velocity
@@ -23,19 +28,46 @@ def parse_input(filename: str):
 # a = 1, b = -t, c = (d_rec + 1), t_btn = (-b (+-)(b^2 - 4ac)^0.5) / 2a
 
 
+# With D = t^2 - 4 d_rec and s = isqrt(D), the smaller root (t - D^0.5) / 2
+# lies just below (t - s) / 2, so the shortest winning press is
+# (t - s + 1) // 2, or one more when D is a perfect square and that root
+# exactly ties the record.
+
+
+def press_range(t: int, d_rec: int) -> Tuple[int, int]:
+    """Shortest and longest winning presses, exact for any size of integers."""
+    discriminant = t * t - 4 * d_rec
+    if discriminant <= 0:
+        return 1, 0
+    s = math.isqrt(discriminant)
+    min_t_btn = max((t - s + 1 + (s * s == discriminant)) // 2, 0)
+    return min_t_btn, t - min_t_btn
+
+
 def calc_btn_press_ms(races):
-    results = []
-    for t, d_rec in races:
-        b = -t
-        c = d_rec + 1
-        min_t_btn, max_t_btn = sorted(
-            [
-                op(-b, (b**2 - 4 * c) ** 0.5) / 2
-                for op in (operator.__add__, operator.__sub__)
-            ]
+    return [press_range(t, d_rec) for t, d_rec in races]
+
+
+def error_margins(times: np.ndarray, distances: np.ndarray) -> np.ndarray:
+    """Number of winning presses of every race, for many races at once."""
+    times = np.asarray(times, dtype=np.int64)
+    distances = np.asarray(distances, dtype=np.int64)
+    if len(times) and (
+        int(times.max()) ** 2 + 4 * int(np.abs(distances).max()) >= MAX_DISCRIMINANT
+    ):
+        # Squares would overflow int64, so fall back to Python integers
+        races = zip(times.tolist(), distances.tolist())
+        return np.array(
+            [error_margin(press_range(t, d_rec)) for t, d_rec in races], dtype=object
         )
-        results.append((math.ceil(min_t_btn), math.floor(max_t_btn)))
-    return results
+    discriminant = times * times - 4 * distances
+    # The float root can be one off either way, so correct it exactly
+    s = np.sqrt(np.maximum(discriminant, 0).astype(np.float64)).astype(np.int64)
+    s -= s * s > discriminant
+    s += (s + 1) * (s + 1) <= discriminant
+    min_t_btn = np.maximum((times - s + 1 + (s * s == discriminant)) // 2, 0)
+    margins = times - 2 * min_t_btn + 1
+    return np.where(discriminant > 0, margins, 0)
 
 
 def error_margin(t_btn):
@@ -46,14 +78,23 @@ def fix_kerning(races):
     return [tuple(map(int, ("".join(str(td[i]) for td in races) for i in range(2))))]
 
 
+def part1(races):
+    return math.prod(map(error_margin, calc_btn_press_ms(races)))
+
+
+def part2(races):
+    return error_margin(calc_btn_press_ms(fix_kerning(races))[0])
+
+
 def main():
-    example_input = parse_input("example.txt")
-    print("Example part 1:", math.prod(map(error_margin, calc_btn_press_ms(example_input))))
-    print("Example part 2:", error_margin(calc_btn_press_ms(fix_kerning(example_input))[0]))
-    puzzle_input = parse_input("input.txt")
-    print("Part 1:", math.prod(map(error_margin, calc_btn_press_ms(puzzle_input))))
-    print("Part 2:", error_margin(calc_btn_press_ms(fix_kerning(puzzle_input))[0]))
+    example_input = parse_input(find_input(6, "example"))
+    print("Example part 1:", part1(example_input))
+    print("Example part 2:", part2(example_input))
+    puzzle_input = parse_input(find_input(6))
+    print("Part 1:", part1(puzzle_input))
+    print("Part 2:", part2(puzzle_input))
 
 
 if __name__ == "__main__":
+    profiling.profile_main("day06")
     main()
@@ -1,6 +1,9 @@
 from collections import Counter
 from operator import itemgetter
-from os import path
+
+from aoc import profiling
+from aoc.inputs import read_lines
+from aoc.solvers import find_input
 
 
 CARDS = list(map(str, range(2, 10))) + ["T", "J", "Q", "K", "A"]
@@ -66,7 +69,7 @@ def jhand_strength(hand):
 
 def parse_input(filename):
     results = []
-    for line in map(str.strip, open(path.abspath(filename)).readlines()):
+    for line in map(str.strip, read_lines(filename)):
         hand, bid = line.split()
         results.append((hand, int(bid)))
     return results
@@ -86,14 +89,23 @@ def calc_jwinnings(hands):
     )
 
 
+def part1(hands):
+    return calc_winnings(hands)
+
+
+def part2(hands):
+    return calc_jwinnings(hands)
+
+
 def main():
-    example_input = parse_input("example.txt")
-    print("Example part 1:", calc_winnings(example_input))
-    print("Example part 2:", calc_jwinnings(example_input))
-    puzzle_input = parse_input("input.txt")
-    print("Part 1:", calc_winnings(puzzle_input))
-    print("Part 2:", calc_jwinnings(puzzle_input))
+    example_input = parse_input(find_input(7, "example"))
+    print("Example part 1:", part1(example_input))
+    print("Example part 2:", part2(example_input))
+    puzzle_input = parse_input(find_input(7))
+    print("Part 1:", part1(puzzle_input))
+    print("Part 2:", part2(puzzle_input))
 
 
 if __name__ == "__main__":
+    profiling.profile_main("day07")
     main()
@@ -1,33 +1,48 @@
 import math
 from operator import itemgetter
-from os import path
+from typing import Iterable, List, Tuple
 
+from aoc import profiling
+from aoc.cycles import Cycle, find_cycle
+from aoc.graph import Graph
+from aoc.inputs import read_lines
+from aoc.solvers import find_input
 
-def parse_input(filename: str):
-    directions, *rest = filter(
-        len, map(str.strip, open(path.abspath(filename)).readlines())
-    )
-    nodes = {}
+
+def parse_input(filename: str) -> Tuple[str, Graph]:
+    directions, *rest = filter(len, map(str.strip, read_lines(filename)))
+    adjacency = []
     for line in rest:
         name, lr = line.split(" = ")
-        nodes[name] = lr.replace("(", "").replace(")", "").split(", ")
-    return directions, nodes
+        adjacency.append((name, lr.replace("(", "").replace(")", "").split(", ")))
+    # Every node has its left then its right neighbour as out-edges
+    return directions, Graph.from_adjacency(adjacency)
 
 
 def direction_idx(direction: str):
     return 0 if direction == "L" else 1
 
 
-def navigate(nodes, src: str, dest, directions: str, start_dir: int = 0):
+def left_right(nodes: Graph) -> List[List[int]]:
+    return [nodes.targets[nodes.offsets[:-1] + d].tolist() for d in (0, 1)]
+
+
+def navigate(
+    nodes: Graph, src: str, dest: Iterable[str], directions: str, start_dir: int = 0
+):
+    lr = left_right(nodes)
+    is_dest = [False] * nodes.num_nodes
+    for name in dest:
+        is_dest[nodes.ids[name]] = True
+    steps = [direction_idx(direction) for direction in directions]
     i = start_dir
-    last_visited = src
-    while last_visited not in dest:
-        if all(lr == last_visited for lr in nodes[last_visited]):
-            raise Exception(f"Trapped in a loop in node {last_visited}")
-        next_direction = direction_idx(directions[i % len(directions)])
-        last_visited = nodes[last_visited][next_direction]
+    last_visited = nodes.ids[src]
+    while not is_dest[last_visited]:
+        if lr[0][last_visited] == lr[1][last_visited] == last_visited:
+            raise Exception(f"Trapped in a loop in node {nodes.names[last_visited]}")
+        last_visited = lr[steps[i % len(steps)]][last_visited]
         i += 1
-    return i, last_visited
+    return i, nodes.names[last_visited]
 
 
 def lcm(*values: int):
@@ -41,44 +56,73 @@ def names_ending_with(names, suffix: str):
     return filter(lambda n: n.endswith(suffix), names)
 
 
+def ghost_cycle(nodes: Graph, src: str, directions: str) -> Tuple[Cycle, List[int]]:
+    """
+    The cycle of a walk from src, whose state at every step is the node id
+    times the number of directions plus the position in the directions.
+    """
+    lr = left_right(nodes)
+    steps = [direction_idx(direction) for direction in directions]
+
+    def step(state: int) -> int:
+        node, i = divmod(state, len(steps))
+        return lr[steps[i]][node] * len(steps) + (i + 1) % len(steps)
+
+    return find_cycle(step, nodes.ids[src] * len(steps))
+
+
+def check_arrivals(
+    nodes: Graph, src: str, dest: Iterable[str], directions: str, arrival: int
+):
+    cycle, states = ghost_cycle(nodes, src, directions)
+    dest_ids = {nodes.ids[name] for name in dest}
+    hits = [
+        n
+        for n in range(1, cycle.mu + cycle.period + 1)
+        if states[cycle.index(n)] // len(directions) in dest_ids
+    ]
+    if not cycle.repeats_every(hits, arrival):
+        raise Exception(f"Walk from {src} does not arrive every {arrival} steps")
+
+
 def navigate_all(nodes, src, dest, directions: str) -> int:
     node_to_phase = {node: navigate(nodes, node, dest, directions) for node in src}
+    # With several walks the least common multiple is only the answer if each
+    # reaches a destination at the multiples of its first arrival and never
+    # in between
+    if len(node_to_phase) > 1:
+        for node, (arrival, _) in node_to_phase.items():
+            check_arrivals(nodes, node, dest, directions, arrival)
     return lcm(*map(itemgetter(0), node_to_phase.values()))
 
 
-def main():
-    example1_input = parse_input("example1.txt")
-    print(
-        "Example 1 part 1:",
-        navigate(example1_input[1], "AAA", {"ZZZ"}, example1_input[0])[0],
-    )
-    example2_input = parse_input("example2.txt")
-    print(
-        "Example 2 part 1:",
-        navigate(example2_input[1], "AAA", {"ZZZ"}, example2_input[0])[0],
-    )
-    puzzle_input = parse_input("input.txt")
-    print("Part 1:", navigate(puzzle_input[1], "AAA", {"ZZZ"}, puzzle_input[0])[0])
-    example3_input = parse_input("example3.txt")
-    print(
-        "Example 3 part 2:",
-        navigate_all(
-            example3_input[1],
-            set(names_ending_with(example3_input[1].keys(), "A")),
-            set(names_ending_with(example3_input[1].keys(), "Z")),
-            example3_input[0],
-        ),
-    )
-    print(
-        "Part 2:",
-        navigate_all(
-            puzzle_input[1],
-            set(names_ending_with(puzzle_input[1].keys(), "A")),
-            set(names_ending_with(puzzle_input[1].keys(), "Z")),
-            puzzle_input[0],
-        ),
+def part1(puzzle):
+    directions, nodes = puzzle
+    return navigate(nodes, "AAA", {"ZZZ"}, directions)[0]
+
+
+def part2(puzzle):
+    directions, nodes = puzzle
+    return navigate_all(
+        nodes,
+        set(names_ending_with(nodes.names, "A")),
+        set(names_ending_with(nodes.names, "Z")),
+        directions,
     )
 
 
+def main():
+    example1_input = parse_input(find_input(8, "example1"))
+    print("Example 1 part 1:", part1(example1_input))
+    example2_input = parse_input(find_input(8, "example2"))
+    print("Example 2 part 1:", part1(example2_input))
+    puzzle_input = parse_input(find_input(8))
+    print("Part 1:", part1(puzzle_input))
+    example3_input = parse_input(find_input(8, "example3"))
+    print("Example 3 part 2:", part2(example3_input))
+    print("Part 2:", part2(puzzle_input))
+
+
 if __name__ == "__main__":
+    profiling.profile_main("day08")
     main()
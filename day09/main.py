@@ -1,13 +1,17 @@
 from collections import deque
 from operator import itemgetter
-from os import path
 from typing import Deque, List
 
+from aoc import profiling
+from aoc.solvers import find_input
+from aoc.tokens import read_ints
+
 
 def parse_input(filename: str):
     return [
-        deque(map(int, line.split()))
-        for line in filter(str.strip, open(path.abspath(filename)).readlines())
+        deque(line.tolist())
+        for line in read_ints(filename, signed=True).lines()
+        if len(line)
     ]
 
 
@@ -31,16 +35,24 @@ def extrapolate_sum(histories: List[Deque[int]]):
     return sum(map(itemgetter(0), extrapolated)), sum(map(itemgetter(1), extrapolated))
 
 
+def part1(histories: List[Deque[int]]) -> int:
+    # extrapolate() appends to the histories in place
+    return extrapolate_sum([deque(history) for history in histories])[1]
+
+
+def part2(histories: List[Deque[int]]) -> int:
+    return extrapolate_sum([deque(history) for history in histories])[0]
+
+
 def main():
-    example_input = parse_input("example.txt")
-    example_output = extrapolate_sum(example_input)
-    print("Example part 1:", example_output[1])
-    print("Example part 2:", example_output[0])
-    puzzle_input = parse_input("input.txt")
-    puzzle_output = extrapolate_sum(puzzle_input)
-    print("Part 1:", puzzle_output[1])
-    print("Part 2:", puzzle_output[0])
+    example_input = parse_input(find_input(9, "example"))
+    print("Example part 1:", part1(example_input))
+    print("Example part 2:", part2(example_input))
+    puzzle_input = parse_input(find_input(9))
+    print("Part 1:", part1(puzzle_input))
+    print("Part 2:", part2(puzzle_input))
 
 
 if __name__ == "__main__":
+    profiling.profile_main("day09")
     main()
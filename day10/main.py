@@ -1,7 +1,13 @@
 from functools import partial
 import operator
-from os import path
-from typing import Callable, TypeVar
+from typing import Callable, List, Tuple, TypeVar
+
+import numpy as np
+
+from aoc import profiling
+from aoc.grid import Grid
+from aoc.inputs import read_lines
+from aoc.solvers import find_input
 
 # | is a vertical pipe connecting north and south.
 # - is a horizontal pipe connecting east and west.
@@ -9,22 +15,13 @@ from typing import Callable, TypeVar
 # J is a 90-degree bend connecting north and west.
 # 7 is a 90-degree bend connecting south and west.
 # F is a 90-degree bend connecting south and east.
-ascii_to_utf = {
-    "|": "│",
-    "-": "─",
-    "L": "└",
-    "J": "┘",
-    "7": "┐",
-    "F": "┌",
-}
-
 pipe_to_neighbors = {
-    "│": {(0, -1), (0, 1)},
-    "─": {(-1, 0), (1, 0)},
-    "└": {(1, 0), (0, -1)},
-    "┘": {(-1, 0), (0, -1)},
-    "┐": {(-1, 0), (0, 1)},
-    "┌": {(1, 0), (0, 1)},
+    "|": {(0, -1), (0, 1)},
+    "-": {(-1, 0), (1, 0)},
+    "L": {(1, 0), (0, -1)},
+    "J": {(-1, 0), (0, -1)},
+    "7": {(-1, 0), (0, 1)},
+    "F": {(1, 0), (0, 1)},
 }
 
 T = TypeVar("T", list, tuple)
@@ -48,27 +45,16 @@ dot = {
 }
 
 
-def parse_input(filename: str):
-    return [
-        "".join(ascii_to_utf.get(c, c) for c in line)
-        for line in map(str.strip, open(path.abspath(filename)).readlines())
-    ]
+def parse_input(filename: str) -> Grid:
+    return Grid.from_lines(read_lines(filename))
 
 
-def get_pos(field, pt):
-    x, y = pt
-    if 0 <= x < len(field[0]) and 0 <= y < len(field):
-        return field[y][x]
-    return None
+def get_pos(field: Grid, pt):
+    return field.get(pt)
 
 
-def start_of(field):
-    pos = next(
-        (x, y)
-        for y in range(len(field))
-        for x in range(len(field[0]))
-        if field[y][x] == "S"
-    )
+def start_of(field: Grid):
+    pos = field.find_one("S")
     for c in pipe_to_neighbors.keys():
         if all(
             map(
@@ -91,65 +77,54 @@ def trace_pipe(field):
     from_pos, to_pos = start_pos, next(
         dot["+"](neighbor, start_pos) for neighbor in pipe_to_neighbors[start_pipe]
     )
+    tiles = field.lines()
     visited = [start_pos]
     while to_pos != start_pos:
         visited.append(to_pos)
         from_pos, to_pos = to_pos, next(
             dot["+"](to_pos, neighbor)
-            for neighbor in pipe_to_neighbors[get_pos(field, to_pos)]
+            for neighbor in pipe_to_neighbors[tiles[to_pos[1]][to_pos[0]]]
             if dot["+"](to_pos, neighbor) != from_pos
         )
     return visited
 
 
-def is_enclosed(field, pipe_vecs, ground):
-    cur_pos, winding, cast_vec = ground, 0, (1, 0)
-    while get_pos(field, cur_pos):
-        cur_pos = dot["+"](cur_pos, cast_vec)
-        if cur_pos in pipe_vecs:
-            winding += pipe_vecs[cur_pos][1]
-    return winding != 0
+def find_enclosed(field: Grid, pipeline: List[Tuple[int, int]]):
+    # Cast a ray east from every tile and sum the vertical direction of the
+    # pipes it crosses; tiles with a non-zero winding number are enclosed.
+    xs, ys = np.array(pipeline).T
+    on_pipeline = np.zeros((field.height, field.width), dtype=bool)
+    on_pipeline[ys, xs] = True
+    pipe_dy = np.zeros((field.height, field.width), dtype=np.int64)
+    pipe_dy[ys, xs] = np.roll(ys, 1) - np.roll(ys, -1)
+    winding = np.cumsum(pipe_dy[:, ::-1], axis=1)[:, ::-1] - pipe_dy
+    return int(np.count_nonzero(~on_pipeline & (winding != 0)))
 
 
-def find_enclosed(field, pipeline):
-    closed_pipeline = [pipeline[-1]] + pipeline + [pipeline[0]]
-    pipe_vecs = {
-        pos: dot["-"](before_pos, after_pos)
-        for before_pos, pos, after_pos in zip(
-            closed_pipeline[0:-2], closed_pipeline[1:-1], closed_pipeline[2:]
-        )
-    }
-    return len(
-        [
-            (x, y)
-            for y in range(len(field))
-            for x in range(len(field[0]))
-            if (x, y) not in pipe_vecs and is_enclosed(field, pipe_vecs, (x, y))
-        ]
-    )
+def part1(pipes: Grid) -> int:
+    return (len(trace_pipe(pipes)) + 1) // 2
+
+
+def part2(pipes: Grid) -> int:
+    return find_enclosed(pipes, trace_pipe(pipes))
 
 
 def main():
-    example1_input = parse_input("example1.txt")
-    print("Example 1 part 1:", (len(trace_pipe(example1_input)) + 1) // 2)
-    example2_input = parse_input("example2.txt")
-    print("Example 2 part 1:", (len(trace_pipe(example2_input)) + 1) // 2)
-    puzzle_input = parse_input("input.txt")
-    print("Part 1:", (len(trace_pipe(puzzle_input)) + 1) // 2)
-    example3_input = parse_input("example3.txt")
-    print(
-        "Example 3 part 2:", find_enclosed(example3_input, trace_pipe(example3_input))
-    )
-    example4_input = parse_input("example4.txt")
-    print(
-        "Example 4 part 2:", find_enclosed(example4_input, trace_pipe(example4_input))
-    )
-    example5_input = parse_input("example5.txt")
-    print(
-        "Example 5 part 2:", find_enclosed(example5_input, trace_pipe(example5_input))
-    )
-    print("Part 2:", find_enclosed(puzzle_input, trace_pipe(puzzle_input)))
+    example1_input = parse_input(find_input(10, "example1"))
+    print("Example 1 part 1:", part1(example1_input))
+    example2_input = parse_input(find_input(10, "example2"))
+    print("Example 2 part 1:", part1(example2_input))
+    puzzle_input = parse_input(find_input(10))
+    print("Part 1:", part1(puzzle_input))
+    example3_input = parse_input(find_input(10, "example3"))
+    print("Example 3 part 2:", part2(example3_input))
+    example4_input = parse_input(find_input(10, "example4"))
+    print("Example 4 part 2:", part2(example4_input))
+    example5_input = parse_input(find_input(10, "example5"))
+    print("Example 5 part 2:", part2(example5_input))
+    print("Part 2:", part2(puzzle_input))
 
 
 if __name__ == "__main__":
+    profiling.profile_main("day10")
     main()
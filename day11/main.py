@@ -1,5 +1,9 @@
 import sys
-from typing import Iterable, Set, Tuple
+from typing import Set, Tuple
+
+from aoc import profiling
+from aoc.inputs import read_chunks
+from aoc.tokens import Data, char_positions
 
 GALAXY = "#"
 
@@ -25,24 +29,31 @@ def list_pairs(list_len):
     return set((i, j) for i in range(list_len) for j in range(list_len) if i < j)
 
 
-def parse_input(input: Iterable[str]) -> Set[Tuple[int, int]]:
-    lines = list(filter(bool, [it.strip() for it in input]))
-    galaxies = set()
-    for y in range(len(lines)):
-        for x in range(len(lines[y])):
-            if lines[y][x] == GALAXY:
-                galaxies.add((x, y))
-    return galaxies
+def parse_input(data: Data) -> Set[Tuple[int, int]]:
+    return set(zip(*(a.tolist() for a in char_positions(data, GALAXY))))
 
 
-def main():
-    expansion_factor = int(1e6) if len(sys.argv) > 1 and sys.argv[1] == "2" else 2
-    expanded_galaxies = expand_galaxies(
-        parse_input(sys.stdin), expansion_factor=expansion_factor
-    )
+def sum_distances(galaxies: Set[Tuple[int, int]], expansion_factor: int) -> int:
+    expanded_galaxies = expand_galaxies(galaxies, expansion_factor=expansion_factor)
     pairs = list_pairs(len(expanded_galaxies))
-    print(sum([distance(expanded_galaxies[i], expanded_galaxies[j]) for i, j in pairs]))
+    return sum(distance(expanded_galaxies[i], expanded_galaxies[j]) for i, j in pairs)
+
+
+def part1(galaxies: Set[Tuple[int, int]]) -> int:
+    return sum_distances(galaxies, 2)
+
+
+def part2(galaxies: Set[Tuple[int, int]]) -> int:
+    return sum_distances(galaxies, int(1e6))
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "2":
+        print(part2(parse_input(read_chunks("-"))))
+    else:
+        print(part1(parse_input(read_chunks("-"))))
 
 
 if __name__ == "__main__":
+    profiling.profile_main("day11")
     main()
@@ -1,7 +1,10 @@
-from os import path
 import re
 from typing import Dict, Tuple, List
 
+from aoc import profiling
+from aoc.inputs import read_lines
+from aoc.solvers import find_input
+
 DAMAGED = "#"
 UNKNOWN = "?"
 OPERATIONAL = "."
@@ -54,33 +57,39 @@ def sum_arrangements(records: List[Record]) -> int:
     return sum(count_arrangements(record) for record in records)
 
 
-def parse_input(filename, unfold: bool = False) -> List[Record]:
-    lines = list(
-        filter(bool, [it.strip() for it in open(path.abspath(filename)).readlines()])
-    )
+def parse_input(filename) -> List[Record]:
+    lines = filter(bool, (it.strip() for it in read_lines(filename)))
     result: List[Record] = []
     for line in lines:
         row, blocks = line.split(" ")
-        unfold_factor = 5 if unfold else 1
-        result.append(
-            (
-                "?".join([row] * unfold_factor),
-                tuple(map(int, blocks.split(","))) * unfold_factor,
-            )
-        )
+        result.append((row, tuple(map(int, blocks.split(",")))))
     return result
 
 
+def unfold(records: List[Record], unfold_factor: int = 5) -> List[Record]:
+    return [
+        ("?".join([row] * unfold_factor), blocks * unfold_factor)
+        for row, blocks in records
+    ]
+
+
+def part1(records: List[Record]) -> int:
+    return sum_arrangements(records)
+
+
+def part2(records: List[Record]) -> int:
+    return sum_arrangements(unfold(records))
+
+
 def main():
-    example1_input = parse_input("example1.txt")
-    print("Example 1 part 1:", sum_arrangements(example1_input))
-    puzzle_input = parse_input("input.txt")
-    print("Part 1:", sum_arrangements(puzzle_input))
-    print(
-        "Example 1 part 2:", sum_arrangements(parse_input("example1.txt", unfold=True))
-    )
-    print("Part 2:", sum_arrangements(parse_input("input.txt", unfold=True)))
+    example1_input = parse_input(find_input(12, "example"))
+    print("Example 1 part 1:", part1(example1_input))
+    puzzle_input = parse_input(find_input(12))
+    print("Part 1:", part1(puzzle_input))
+    print("Example 1 part 2:", part2(example1_input))
+    print("Part 2:", part2(puzzle_input))
 
 
 if __name__ == "__main__":
+    profiling.profile_main("day12")
     main()
@@ -1,52 +1,50 @@
 import sys
-from operator import itemgetter
-from typing import Iterable, List, Optional, Tuple, TypedDict
+from typing import Iterable, List, Optional
 
+import numpy as np
 
-class Pattern(TypedDict):
-    rows: List[str]
-    cols: List[str]
+from aoc import profiling
+from aoc.grid import Grid
+from aoc.inputs import read_lines
+
+
+def line_differences(lines: np.ndarray) -> List[List[int]]:
+    # Number of differing cells between every pair of lines
+    return np.count_nonzero(lines[:, None, :] != lines[None, :, :], axis=2).tolist()
 
 
 def find_reflection(
-    rows: List[str], exclude: Optional[int] = None, num_smudges: int = 0
+    lines: np.ndarray, exclude: Optional[int] = None, num_smudges: int = 0
 ) -> int:
-    for i in range(1, len(rows)):
+    diff = line_differences(lines)
+    for i in range(1, len(lines)):
         if i == exclude:
             continue
-        top = rows[0:i][::-1]
-        bottom = rows[i:]
-        num_rows_reflected = min(map(len, (top, bottom)))
-        num_diff = sum(
-            0 if top_cell == bottom_cell else 1
-            for top_cell, bottom_cell in zip(
-                (c for line in top[0:num_rows_reflected] for c in line),
-                (c for line in bottom[0:num_rows_reflected] for c in line),
-            )
-        )
+        num_rows_reflected = min(i, len(lines) - i)
+        num_diff = sum(diff[i - 1 - k][i + k] for k in range(num_rows_reflected))
         if num_diff == num_smudges:
             return i
     return 0
 
 
-def summarize_reflection(input: Iterable[Pattern], fix_smudge: bool):
+def summarize_reflection(input: Iterable[Grid], fix_smudge: bool):
     result = 0
     for pattern in input:
         row_reflection = find_reflection(
-            list(pattern["rows"]),
-            find_reflection(list(pattern["rows"])) if fix_smudge else None,
+            pattern.rows,
+            find_reflection(pattern.rows) if fix_smudge else None,
             1 if fix_smudge else 0,
         )
         col_reflection = find_reflection(
-            list(pattern["cols"]),
-            find_reflection(list(pattern["cols"])) if fix_smudge else None,
+            pattern.cols,
+            find_reflection(pattern.cols) if fix_smudge else None,
             1 if fix_smudge else 0,
         )
         result += 100 * row_reflection + col_reflection
     return result
 
 
-def parse_input(raw_input: Iterable[str]) -> Iterable[Pattern]:
+def parse_input(raw_input: Iterable[str]) -> List[Grid]:
     patterns = [[]]
     for raw_line in raw_input:
         line = raw_line.strip()
@@ -54,17 +52,20 @@ def parse_input(raw_input: Iterable[str]) -> Iterable[Pattern]:
             patterns[-1].append(line)
         elif len(patterns[-1]):
             patterns.append([])
-    result = []
-    for pattern in patterns:
-        rows = pattern
-        cols = [[" "] * len(rows) for _ in range(len(rows[0]))]
-        for y in range(len(pattern)):
-            for x in range(len(pattern[y])):
-                cols[x][y] = pattern[y][x]
-        result.append(Pattern(rows=rows, cols=["".join(c) for c in cols]))
-    return result
+    return [Grid.from_lines(pattern) for pattern in patterns if pattern]
+
+
+def part1(patterns: List[Grid]):
+    return summarize_reflection(patterns, fix_smudge=False)
+
+
+def part2(patterns: List[Grid]):
+    return summarize_reflection(patterns, fix_smudge=True)
 
 
 if __name__ == "__main__":
-    fix_smudge = len(sys.argv) > 1 and sys.argv[1] == "2"
-    print(summarize_reflection(parse_input(sys.stdin), fix_smudge=fix_smudge))
+    profiling.profile_main("day13")
+    if len(sys.argv) > 1 and sys.argv[1] == "2":
+        print(part2(parse_input(read_lines("-"))))
+    else:
+        print(part1(parse_input(read_lines("-"))))
@@ -0,0 +1,66 @@
+"""
+The spin cycle on rows and columns of text as it was before the NumPy Grid,
+kept as the reference the fuzz harness checks tilt_cycle in main against.
+Apart from its commented-out debug prints, everything above tilt_cycle_grid
+is the original code.
+"""
+from typing import Tuple, TypedDict
+
+from aoc import grid
+
+CUBE = "#"
+ROUND = "O"
+SPACE = "."
+NORTH = "N"
+SOUTH = "S"
+WEST = "W"
+EAST = "E"
+tilt_config = {
+    NORTH: ("cols", "ljust"),
+    SOUTH: ("cols", "rjust"),
+    WEST: ("rows", "ljust"),
+    EAST: ("rows", "rjust"),
+}
+
+
+class Grid(TypedDict):
+    rows: Tuple[str]
+    cols: Tuple[str]
+
+
+def transpose(rows: Tuple[str]) -> Tuple[str]:
+    cols = [[""] * len(rows) for _ in range(len(rows[0]))]
+    for y in range(len(rows)):
+        for x in range(len(rows[y])):
+            cols[x][y] = rows[y][x]
+    return tuple("".join(c) for c in cols)
+
+
+def tilt(input: Grid, config: Tuple[str, str]) -> Grid:
+    cols_or_rows = tuple(
+        CUBE.join(
+            [
+                getattr((space.count(ROUND) * ROUND), config[1])(len(space), ".")
+                for space in line.split(CUBE)
+            ]
+        )
+        for line in input[config[0]]
+    )
+    if config[0] == "rows":
+        return Grid(rows=cols_or_rows, cols=transpose(cols_or_rows))
+    else:
+        return Grid(cols=cols_or_rows, rows=transpose(cols_or_rows))
+
+
+def tilt_cycle(input: Grid):
+    spin_order = [NORTH, WEST, SOUTH, EAST]
+    result = input
+    for d in spin_order:
+        result = tilt(result, tilt_config[d])
+    return result
+
+
+def tilt_cycle_grid(dish: grid.Grid) -> grid.Grid:
+    """tilt_cycle taking and returning the Grid that main uses."""
+    rows = tuple(dish.lines())
+    return grid.Grid.from_lines(tilt_cycle(Grid(rows=rows, cols=transpose(rows)))["rows"])
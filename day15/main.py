@@ -3,6 +3,9 @@ import sys
 from operator import itemgetter
 from typing import Dict, Iterable, List, Tuple
 
+from aoc import profiling
+from aoc.inputs import read_lines
+
 
 def parse_input(input: Iterable[str]):
     return [
@@ -51,11 +54,20 @@ def calc_focus_power(boxes: List[Dict[str, Tuple[int, int]]]):
     return result
 
 
+def part1(cmds: List[str]) -> int:
+    return sum(hash_str(cmd) for cmd in cmds)
+
+
+def part2(cmds: List[str]) -> int:
+    boxes = create_boxes()
+    for cmd in cmds:
+        boxes = hashmap_cmd(boxes, cmd)
+    return calc_focus_power(boxes)
+
+
 if __name__ == "__main__":
+    profiling.profile_main("day15")
     if len(sys.argv) > 1 and sys.argv[1] == "2":
-        boxes = create_boxes()
-        for cmd in parse_input(sys.stdin):
-            boxes = hashmap_cmd(boxes, cmd)
-        print(calc_focus_power(boxes))
+        print(part2(parse_input(read_lines("-"))))
     else:
-        print(sum(hash_str(cmd) for cmd in parse_input(sys.stdin)))
+        print(part1(parse_input(read_lines("-"))))
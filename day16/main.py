@@ -1,5 +1,12 @@
+from functools import lru_cache
 import sys
-from typing import Iterable, List, Tuple, Set
+from typing import Iterable, List, Tuple
+
+import numpy as np
+
+from aoc import profiling
+from aoc.grid import DIRECTIONS, Grid
+from aoc.inputs import read_lines
 
 mirrors = {
     "|": lambda x, y: [(0, -1), (0, 1)] if x else [(x, y)],
@@ -16,57 +23,82 @@ mirrors = {
     "/": lambda x, y: [(-y, -x)],
 }
 
-ENERGIZED = "#"
-
 cardinal_vectors = [(0, 1), (0, -1), (-1, 0), (1, 0)]
 
 
-def parse_input(input: Iterable[str]):
-    return [list(line) for line in (line.strip() for line in input) if len(line)]
+def parse_input(input: Iterable[str]) -> Grid:
+    return Grid.from_lines(input)
+
+
+def sum_energized(energized: np.ndarray):
+    return int(np.count_nonzero(energized))
 
 
-def sum_energized(grid: List[List[str]]):
-    return sum(1 if cell == ENERGIZED else 0 for row in grid for cell in row)
+@lru_cache(maxsize=4)
+def light_transitions(grid: Grid) -> Tuple[List[int], List[int]]:
+    """Up to two next states for every state cell * 4 + direction, or -1."""
+    num_dirs = len(DIRECTIONS)
+    result = np.full((2, grid.size, num_dirs), -1, dtype=np.int64)
+    cells = grid.cells.ravel()
+    for d, vector in enumerate(DIRECTIONS):
+        for char in set(mirrors) | {"."}:
+            at = np.flatnonzero(cells == ord(char))
+            vectors = mirrors[char](*vector) if char in mirrors else [vector]
+            for n, next_vector in enumerate(vectors):
+                next_d = DIRECTIONS.index(next_vector)
+                to = grid.neighbors[at, next_d]
+                result[n, at, d] = np.where(to < 0, -1, to * num_dirs + next_d)
+    first, second = result.reshape(2, -1).tolist()
+    return first, second
 
 
 def trace_light(
-    grid: List[List[str]], light: Tuple[Tuple[int, int], Tuple[int, int]]
-) -> List[List[str]]:
-    result = [["." for _ in row] for row in grid]
-    lights: List[Tuple[Tuple[int, int], Tuple[int, int]]] = [light]
-    seen_lights: Set[Tuple[Tuple[int, int], Tuple[int, int]]] = set(lights)
-    while len(lights):
-        loc, og_vector = lights.pop()
-        x, y = loc
-        if y < 0 or y >= len(result) or x < 0 or x >= len(result[0]):
-            continue
-        result[y][x] = ENERGIZED
-        cell = grid[y][x]
-        for vector in mirrors[cell](*og_vector) if cell in mirrors else [og_vector]:
-            next_light = (tuple(a + b for a, b in zip(loc, vector)), vector)
-            if next_light not in seen_lights:
-                seen_lights.add(next_light)
-                lights.append(next_light)
+    grid: Grid, light: Tuple[Tuple[int, int], Tuple[int, int]]
+) -> np.ndarray:
+    loc, vector = light
+    result = np.zeros((grid.height, grid.width), dtype=bool)
+    if not grid.contains(loc):
+        return result
+    first, second = light_transitions(grid)
+    state = grid.flat(loc) * len(DIRECTIONS) + DIRECTIONS.index(vector)
+    seen = bytearray(grid.size * len(DIRECTIONS))
+    seen[state] = 1
+    lights = [state]
+    while lights:
+        state = lights.pop()
+        for next_state in (first[state], second[state]):
+            if next_state >= 0 and not seen[next_state]:
+                seen[next_state] = 1
+                lights.append(next_state)
+    seen_by_cell = np.frombuffer(seen, dtype=np.uint8).reshape(-1, len(DIRECTIONS))
+    result.ravel()[:] = seen_by_cell.any(axis=1)
     return result
 
 
+def part1(grid: Grid) -> int:
+    return sum_energized(trace_light(grid, ((0, 0), (1, 0))))
+
+
+def part2(grid: Grid) -> int:
+    num_rows = grid.height
+    num_cols = grid.width
+    border_cells = set(
+        (x, y)
+        for x in range(num_cols)
+        for y in range(num_rows)
+        if x in (0, num_cols - 1) or y in (0, num_rows - 1)
+    )
+    return max(
+        sum_energized(trace_light(grid, (cell, vector)))
+        for vector in cardinal_vectors
+        for cell in border_cells
+    )
+
+
 if __name__ == "__main__":
-    grid = parse_input(sys.stdin)
+    profiling.profile_main("day16")
+    grid = parse_input(read_lines("-"))
     if len(sys.argv) > 1 and sys.argv[1] == "2":
-        num_rows = len(grid)
-        num_cols = len(grid[0])
-        border_cells = set(
-            (x, y)
-            for x in range(num_cols)
-            for y in range(num_rows)
-            if x in (0, num_cols - 1) or y in (0, num_rows - 1)
-        )
-        print(
-            max(
-                sum_energized(trace_light(grid, (cell, vector)))
-                for vector in cardinal_vectors
-                for cell in border_cells
-            )
-        )
+        print(part2(grid))
     else:
-        print(sum_energized(trace_light(grid, ((0, 0), (1, 0)))))
+        print(part1(grid))
@@ -1,26 +1,37 @@
 from dataclasses import dataclass, field
-from functools import reduce
 from heapq import heappush, heappop
-import operator
 from typing import Dict, List, Tuple
 
-directions = [(1, 0), (0, 1), (-1, 0), (0, -1)]
+import numpy as np
 
+from aoc import profiling
+from aoc.grid import DIRECTIONS, Grid
+from aoc.inputs import read_lines
+from aoc.solvers import find_input
 
-def parse_input(filename: str):
-    return list(map(str.strip, open(filename)))
+# A node is a flat cell index and the direction it was entered from
+Node = Tuple[int, int]
 
 
-def dot(*p, op):
-    return tuple(reduce(op, s) for s in zip(*p))
+def parse_input(filename: str) -> Grid:
+    return Grid.from_lines(read_lines(filename))
 
 
-def dotsum(*p):
-    return dot(*p, op=operator.__add__)
-
-
-def dotmod(*p):
-    return dot(*p, op=operator.__mod__)
+def runs(B: Grid, max_run: int) -> Tuple[List[List[List[int]]], List[List[List[int]]]]:
+    """
+    Destination (or -1) and heat lost moving t cells in direction d from every
+    cell, indexed by [d][t][cell]
+    """
+    heat = B.cells.ravel().astype(np.int64) - ord("0")
+    dest = np.empty((len(DIRECTIONS), max_run + 1, B.size), dtype=np.int64)
+    cost = np.zeros_like(dest)
+    dest[:, 0] = np.arange(B.size)
+    for d in range(len(DIRECTIONS)):
+        for t in range(1, max_run + 1):
+            prev = dest[d, t - 1]
+            dest[d, t] = np.where(prev < 0, -1, B.neighbors[prev, d])
+            cost[d, t] = cost[d, t - 1] + heat[dest[d, t]]
+    return dest.tolist(), cost.tolist()
 
 
 @dataclass
@@ -29,18 +40,16 @@ class Frontier:
     Priority queue implementation
     """
 
-    heap: List[List[int | Tuple[Tuple[int, ...], int]]] = field(default_factory=list)
-    nodes: Dict[
-        Tuple[Tuple[int, ...], int], List[int | Tuple[Tuple[int, ...], int]]
-    ] = field(default_factory=dict)
-    removed = ((-1, -1), -1)
+    heap: List[List[int | Node]] = field(default_factory=list)
+    nodes: Dict[Node, List[int | Node]] = field(default_factory=dict)
+    removed = (-1, -1)
 
-    def push(self, node: Tuple[Tuple[int, ...], int], cost: int):
+    def push(self, node: Node, cost: int):
         if node not in self.nodes:
             self.nodes[node] = [cost, node]
             heappush(self.heap, self.nodes[node])
 
-    def pop(self) -> Tuple[int, Tuple[Tuple[int, ...], int]]:
+    def pop(self) -> Tuple[int, Node]:
         while True:
             item = heappop(self.heap)
             if isinstance(item[1], tuple) and item[1] != self.removed:
@@ -49,14 +58,14 @@ class Frontier:
                     return (item[0], item[1])
                 raise TypeError(f"Unknown heap item {item}")
 
-    def update(self, node: Tuple[Tuple[int, ...], int], cost: int):
+    def update(self, node: Node, cost: int):
         if node not in self.nodes:
             raise KeyError(f"Key {node} does not exist")
         self.nodes[node][1] = self.removed
         self.nodes[node] = [cost, node]
         heappush(self.heap, self.nodes[node])
 
-    def cost_of(self, node: Tuple[Tuple[int, ...], int]) -> int:
+    def cost_of(self, node: Node) -> int:
         if node not in self.nodes:
             raise KeyError(f"Key {node} does not exist")
         cost = self.nodes[node][0]
@@ -65,7 +74,7 @@ class Frontier:
         raise TypeError(f"Expected cost as int but got {cost}")
 
 
-def min_heat_loss(B, ultra=False):
+def min_heat_loss(B: Grid, ultra=False):
     """
     procedure uniform_cost_search(start) is
         node ← start
@@ -84,12 +93,10 @@ def min_heat_loss(B, ultra=False):
                 else if n is in frontier with higher cost
                     replace existing node with n
     """
-    start, end, size = (0, 0), (len(B[0]) - 1, len(B) - 1), (len(B[0]), len(B))
-    frontier, expanded, cr = Frontier(), set(), (4, 10) if ultra else (1, 3)
+    start, end, cr = 0, B.size - 1, (4, 10) if ultra else (1, 3)
+    frontier, expanded = Frontier(), set()
     frontier.push((start, -1), 0)
-
-    def h_of(p: Tuple[int, ...]):
-        return int(B[p[1]][p[0]])
+    dest, cost = runs(B, cr[1])
 
     while frontier.heap:
         node_cost, node = frontier.pop()
@@ -97,37 +104,37 @@ def min_heat_loss(B, ultra=False):
         if p == end:
             return node_cost
         expanded.add(node)
-        for n, t in (
-            ((dotsum(*([p] + t * [directions[td]])), td), t)
-            for td in set(range(4))
-            - (set() if d < 0 else {d, (d + 2) % len(directions)})
-            for t in range(cr[0], cr[1] + 1)
-        ):
-            if n[0] == dotmod(n[0], size):
-                nh = (
-                    node_cost
-                    + h_of(n[0])
-                    + sum(
-                        h_of(dotsum(*([p] + i * [directions[n[1]]])))
-                        for i in range(1, t)
-                    )
-                )
+        for td in set(range(4)) - (set() if d < 0 else {d, (d + 2) % len(DIRECTIONS)}):
+            for t in range(cr[0], cr[1] + 1):
+                n = (dest[td][t][p], td)
+                if n[0] < 0:
+                    break
+                nh = node_cost + cost[td][t][p]
                 if n not in expanded and n not in frontier.nodes:
                     frontier.push(n, nh)
                 elif n in frontier.nodes and frontier.cost_of(n) > nh:
                     frontier.update(n, nh)
 
 
+def part1(blocks: Grid) -> int:
+    return min_heat_loss(blocks)
+
+
+def part2(blocks: Grid) -> int:
+    return min_heat_loss(blocks, ultra=True)
+
+
 def main():
-    example1_input = parse_input("example1.txt")
-    example2_input = parse_input("example2.txt")
-    print("Example 1 part 1:", min_heat_loss(example1_input))
-    puzzle_input = parse_input("input.txt")
-    print("Part 1:", min_heat_loss(puzzle_input))
-    print("Example 1 part 2:", min_heat_loss(example1_input, ultra=True))
-    print("Example 2 part 2:", min_heat_loss(example2_input, ultra=True))
-    print("Part 2:", min_heat_loss(puzzle_input, ultra=True))
+    example1_input = parse_input(find_input(17, "example1"))
+    example2_input = parse_input(find_input(17, "example2"))
+    print("Example 1 part 1:", part1(example1_input))
+    puzzle_input = parse_input(find_input(17))
+    print("Part 1:", part1(puzzle_input))
+    print("Example 1 part 2:", part2(example1_input))
+    print("Example 2 part 2:", part2(example2_input))
+    print("Part 2:", part2(puzzle_input))
 
 
 if __name__ == "__main__":
+    profiling.profile_main("day17")
     main()
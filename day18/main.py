@@ -4,6 +4,9 @@ import sys
 from operator import itemgetter
 from typing import Dict, Iterable, List, Tuple
 
+from aoc import profiling
+from aoc.inputs import read_lines
+
 dir_vectors: Dict[str, Tuple[int, int]] = {
     "R": (1, 0),
     "D": (0, 1),
@@ -65,8 +68,17 @@ def print_points(points: Iterable[Tuple[int, int]]):
     print("\n".join("".join(row) for row in grid))
 
 
+def part1(plan: List[Tuple[str, int, str, int]]) -> int:
+    return dig([(cmd[0], cmd[1]) for cmd in plan], (0, 0))
+
+
+def part2(plan: List[Tuple[str, int, str, int]]) -> int:
+    return dig([(cmd[2], cmd[3]) for cmd in plan], (0, 0))
+
+
 if __name__ == "__main__":
+    profiling.profile_main("day18")
     if len(sys.argv) > 1 and sys.argv[1] == "2":
-        print(dig([(cmd[2], cmd[3]) for cmd in parse_input(sys.stdin)], (0, 0)))
+        print(part2(parse_input(read_lines("-"))))
     else:
-        print(dig([(cmd[0], cmd[1]) for cmd in parse_input(sys.stdin)], (0, 0)))
+        print(part1(parse_input(read_lines("-"))))
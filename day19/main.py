@@ -1,14 +1,16 @@
-import math
 import re
 import sys
+from typing import Dict, Iterable, Literal, List, Tuple
 
-from typing import Dict, Iterable, Literal, List, Optional, Tuple
+from aoc import profiling
+from aoc.intervals import Box, IntervalSet, volume
+from aoc.inputs import read_lines
 
 Sign = Literal[1] | Literal[-1]
 Rule = str | Tuple[str, Sign, int, str]
 Workflows = Dict[str, List[Rule]]
 Part = Dict[str, int]
-Intervals = Dict[str, Tuple[int, int]]
+Intervals = Box
 
 
 def parse_rule(input: str) -> Rule:
@@ -38,6 +40,10 @@ def parse_input(input: Iterable[str]) -> Tuple[Workflows, List[Part]]:
     return (workflows, parts)
 
 
+def to_intervals(bounds: Dict[str, Tuple[int, int]]) -> Intervals:
+    return {k: IntervalSet.interval(*v) for k, v in bounds.items()}
+
+
 def filter_intervals(
     workflows: Workflows,
     jobs: List[Tuple[str, Intervals]],
@@ -50,73 +56,56 @@ def filter_intervals(
             continue
         elif curr_workflow == "R":
             continue
-        rules = workflows[curr_workflow]
-        curr_intervals = intervals.copy()
-        for rule in rules:
+        for rule in workflows[curr_workflow]:
             if isinstance(rule, str):
                 jobs.append((rule, intervals))
                 break
-            else:
-                attr, sign, rating, target_workflow = rule
-                target_interval = (1, rating - 1) if sign < 0 else (rating + 1, 4000)
-                interval_intersection = intersect(curr_intervals[attr], target_interval)
-                if interval_intersection:
-                    jobs.append(
-                        (
-                            target_workflow,
-                            {**curr_intervals, attr: interval_intersection},
-                        )
-                    )
-                    for interval_diff in (
-                        difference(curr_intervals[attr], interval_intersection) or []
-                    ):
-                        jobs.append(
-                            (curr_workflow, {**curr_intervals, attr: interval_diff})
-                        )
-                    break
+            attr, sign, rating, target_workflow = rule
+            below, above = intervals[attr].split(rating if sign < 0 else rating + 1)
+            matched, unmatched = (below, above) if sign < 0 else (above, below)
+            if len(matched):
+                jobs.append((target_workflow, {**intervals, attr: matched}))
+            if not len(unmatched):
+                break
+            intervals = {**intervals, attr: unmatched}
     return accepted
 
 
-def intersect(a: Tuple[int, int], b: Tuple[int, int]) -> Optional[Tuple[int, int]]:
-    return None if a[1] < b[0] or b[1] < a[0] else tuple(sorted(a + b)[1:3])
-
-
-def difference(
-    a: Tuple[int, int], b: Tuple[int, int]
-) -> Optional[List[Tuple[int, int]]]:
-    result = [
-        min_max
-        for min_max in [(a[0], b[0] - 1), (b[1] + 1, a[1])]
-        if min_max[0] <= min_max[1]
-    ]
-    return result if len(result) else None
-
-
 def sum_interval_ratings(intervals_list: List[Intervals]):
     return sum(
-        sum(sum(range(minr, maxr + 1)) for minr, maxr in intervals.values())
+        sum(attr_intervals.total() for attr_intervals in intervals.values())
         for intervals in intervals_list
     )
 
 
 def sum_combinations(intervals_list: List[Intervals]):
-    return sum(
-        math.prod(maxr - minr + 1 for minr, maxr in intervals.values())
-        for intervals in intervals_list
+    return sum(map(volume, intervals_list))
+
+
+def part1(puzzle: Tuple[Workflows, List[Part]]) -> int:
+    workflows, parts = puzzle
+    accepted = filter_intervals(
+        workflows,
+        [
+            ("in", to_intervals(dict((k, (v, v)) for k, v in part.items())))
+            for part in parts
+        ],
+    )
+    return sum_interval_ratings(accepted)
+
+
+def part2(puzzle: Tuple[Workflows, List[Part]]) -> int:
+    workflows, _ = puzzle
+    intervals = filter_intervals(
+        workflows,
+        [("in", to_intervals(dict((k, (1, 4000)) for k in ["x", "m", "a", "s"])))],
     )
+    return sum_combinations(intervals)
 
 
 if __name__ == "__main__":
+    profiling.profile_main("day19")
     if len(sys.argv) > 1 and sys.argv[1] == "2":
-        workflows, parts = parse_input(sys.stdin)
-        intervals = filter_intervals(
-            workflows, [("in", dict((k, (1, 4000)) for k in ["x", "m", "a", "s"]))]
-        )
-        print(sum_combinations(intervals))
+        print(part2(parse_input(read_lines("-"))))
     else:
-        workflows, parts = parse_input(sys.stdin)
-        accepted = filter_intervals(
-            workflows,
-            [("in", dict((k, (v, v)) for k, v in part.items())) for part in parts],
-        )
-        print(sum_interval_ratings(accepted))
+        print(part1(parse_input(read_lines("-"))))
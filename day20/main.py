@@ -4,10 +4,17 @@ from functools import reduce
 import math
 import operator
 from operator import itemgetter
-from os import path
 import re
 from typing import Callable, Dict, Iterable, List, Optional, Tuple, TypeVar, Set
 
+import numpy as np
+
+from aoc import profiling
+from aoc.cycles import CycleDetector, fingerprint
+from aoc.graph import Graph
+from aoc.inputs import read_lines
+from aoc.solvers import find_input
+
 
 def dot(*p, op):
     return tuple(reduce(op, s) for s in zip(*p))
@@ -29,7 +36,7 @@ def parse_input(filename: str) -> Config:
     return [
         (m, d)
         for m, _, *d in (
-            line.replace(",", "").split() for line in open(path.abspath(filename))
+            line.replace(",", "").split() for line in read_lines(filename)
         )
     ]
 
@@ -153,6 +160,122 @@ class Store:
         return src_conjs
 
 
+BROADCASTER, FLIPFLOP, CONJUNCTION = 1, 2, 3
+
+
+class FastStore:
+    """
+    Store with modules as graph nodes. A pulse is queued as its edge index
+    times two plus its level, and module state lives in flat lists, so
+    names are only used for the pulses and states handed out by wait().
+    """
+
+    def __init__(self, config: Config):
+        graph = Graph.from_adjacency(
+            (typedsrc.lstrip("%&"), dests) for typedsrc, dests in config
+        )
+        self.ids = dict(graph.ids)
+        self.names = list(graph.names)
+        self.kinds = [0] * graph.num_nodes
+        for typedsrc, _ in config:
+            kind = {"%": FLIPFLOP, "&": CONJUNCTION}.get(typedsrc[0])
+            if typedsrc == "broadcaster":
+                kind = BROADCASTER
+            elif kind is None:
+                raise NotImplementedError(f"Unknown module type {typedsrc}")
+            self.kinds[self.ids[typedsrc.lstrip("%&")]] = kind
+        self.flipflops = [False] * graph.num_nodes
+        self.num_inputs = np.bincount(graph.targets, minlength=graph.num_nodes).tolist()
+        self.num_high = [0] * graph.num_nodes
+        self.offsets = graph.offsets.tolist()
+        # A conjunction remembers the last pulse from each input in a slot
+        self.slots: Dict[Tuple[int, int], int] = {}
+        self.slot_srcs: List[int] = []
+        self.conjunction_slots: List[List[int]] = [[] for _ in self.names]
+        self.high_slots = bytearray()
+        self.edge_dests: List[int] = []
+        self.edge_slots: List[int] = []
+        # The (src, pulse, dest) tuple of a low and a high pulse along each edge
+        self.edge_pulses: List[Pulse] = []
+        for src, dest in zip(graph.sources.tolist(), graph.targets.tolist()):
+            self.add_edge(src, dest)
+        # Pulses from outside the configuration travel along extra edges
+        self.external_edges: Dict[Tuple[int, int], int] = {}
+        self.pulses: List[int] = []
+
+    def id_of(self, name: str) -> int:
+        if name not in self.ids:
+            self.ids[name] = len(self.names)
+            self.names.append(name)
+            for state in (self.kinds, self.flipflops, self.num_inputs, self.num_high):
+                state.append(0)
+            self.conjunction_slots.append([])
+        return self.ids[name]
+
+    def add_edge(self, src: int, dest: int) -> int:
+        if (src, dest) not in self.slots:
+            self.slots[src, dest] = len(self.slot_srcs)
+            self.slot_srcs.append(src)
+            self.conjunction_slots[dest].append(len(self.slot_srcs) - 1)
+            self.high_slots.append(0)
+        self.edge_dests.append(dest)
+        self.edge_slots.append(self.slots[src, dest])
+        for pulse in (False, True):
+            self.edge_pulses.append((self.names[src], pulse, self.names[dest]))
+        return len(self.edge_dests) - 1
+
+    def dispatch(self, src: str, pulse: bool, dests: List[str]):
+        src_id = self.id_of(src)
+        for dest in dests:
+            key = (src_id, self.id_of(dest))
+            if key not in self.external_edges:
+                self.external_edges[key] = self.add_edge(*key)
+            self.pulses.append(self.external_edges[key] * 2 + pulse)
+
+    def propagate(self) -> List[int]:
+        """Deliver the pending pulses and return all pulses sent, as queued."""
+        kinds, flipflops = self.kinds, self.flipflops
+        num_inputs, num_high = self.num_inputs, self.num_high
+        high_slots = self.high_slots
+        offsets, edge_dests, edge_slots = self.offsets, self.edge_dests, self.edge_slots
+        pulses = self.pulses
+        # Iterating a list also visits what is appended to it meanwhile
+        for sent in pulses:
+            edge, pulse = sent >> 1, sent & 1
+            dest = edge_dests[edge]
+            kind = kinds[dest]
+            if kind == FLIPFLOP:
+                if pulse:
+                    continue
+                pulse = flipflops[dest] = not flipflops[dest]
+            elif kind == CONJUNCTION:
+                slot = edge_slots[edge]
+                if pulse != high_slots[slot]:
+                    high_slots[slot] = pulse
+                    num_high[dest] += 1 if pulse else -1
+                pulse = num_high[dest] != num_inputs[dest]
+            elif kind != BROADCASTER:
+                continue
+            pulses.extend(range(offsets[dest] * 2 + pulse, offsets[dest + 1] * 2, 2))
+        self.pulses = []
+        return pulses
+
+    def wait(self):
+        pulses = self.propagate()
+        names, slot_srcs, high_slots = self.names, self.slot_srcs, self.high_slots
+        states = {names[v]: self.flipflops[v] for v in self.modules_of(FLIPFLOP)}
+        for v in self.modules_of(CONJUNCTION):
+            states[names[v]] = {
+                names[slot_srcs[slot]]: True
+                for slot in self.conjunction_slots[v]
+                if high_slots[slot]
+            }
+        return [self.edge_pulses[sent] for sent in pulses], states
+
+    def modules_of(self, kind: int) -> List[int]:
+        return [v for v, module_kind in enumerate(self.kinds) if module_kind == kind]
+
+
 def stringify_pulses(pulses: List[Pulse]):
     result = []
     for pulse in pulses:
@@ -168,86 +291,73 @@ def sum_pulses(pulses: List[Pulse]):
 
 
 def check_config(config: Config, times: int = 1000):
-    store = Store(config)
+    store = FastStore(config)
     button = Button(name="button", dispatch=store.dispatch, outputs=["broadcaster"])
-    tpulses: List[List[Pulse]] = []
+    low = high = 0
     for _ in range(times):
         button.send()
-        pulses, _ = store.wait()
-        tpulses.append(pulses)
-    return dotsum(*(sum_pulses(pulses) for pulses in tpulses))
-
-
-# class Predictor:
-#     def __init__(self, config: List[Tuple[str, List[str]]]):
-#         self.store = Store(config)
-#         name_to_predictor = {"broadcaster": lambda _: False}
-#         for dest in self.store.name_to_mod["broadcaster"].outputs:
-#             mod = self.store.name_to_mod[dest]
-#             if isinstance(mod, FlipFlop):
-
-
-# def broadcaster_predictor(self, ):
-#     self.store.name_to_mod["broadcaster"].outputs
-
-
-def watch_module(adj_ls: List[Tuple[str, List[str]]]):
-    # src_dests, src_to_type = parse_src_types(adj_ls)
-    # src_to_dests, dest_to_srcs = dict(src_dests), dict(invert_adj_ls(src_dests))
-    store = Store(adj_ls)
+        pulses = store.propagate()
+        # The lowest bit of a queued pulse is its level
+        num_high = sum(pulse & 1 for pulse in pulses)
+        low, high = low + len(pulses) - num_high, high + num_high
+    return low, high
+
+
+def presses_until_low(config: Config, dest: str = "rx") -> int:
+    """
+    Button presses until dest first gets a low pulse. dest has to be fed by
+    one conjunction whose inputs each send it high pulses periodically, so
+    that is the least common multiple of their first high pulses. To check
+    the periods, the states of the modules upstream of each input are
+    fingerprinted after every press until they cycle.
+    """
+    graph = Graph.from_adjacency(
+        (typedsrc.lstrip("%&"), dests) for typedsrc, dests in config
+    )
+    reverse = graph.reverse()
+    store = FastStore(config)
     button = Button(name="button", dispatch=store.dispatch, outputs=["broadcaster"])
-    # tpulses: List[List[Pulse]] = []
-    name_to_src_conj = {name: src_conj.copy() for name, src_conj in store.name_to_src_conj.items() if src_conj}
-    name_to_first_low: Dict[str, int] = {}
-    btn_presses = 0
-    while name_to_src_conj:
+    feeders = reverse.adjacency[graph.ids[dest]]
+    if len(feeders) != 1 or store.kinds[feeders[0]] != CONJUNCTION:
+        raise ValueError(f"{dest} is not fed by a single conjunction")
+    (conjunction,) = feeders
+    # The high pulse, as queued, from each input of the conjunction
+    watched: Dict[int, int] = {}
+    upstream: Dict[int, Tuple[List[int], List[int]]] = {}
+    for src in reverse.adjacency[conjunction]:
+        watched[src] = int(graph.edges(src, conjunction)[0]) * 2 + 1
+        modules = np.flatnonzero(reverse.bfs(src) >= 0).tolist()
+        slots = [slot for v in modules for slot in store.conjunction_slots[v]]
+        upstream[src] = ([v for v in modules if store.kinds[v] == FLIPFLOP], slots)
+
+    def state_of(src: int) -> int:
+        flipflops, slots = upstream[src]
+        return fingerprint(
+            bytes([store.flipflops[v] for v in flipflops])
+            + bytes([store.high_slots[slot] for slot in slots])
+        )
+
+    detectors = {src: CycleDetector() for src in watched}
+    hits: Dict[int, List[int]] = {src: [] for src in watched}
+    for src, detector in detectors.items():
+        detector.add(state_of(src))
+    presses = 0
+    pending = set(watched)
+    while pending:
         button.send()
-        btn_presses += 1
-        pulses, _ = store.wait()
-        for src, pulse, dest in pulses:
-            # Low pulse sent
-            if not pulse and src not in name_to_first_low and src in name_to_src_conj:
-                name_to_first_low[src] = btn_presses
-                del name_to_src_conj[src]
-                print(name_to_src_conj.keys())
-                for output in filter(lambda output: output in name_to_src_conj, store.name_to_mod[src].outputs):
-                    print("output", output, name_to_src_conj[output])
-                    if all(map(lambda src_conj: src_conj in name_to_first_low, name_to_src_conj[output])):
-                        name_to_first_low[output] = math.lcm(*map(lambda src_conj: name_to_first_low[src_conj], name_to_src_conj[output]))
-                        del name_to_src_conj[output]
-                        print(name_to_src_conj.keys())
-    return name_to_first_low
-
-    #     # for cm in conj_mods:
-    #     # tpulses.append(pulses)
-    # # button = Button(name="button", dispatch=store.dispatch, outputs=["broadcaster"])
-    # to_find_deps = [mod_name]
-    # deps = []
-    # depset = set()
-    # while to_find_deps:
-    #     dep = to_find_deps.pop()
-    #     if dep in depset:
-    #         continue
-    #     deps.append(dep)
-    #     depset.add(dep)
-    #     for src in dest_to_srcs.get(deps[-1], []):
-    #         to_find_deps.append(src)
-    # print([(d, src_to_type.get(d)) for d in deps])
-    # return None
-    # last_pulses: List[List[Pulse]]
-    # tpulses:
-    # i = 0
-    # while True:
-    #     i += 1
-    #     button.send()
-    #     pulses, state = store.wait()
-    #     for pulse in pulses:
-    #         if pulse[0] == mod_name:
-    #     # for pulse in pulses:
-    #     #     state.get()
-    #     yield pulses
-    #     tpulses.append(pulses)
-    # return dotsum(*(sum_pulses(pulses) for pulses in tpulses))
+        pulses = set(store.propagate())
+        presses += 1
+        for src in list(pending):
+            if watched[src] in pulses:
+                hits[src].append(presses)
+            if detectors[src].add(state_of(src)):
+                pending.remove(src)
+    for src, detector in detectors.items():
+        if not hits[src] or not detector.cycle.repeats_every(hits[src], hits[src][0]):
+            name = store.names[src]
+            raise ValueError(f"{name} does not send high pulses periodically")
+    return math.lcm(*(src_hits[0] for src_hits in hits.values()))
+
 
 TNode = TypeVar("TNode")
 
@@ -274,18 +384,27 @@ def parse_src_types(
     return src_dests, src_to_type
 
 
+def part1(config: Config) -> int:
+    return math.prod(check_config(config))
+
+
+def part2(config: Config) -> int:
+    return presses_until_low(config)
+
+
 def main():
-    example1_input = parse_input("example1.txt")
-    example2_input = parse_input("example2.txt")
-    print("Example 1 part 1:", math.prod(check_config(example1_input)))
-    print("Example 1 part 2:", math.prod(check_config(example2_input)))
-    puzzle_input = parse_input("input.txt")
-    print("Part 1:", math.prod(check_config(puzzle_input)))
+    example1_input = parse_input(find_input(20, "example1"))
+    example2_input = parse_input(find_input(20, "example2"))
+    print("Example 1 part 1:", part1(example1_input))
+    print("Example 1 part 2:", part1(example2_input))
+    puzzle_input = parse_input(find_input(20))
+    print("Part 1:", part1(puzzle_input))
+    print("Part 2:", part2(puzzle_input))
     # print(topo_sort(split_mod_states(*parse_src_types(example1_input))))
-    print(watch_module(puzzle_input))
     # print("Example 1 part 1:", list(filter(lambda ab: ab[0] != ab[1], (zip(check_config(example1_input, 1), check_config(example1_input, 2))))))
     # print("Example 2 part 1:", list(filter(lambda ab: ab[0] != ab[1], (zip(check_config(example2_input, 1), check_config(example2_input, 4))))))
 
 
 if __name__ == "__main__":
+    profiling.profile_main("day20")
     main()
@@ -0,0 +1,20 @@
+"""
+Pulse counting with the Store that passes pulses by module name, as it was
+before FastStore, kept as the reference the fuzz harness checks check_config
+and FastStore in main against. Store is re-exported from main, where it is
+unchanged, and check_config is the original code.
+"""
+from typing import List
+
+from day20.main import Button, Config, Pulse, Store, dotsum, sum_pulses
+
+
+def check_config(config: Config, times: int = 1000):
+    store = Store(config)
+    button = Button(name="button", dispatch=store.dispatch, outputs=["broadcaster"])
+    tpulses: List[List[Pulse]] = []
+    for _ in range(times):
+        button.send()
+        pulses, _ = store.wait()
+        tpulses.append(pulses)
+    return dotsum(*(sum_pulses(pulses) for pulses in tpulses))
@@ -1,73 +1,45 @@
 import sys
+from typing import Dict, List, Tuple
 
-from operator import itemgetter
-from typing import Dict, List, Set, Tuple
+import numpy as np
 
+from aoc import profiling
+from aoc.grid import Grid, dilate
+from aoc.inputs import read_lines
 
-def parse_input(lines):
-    grid = list(filter(len, (l.strip() for l in lines)))
-    garden_plots = []
-    start = None
-    for y in range(len(grid)):
-        for x in range(len(grid[y])):
-            pt = grid[y][x]
-            if pt != "#":
-                garden_plots.append((x, y))
-            if pt == "S":
-                if start:
-                    raise Exception(
-                        "Multiple start points (S) found: {start} and {(x, y)}"
-                    )
-                start = (x, y)
-    if not start:
-        raise Exception("No start point (S) found")
-    return (start, garden_plots)
 
+def parse_input(lines) -> Tuple[Tuple[int, int], Grid]:
+    grid = Grid.from_lines(lines)
+    return (grid.find_one("S"), grid)
 
-def neighbors_of(vertex):
-    return [
-        (vertex[0] + x, vertex[1] + y) for x, y in [(0, 1), (0, -1), (1, 0), (-1, 0)]
-    ]
 
+def find_grid_size(grid: Grid) -> Tuple[int, int]:
+    return (grid.width, grid.height)
 
-def warp_grid(grid_size: Tuple[int, int]):
-    def warp(pt: Tuple[int, int]) -> Tuple[int, int]:
-        return (pt[0] % grid_size[0], pt[1] % grid_size[1])
 
-    return warp
-
-
-def find_grid_size(garden_plots):
-    return (
-        max(map(itemgetter(0), garden_plots)) + 1,
-        max(map(itemgetter(1), garden_plots)) + 1,
-    )
-
-
-def reachable(
-    garden_plots: List[Tuple[int, int]], start: Tuple[int, int], max_steps: int
-):
-    plots_set = set(garden_plots)
-    last_reachable: Set[Tuple[int, int]] = {start}
+def reachable(grid: Grid, start: Tuple[int, int], max_steps: int) -> Dict[int, int]:
+    """Number of plots reachable in exactly each number of steps up to max_steps."""
+    # Tile the garden far enough that max_steps from start stays inside it
+    reps = max_steps // min(grid.width, grid.height) + 1
+    plots = np.tile(grid.cells != ord("#"), (2 * reps + 1, 2 * reps + 1))
+    x, y = start[0] + reps * grid.width, start[1] + reps * grid.height
+    last_reachable = np.zeros_like(plots)
+    last_reachable[y, x] = True
     steps = 0
-    reachable_by_step: Dict[int, Set[Tuple[int, int]]] = {}
-    grid_size = find_grid_size(garden_plots)
-    warp = warp_grid(grid_size)
+    reachable_by_step: Dict[int, int] = {}
     while steps < max_steps:
-        next_reachable = set()
-        for plot in last_reachable:
-            for n in neighbors_of(plot):
-                if warp(n) in plots_set:
-                    next_reachable.add(n)
-        last_reachable = next_reachable
         steps += 1
-        reachable_by_step[steps] = last_reachable
-        print(
-            f"\rStep {steps} has {len(last_reachable)} reachable plots",
-            flush=True,
-            end="",
-        )
-    print()
+        # Only the diamond within steps of the start can change, and plots
+        # reachable in consecutive steps never neighbour each other
+        window = np.s_[y - steps : y + steps + 1, x - steps : x + steps + 1]
+        last = last_reachable[window]
+        last_reachable[window] = dilate(last) & ~last & plots[window]
+        reachable_by_step[steps] = int(np.count_nonzero(last_reachable[window]))
+        if profiling.verbose:
+            profiling.progress(
+                f"Step {steps} has {reachable_by_step[steps]} reachable plots"
+            )
+    profiling.progress_done()
     return reachable_by_step
 
 
@@ -99,26 +71,35 @@ def lagrange_interpolate(xys: List[Tuple[int, int]], steps: int) -> int:
     return int(result)
 
 
+PART1_STEPS = 64
+PART2_STEPS = 26501365
+
+
+def part1(puzzle: Tuple[Tuple[int, int], Grid]) -> int:
+    start, grid = puzzle
+    return reachable(grid, start, PART1_STEPS)[PART1_STEPS]
+
+
+def part2(puzzle: Tuple[Tuple[int, int], Grid]) -> int:
+    start, grid = puzzle
+    grid_size = find_grid_size(grid)
+    max_steps = 2 * grid_size[0] + start[0]
+    reachable_by_step = reachable(grid, start, max_steps)
+    return lagrange_interpolate(
+        [
+            (step, num_reachable)
+            for step, num_reachable in reachable_by_step.items()
+            if (step - start[0]) % grid_size[0] == 0
+        ],
+        PART2_STEPS,
+    )
+
+
 if __name__ == "__main__":
-    start, garden_plots = parse_input(sys.stdin)
+    profiling.profile_main("day21")
+    start, grid = parse_input(read_lines("-"))
     print("start", start)
     if len(sys.argv) > 1 and sys.argv[1] == "2":
-        target_steps = 26501365
-        grid_size = find_grid_size(garden_plots)
-        max_steps = 2 * grid_size[0] + start[0]
-        reachable_by_step = reachable(garden_plots, start, max_steps)
-        print(
-            f"Step {target_steps} has",
-            lagrange_interpolate(
-                [
-                    (step, len(sreachable))
-                    for step, sreachable in reachable_by_step.items()
-                    if (step - start[0]) % grid_size[0] == 0
-                ],
-                target_steps,
-            ),
-            "reachable plots",
-        )
+        print(f"Step {PART2_STEPS} has", part2((start, grid)), "reachable plots")
     else:
-        target_steps = 64
-        reachable(garden_plots, start, target_steps)
+        print(part1((start, grid)))
@@ -1,7 +1,10 @@
+from operator import itemgetter
 import sys
+from typing import Dict, List, Tuple, Set
 
-from operator import itemgetter
-from typing import Dict, Iterable, List, Tuple, Set
+from aoc import profiling
+from aoc.inputs import read_chunks
+from aoc.tokens import Data, tokenize
 
 Point2d = Tuple[int, int]
 Point3d = Tuple[int, int, int]
@@ -9,12 +12,11 @@ Brick = Tuple[Point3d, Point3d]
 MinMax = Tuple[Point2d, Point2d, Point2d]
 BelowAbove = Dict[Brick, Tuple[Set[Brick], Set[Brick]]]
 
-def parse_input(lines: Iterable[str]) -> List[Brick]:
-    result = []
-    for line in filter(len, (line.strip() for line in lines)):
-        a, b = (map(int, p.split(",")) for p in line.split("~"))
-        result.append(tuple((x, y, z) for x, y, z in [a, b]))
-    return result
+def parse_input(data: Data) -> List[Brick]:
+    return [
+        (tuple(brick[:3]), tuple(brick[3:]))
+        for brick in tokenize(data).values.reshape(-1, 6).tolist()
+    ]
 
 def cubes_of(brick: Brick) -> List[Point3d]:
     min_max = [(min(map(itemgetter(dim), brick)), max(map(itemgetter(dim), brick)) + 1) for dim in range(3)]
@@ -84,11 +86,15 @@ def chainable(bricks: List[Brick]) -> int:
     belowabove = settle(bricks)
     return sum(len(chain_reaction(belowabove, brick)) for brick in set(belowabove.keys()) - distintegratable(belowabove))
 
+def part1(bricks: List[Brick]) -> int:
+    return len(distintegratable(settle(bricks)))
+
+def part2(bricks: List[Brick]) -> int:
+    return chainable(bricks)
+
 if __name__ == "__main__":
+    profiling.profile_main("day22")
     if len(sys.argv) > 1 and sys.argv[1] == "2":
-        bricks = parse_input(sys.stdin)
-        print("chain", chainable(bricks))
+        print("chain", part2(parse_input(read_chunks("-"))))
     else:
-        bricks = parse_input(sys.stdin)
-        belowabove = settle(bricks)
-        print("disintegratable", len(distintegratable(belowabove)))
+        print("disintegratable", part1(parse_input(read_chunks("-"))))
@@ -1,9 +1,15 @@
 import sys
+from typing import List, Set, Tuple
 
-from typing import Dict, FrozenSet, List, Set, Tuple
+import numpy as np
 
-Point2d = Tuple[int, int]
-start = (1, 0)
+from aoc import profiling
+from aoc.graph import Graph
+from aoc.grid import DIRECTIONS, Grid
+from aoc.inputs import read_lines
+
+# Flat index of (1, 0)
+start = 1
 
 class bcolors:
     HEADER = '\033[95m'
@@ -16,106 +22,128 @@ class bcolors:
     BOLD = '\033[1m'
     UNDERLINE = '\033[4m'
 
-def parse_input(lines) -> List[List[str]]:
-    return list(map(list, filter(len, (line.strip() for line in lines))))
+def parse_input(lines) -> Grid:
+    return Grid.from_lines(lines)
 
 
-def vecadd(a: Point2d, b: Point2d) -> Point2d:
-    return (a[0] + b[0], a[1] + b[1])
+slopes = {"^": (0, -1), "v": (0, 1), "<": (-1, 0), ">": (1, 0)}
 
-def vecsub(a: Point2d, b: Point2d) -> Point2d:
-    return (a[0] - b[0], a[1] - b[1])
 
+def remove_slopes(grid: Grid) -> Grid:
+    return Grid(np.where(grid.mask("".join(slopes)), ord("."), grid.cells))
 
-slopes = {"^": (0, -1), "v": (0, 1), "<": (-1, 0), ">": (1, 0)}
 
+def io_of(
+    tiles: str, neighbors: List[List[int]], pt: int
+) -> Tuple[Set[int], Set[int]]:
+    def slope_dest(pt: int) -> int:
+        return neighbors[pt][DIRECTIONS.index(slopes[tiles[pt]])]
 
-def io_of(grid, pt) -> Tuple[Set[Point2d], Set[Point2d]]:
-    tile = grid[pt[1]][pt[0]]
+    tile = tiles[pt]
     valid_neighbors = set(
-        (x, y)
-        for x, y in (
-            vecadd(pt, (dx, dy)) for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]
-        )
-        if 0 <= x < len(grid[0])
-        and 0 <= y < len(grid)
-        and grid[y][x] != "#"
-        and (x, y) != start
+        n for n in neighbors[pt] if n >= 0 and tiles[n] != "#" and n != start
     )
     incoming = set(
-        (x, y)
-        for x, y in valid_neighbors
-        if grid[y][x] == "."
-        or (grid[y][x] in slopes and vecadd(slopes[grid[y][x]], (x, y)) == pt)
+        n
+        for n in valid_neighbors
+        if tiles[n] == "." or (tiles[n] in slopes and slope_dest(n) == pt)
     )
     if tile == ".":
         return (incoming, valid_neighbors)
     elif tile in slopes:
-        slope_dest = vecadd(pt, slopes[tile])
-        return (incoming, set() if slope_dest == start else {slope_dest})
+        return (incoming, set() if slope_dest(pt) == start else {slope_dest(pt)})
     else:
         raise Exception(f"Unknown tile {tile} at {pt}")
 
 
-def find_longest_path(grid: List[List[str]]):
-    end = (len(grid[-1]) - 2, len(grid) - 1)
-    init_io_by_pt = {
-        (x, y): io_of(grid, (x, y))
-        for y in range(len(grid))
-        for x in range(len(grid[0]))
-        if grid[y][x] != "#"
-    }
-    jobs: List[
-        Tuple[Point2d, FrozenSet[Point2d], Dict[Point2d, Tuple[Set[Point2d], Set[Point2d]]]]
-    ] = [(start, frozenset({start}), init_io_by_pt)]
-    rating_by_pt = {
-        (x, y): 0 for y in range(len(grid)) for x in range(len(grid[0]))
-    }
-    path_lengths: Set[int] = set()
+def junction_graph(grid: Grid) -> Tuple[Graph, int, int]:
+    """
+    Contract the corridors between tiles where paths can branch into single
+    weighted edges. Returns the junction graph and its start and end nodes.
+    """
+    end = grid.flat((grid.width - 2, grid.height - 1))
+    tiles = grid.cells.tobytes().decode("ascii")
+    neighbors = grid.neighbors.tolist()
+    open_tiles = np.flatnonzero(grid.cells.ravel() != ord("#")).tolist()
+    sources: List[int] = []
+    targets: List[int] = []
+    for pt in open_tiles:
+        for out_pt in io_of(tiles, neighbors, pt)[1]:
+            sources.append(pt)
+            targets.append(out_pt)
+    moves = Graph.from_edges(grid.size, sources, targets).adjacency
+    junctions = [
+        pt
+        for pt in open_tiles
+        if pt in (start, end)
+        or sum(n >= 0 and tiles[n] != "#" for n in neighbors[pt]) > 2
+    ]
+    junction_ids = {pt: i for i, pt in enumerate(junctions)}
+    edge_sources: List[int] = []
+    edge_targets: List[int] = []
+    lengths: List[int] = []
+    for pt in junctions:
+        for cur in moves[pt]:
+            prev, length = pt, 1
+            while cur not in junction_ids:
+                ahead = [n for n in moves[cur] if n != prev]
+                if not ahead:
+                    # Dead end, or a slope pointing back the way we came
+                    break
+                prev, cur = cur, ahead[0]
+                length += 1
+            else:
+                if cur != pt:
+                    edge_sources.append(junction_ids[pt])
+                    edge_targets.append(junction_ids[cur])
+                    lengths.append(length)
+    graph = Graph.from_edges(len(junctions), edge_sources, edge_targets, lengths)
+    return graph, junction_ids[start], junction_ids[end]
+
+
+def find_longest_path(grid: Grid):
+    graph, source, dest = junction_graph(grid)
+    adjacency = graph.adjacency
+    offsets = graph.offsets.tolist()
+    weights = graph.weights.tolist()
+    out_edges = [
+        list(zip(adjacency[v], weights[offsets[v] : offsets[v + 1]]))
+        for v in range(graph.num_nodes)
+    ]
+    visited = bytearray(graph.num_nodes)
+    path_count = 0
     max_path_length = 0
-    job_count = 0
-    while jobs:
-        job_count += 1
-        cur_pos, visited, io_by_pt = jobs.pop()
-        # print("\r\033[{len(grid)}A" + "\n".join(["".join(f"{bcolors.BOLD}{bcolors.OKCYAN}O{bcolors.ENDC}" if (x, y) in visited else c for x, c in zip(range(len(row)), row)) for y, row in zip(range(len(grid)), grid)]), flush=True)
-        print("\r", job_count, "jobs:", len(jobs), "visited:", len(visited), "paths:", len(path_lengths), "maxpath:", max_path_length, "   ", flush=True, end="")
-        if cur_pos == end:
-            path_lengths.add(len(visited) - 1)
-            max_path_length = max(max_path_length, len(visited) - 1)
-            for v in visited:
-                rating_by_pt[v] += 1
-            jobs.sort(key=lambda job: rating_by_pt[job[0]])
-            continue
-        _, cur_out = io_by_pt[cur_pos]
-        cur_out = [out_pt for out_pt in cur_out if out_pt not in visited]
-        if not cur_out:
-            for v in visited:
-                rating_by_pt[v] -= 1
-            jobs.sort(key=lambda job: rating_by_pt[job[0]])
-            continue
-        for out_pt in cur_out:
-            jobs.append(
-                (
-                    out_pt,
-                    visited | {out_pt},
-                    {
-                        pt: (pin.copy() - {cur_pos} if cur_pos in pin else pin, pout.copy() - {out_pt} if out_pt in pout else pout)
-                        for pt, (pin, pout) in io_by_pt.items()
-                    },
-                )
-            )
-        jobs.sort(key=lambda job: rating_by_pt[job[0]])
-    print()
+
+    def walk(v: int, length: int):
+        nonlocal path_count, max_path_length
+        if v == dest:
+            path_count += 1
+            max_path_length = max(max_path_length, length)
+            if profiling.verbose and path_count % 1000 == 0:
+                profiling.progress(f"paths: {path_count} maxpath: {max_path_length}   ")
+            return
+        visited[v] = 1
+        for w, weight in out_edges[v]:
+            if not visited[w]:
+                walk(w, length + weight)
+        visited[v] = 0
+
+    walk(source, 0)
+    profiling.progress_done()
     return max_path_length
 
 
+def part1(grid: Grid) -> int:
+    return find_longest_path(grid)
+
+
+def part2(grid: Grid) -> int:
+    return find_longest_path(remove_slopes(grid))
+
+
 if __name__ == "__main__":
+    profiling.profile_main("day23")
     if len(sys.argv) > 1 and sys.argv[1] == "2":
-        grid = parse_input(sys.stdin)
-        for y in range(len(grid)):
-            for x in range(len(grid[y])):
-                grid[y][x] = "." if grid[y][x] in slopes else grid[y][x]
-        print(find_longest_path(grid))
+        print(part2(parse_input(read_lines("-"))))
     else:
-        grid = parse_input(sys.stdin)
-        print(find_longest_path(grid))
+        print(part1(parse_input(read_lines("-"))))
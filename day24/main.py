@@ -8,18 +8,16 @@ import operator
 
 import numpy as np
 
+from aoc import profiling
+from aoc.inputs import read_chunks
+from aoc.tokens import Data, tokenize
 
-def parse_input(data):
-    result = []
-    for line in "".join(data).strip().splitlines():
-        ps, vs = line.split("@")
-        result.append(
-            (
-                tuple(int(p.strip()) for p in ps.split(",")),
-                tuple(int(v.strip()) for v in vs.split(",")),
-            )
-        )
-    return result
+
+def parse_input(data: Data):
+    return [
+        (tuple(hailstone[:3]), tuple(hailstone[3:]))
+        for hailstone in tokenize(data, signed=True).values.reshape(-1, 6).tolist()
+    ]
 
 
 def count_xy_intersections(hailstones, minmax):
@@ -158,12 +156,20 @@ def find_one_shot(
     raise Exception("Cannot find solution")
 
 
+def part1(hailstones) -> int:
+    # The example is the only input with five hailstones
+    minmax = (7, 27) if len(hailstones) == 5 else (200000000000000, 400000000000000)
+    return count_xy_intersections(hailstones, minmax)
+
+
+def part2(hailstones):
+    r, _ = find_one_shot(hailstones)
+    return sum(r)
+
+
 if __name__ == "__main__":
+    profiling.profile_main("day24")
     if len(sys.argv) > 1 and sys.argv[1] == "2":
-        hailstones = parse_input(sys.stdin)
-        r, _ = find_one_shot(hailstones)
-        print(sum(r))
+        print(part2(parse_input(read_chunks("-"))))
     else:
-        hailstones = parse_input(sys.stdin)
-        minmax = (7, 27) if len(hailstones) == 5 else (200000000000000, 400000000000000)
-        print(count_xy_intersections(hailstones, minmax))
+        print(part1(parse_input(read_chunks("-"))))
@@ -1,56 +1,93 @@
-from collections import deque
-from itertools import combinations
 import math
-from os import path
+from typing import Optional
 
-def parse_input(filename: str):
-    result = {}
-    for line in open(path.abspath(filename)):
+import numpy as np
+
+from aoc import profiling
+from aoc.graph import Graph
+from aoc.inputs import read_lines
+from aoc.solvers import find_input
+
+def parse_input(filename: str) -> Graph:
+    adjacency = []
+    for line in read_lines(filename):
         src, rest = line.strip().split(": ")
-        for dest in rest.split(" "):
-            result.setdefault(src, set()).add(dest)
-            result.setdefault(dest, set()).add(src)
-    return result
-
-def connected_components(graph):
-    graph_copy = {src: dests.copy() for src, dests in graph.items()}
-    components = []
-    while len(graph_copy):
-        src, *srcs = graph_copy.keys()
-        component = {src} | graph_copy[src]
-        for s in srcs:
-            group = {s} | graph_copy[s]
-            if len(group & component):
-                component |= group
-                del graph_copy[s]
-        components.append(component)
-        del graph_copy[src]
-    # print(components)
+        adjacency.append((src, rest.split(" ")))
+    return Graph.from_adjacency(adjacency, undirected=True)
+
+def connected_components(graph: Graph, edge_mask: Optional[np.ndarray] = None):
+    labels = graph.components(edge_mask)
+    components = [set() for _ in range(labels.max() + 1)]
+    for name, label in zip(graph.names, labels.tolist()):
+        components[label].add(name)
     return components
 
-def calc_disconnect_factor(graph):
-    dc_cands = set()
-    for src, dests in graph.items():
-        for dest in dests:
-            if len((dests - {dest}) & (graph[dest] - {src})) == 0:
-                dc_cands.add(tuple(sorted([src, dest])))
-    print("calc_disconnect_factor", len(dc_cands))
-    for dcs in combinations(dc_cands, 3):
-        graph_copy = {src: dests.copy() for src, dests in graph.items()}
-        for dc in dcs:
-            graph_copy[dc[0]].remove(dc[1])
-            graph_copy[dc[1]].remove(dc[0])
-        cc = list(connected_components(graph_copy))
-        if len(cc) == 2:
-            # print("dcs", dcs)
+def cut_side(
+    graph: Graph, opposite: np.ndarray, source: int, sink: int, max_cut: int
+) -> Optional[np.ndarray]:
+    """
+    Whether each node is on the source side of a minimum cut between source
+    and sink, or None if more than max_cut edge-disjoint paths join them. Each
+    undirected edge carries one unit of flow either way, and augmenting paths
+    are found by breadth-first search until the sink is out of reach.
+    """
+    adjacency = graph.adjacency
+    offsets = graph.offsets.tolist()
+    sources = graph.sources.tolist()
+    opposite = opposite.tolist()
+    flow = [0] * graph.num_edges
+    for _ in range(max_cut + 1):
+        via = [-1] * graph.num_nodes
+        seen = bytearray(graph.num_nodes)
+        seen[source] = 1
+        queue = [source]
+        for v in queue:
+            if v == sink:
+                break
+            start = offsets[v]
+            for i, w in enumerate(adjacency[v]):
+                if not seen[w] and flow[start + i] < 1:
+                    seen[w] = 1
+                    via[w] = start + i
+                    queue.append(w)
+        if not seen[sink]:
+            return np.frombuffer(seen, dtype=np.uint8).astype(bool)
+        v = sink
+        while v != source:
+            edge = via[v]
+            flow[edge] += 1
+            flow[opposite[edge]] -= 1
+            v = sources[edge]
+    return None
+
+def calc_disconnect_factor(graph: Graph, cut_size: int = 3):
+    """
+    Product of the sizes of the two groups left by cutting cut_size edges. A
+    node on the other side of the cut from node 0 is joined to it by exactly
+    cut_size edge-disjoint paths, so the farthest nodes are tried first.
+    """
+    opposite = graph.opposite_edges()
+    farthest_first = np.argsort(-graph.bfs(0), kind="stable")
+    for sink in farthest_first[farthest_first != 0].tolist():
+        side = cut_side(graph, opposite, 0, sink, cut_size)
+        if side is None:
+            continue
+        edge_mask = side[graph.sources] == side[graph.targets]
+        cc = connected_components(graph, edge_mask)
+        if (~edge_mask).sum() == 2 * cut_size and len(cc) == 2:
             return math.prod(map(len, cc))
     raise Exception("Can not find disconnection factor")
 
+def part1(graph: Graph) -> int:
+    return calc_disconnect_factor(graph)
+
+
 def main():
-    example1_input = parse_input("example1.txt")
-    print("Example 1 Part 1:", calc_disconnect_factor(example1_input))
-    puzzle_input = parse_input("input.txt")
-    print("Part 1:", calc_disconnect_factor(puzzle_input))
+    example1_input = parse_input(find_input(25, "example1"))
+    print("Example 1 Part 1:", part1(example1_input))
+    puzzle_input = parse_input(find_input(25))
+    print("Part 1:", part1(puzzle_input))
 
 if __name__ == "__main__":
+    profiling.profile_main("day25")
     main()